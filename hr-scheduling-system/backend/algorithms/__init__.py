@@ -4,6 +4,24 @@
 """
 
 from .conflict_detection import ConflictDetector
+from .async_conflict_detection import AsyncConflictDetector, ThreadedConflictDetector
 from .timeline_layout import TimelineLayoutEngine
+from .interval_index import AssignmentIntervalIndex, assignment_index
+from .availability_calendar import AvailabilityCalendar, get_availability_calendar
+from .timeline_cache import TimelineCache, get_timeline_cache
+from .compute_pool import ComputePool, get_compute_pool
 
-__all__ = ["ConflictDetector", "TimelineLayoutEngine"]
\ No newline at end of file
+__all__ = [
+    "ConflictDetector",
+    "AsyncConflictDetector",
+    "ThreadedConflictDetector",
+    "TimelineLayoutEngine",
+    "AssignmentIntervalIndex",
+    "assignment_index",
+    "AvailabilityCalendar",
+    "get_availability_calendar",
+    "TimelineCache",
+    "get_timeline_cache",
+    "ComputePool",
+    "get_compute_pool",
+]
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+时间冲突检测算法（异步版本）
+供 async 端点使用：查询通过 SQLAlchemy asyncio 扩展（asyncpg / aiosqlite）执行，
+等待数据库时不阻塞事件循环。结果构建等纯计算复用 ConflictDetector。
+
+冲突查询只读取结果构建所需的列（与区间索引的 IntervalEntry 属性一致），
+不构建ORM对象，减少在事件循环上的对象构建开销。
+区间索引和位图日历只提供同步接口，启用时通过 AsyncSession.run_sync 调用，
+其中的数据库访问同样由异步驱动完成。
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+from models.assignment import Assignment
+from models.project import Project
+from .conflict_detection import ConflictDetector
+from .interval_index import ACTIVE_STATUSES, AssignmentIntervalIndex
+from .availability_calendar import AvailabilityCalendar
+
+
+def _conflict_rows() -> Select:
+    """冲突记录查询：分配的区间、项目ID和项目名称"""
+    return select(
+        Assignment.id,
+        Assignment.employee_id,
+        Assignment.project_id,
+        Project.name.label("project_name"),
+        Assignment.start_time,
+        Assignment.end_time
+    ).outerjoin(Project, Project.id == Assignment.project_id)
+
+
+class AsyncConflictDetector:
+    """时间冲突检测器（异步版本）"""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        interval_index: Optional[AssignmentIntervalIndex] = None,
+        calendar: Optional[AvailabilityCalendar] = None
+    ):
+        """
+        Args:
+            session: 异步数据库会话
+            interval_index: 可选的内存区间索引
+            calendar: 可选的可用性位图日历
+        """
+        self.session = session
+        self.interval_index = interval_index
+        self.calendar = calendar
+        # 只用于不访问数据库的结果计算
+        self._detector = ConflictDetector(session.sync_session, interval_index, calendar)
+
+    async def find_conflicts(
+        self,
+        employee_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_assignment_id: Optional[int] = None
+    ) -> List:
+        """
+        查找与指定时间段重叠的活跃分配
+
+        Returns:
+            List: 冲突记录（查询结果行或 IntervalEntry），均包含
+                id / project_id / project_name / start_time / end_time 属性
+        """
+        if self.interval_index is not None:
+            return await self.session.run_sync(
+                lambda db: self.interval_index.query(db, employee_id, start_time, end_time, exclude_assignment_id)
+            )
+
+        statement = _conflict_rows().where(
+            Assignment.employee_id == employee_id,
+            Assignment.status.in_(ACTIVE_STATUSES),
+            Assignment.start_time < end_time,
+            Assignment.end_time > start_time
+        )
+        if exclude_assignment_id:
+            statement = statement.where(Assignment.id != exclude_assignment_id)
+        return list((await self.session.execute(statement)).all())
+
+    async def check_employee_conflict(
+        self,
+        employee_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_assignment_id: Optional[int] = None
+    ) -> Dict:
+        """检查指定员工在指定时间段的冲突，结果与 ConflictDetector.check_employee_conflict 一致"""
+        conflicts = await self.find_conflicts(
+            employee_id, start_time, end_time, exclude_assignment_id
+        )
+        return self._detector._build_conflict_result(start_time, end_time, conflicts)
+
+    async def check_multiple_employees_conflict(self, employee_assignments: List[Dict]) -> Dict:
+        """批量检查多个员工的时间冲突，结果与 ConflictDetector.check_multiple_employees_conflict 一致"""
+        candidates_by_employee = {}
+        if employee_assignments:
+            candidates_by_employee = await self._load_active_assignments(
+                list(dict.fromkeys(a["employee_id"] for a in employee_assignments)),
+                min(a["start_time"] for a in employee_assignments),
+                max(a["end_time"] for a in employee_assignments)
+            )
+        return self._detector._multiple_conflict_result(employee_assignments, candidates_by_employee)
+
+    async def get_employee_availability(
+        self,
+        employee_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Dict]:
+        """获取员工在指定日期范围内的可用时间段，结果与 ConflictDetector.get_employee_availability 一致"""
+        if self.calendar is not None:
+            availability = await self.session.run_sync(
+                lambda db: self.calendar.free_slots(db, [employee_id], start_date, end_date)
+            )
+            return availability[employee_id]
+
+        result = await self.session.execute(
+            select(Assignment.start_time, Assignment.end_time).where(
+                Assignment.employee_id == employee_id,
+                Assignment.status.in_(ACTIVE_STATUSES),
+                Assignment.start_time < end_date,
+                Assignment.end_time > start_date
+            ).order_by(Assignment.start_time)
+        )
+        return self._detector._compute_available_slots(result.all(), start_date, end_date)
+
+    async def _load_active_assignments(
+        self,
+        employee_ids: List[int],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[int, List]:
+        """
+        一次性获取多个员工在时间窗口内的活跃分配
+
+        Returns:
+            Dict[int, List]: 员工ID -> 按开始时间排序的冲突记录列表
+        """
+        if self.interval_index is not None:
+            return await self.session.run_sync(
+                lambda db: {
+                    employee_id: self.interval_index.query(db, employee_id, start_time, end_time)
+                    for employee_id in employee_ids
+                }
+            )
+
+        assignments = await self.session.execute(
+            _conflict_rows().where(
+                Assignment.employee_id.in_(employee_ids),
+                Assignment.status.in_(ACTIVE_STATUSES),
+                Assignment.start_time < end_time,
+                Assignment.end_time > start_time
+            ).order_by(Assignment.employee_id, Assignment.start_time)
+        )
+
+        result: Dict[int, List] = {}
+        for assignment in assignments:
+            result.setdefault(assignment.employee_id, []).append(assignment)
+        return result
+
+
+class ThreadedConflictDetector:
+    """
+    在线程池中运行同步检测器，提供与 AsyncConflictDetector 相同的异步接口
+
+    未安装异步数据库驱动时使用，同样不阻塞事件循环，但每个请求占用一个线程
+    """
+
+    def __init__(self, detector: ConflictDetector):
+        self.detector = detector
+
+    async def find_conflicts(self, *args, **kwargs) -> List:
+        return await run_in_threadpool(self.detector.find_conflicts, *args, **kwargs)
+
+    async def check_employee_conflict(self, *args, **kwargs) -> Dict:
+        return await run_in_threadpool(self.detector.check_employee_conflict, *args, **kwargs)
+
+    async def check_multiple_employees_conflict(self, *args, **kwargs) -> Dict:
+        return await run_in_threadpool(self.detector.check_multiple_employees_conflict, *args, **kwargs)
+
+    async def get_employee_availability(self, *args, **kwargs) -> List[Dict]:
+        return await run_in_threadpool(self.detector.get_employee_availability, *args, **kwargs)
@@ -0,0 +1,270 @@
+"""
+员工可用性位图日历
+按固定粒度（如30分钟、半天）把时间窗口划分为时间槽，每名员工用一个整数位图表示占用情况：
+第 i 位为 1 表示第 i 个时间槽内有活跃分配。多员工共同空闲即位图按位或后取反。
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+from sqlalchemy.orm import Session
+from models.assignment import Assignment
+from . import change_events
+from .interval_index import ACTIVE_STATUSES
+
+
+def iter_bit_runs(bits: int) -> Iterator[Tuple[int, int]]:
+    """按从低到高的顺序迭代位图中连续为1的区间 [start, end)"""
+    position = 0
+    while bits:
+        # 跳过末尾的0
+        zeros = (bits & -bits).bit_length() - 1
+        bits >>= zeros
+        position += zeros
+        # 统计末尾连续的1
+        ones = (~bits & (bits + 1)).bit_length() - 1
+        yield position, position + ones
+        bits >>= ones
+        position += ones
+
+
+class CalendarWindow:
+    """一个时间窗口内的员工占用位图"""
+
+    def __init__(self, start: datetime, slot_count: int, slot: timedelta):
+        self.start = start
+        self.slot = slot
+        self.slot_count = slot_count
+        self.end = start + slot * slot_count
+        self.full_mask = (1 << slot_count) - 1
+        self.busy: Dict[int, int] = {}
+        # 员工ID -> 分配ID -> 该分配占用的时间槽掩码，busy 为各掩码按位或
+        self.masks: Dict[int, Dict[int, int]] = {}
+
+    def apply(self, change: change_events.ScheduleChange) -> None:
+        """
+        按写入明细增量更新已加载员工的位图
+
+        分配先从涉及的员工（含更新前的员工）中移除，仍为活跃状态时再加入写入后的员工；
+        只新增占用时直接置位，有分配移除或缩短时由其余分配的掩码重新按位或
+        """
+        changed = set()
+        for write in change.assignments:
+            for employee_id in change.employee_ids:
+                masks = self.masks.get(employee_id)
+                if masks is not None and masks.pop(write.id, 0):
+                    changed.add(employee_id)
+            masks = self.masks.get(write.employee_id)
+            if masks is None or write.deleted or write.status not in ACTIVE_STATUSES:
+                continue
+            mask = self.range_mask(write.start_time, write.end_time)
+            if mask:
+                masks[write.id] = mask
+                self.busy[write.employee_id] |= mask
+        for employee_id in changed:
+            busy = 0
+            for mask in self.masks[employee_id].values():
+                busy |= mask
+            self.busy[employee_id] = busy
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+    def slot_index(self, moment: datetime) -> int:
+        """时刻所在的时间槽序号（向下取整）"""
+        return int((moment - self.start) // self.slot)
+
+    def slot_index_ceil(self, moment: datetime) -> int:
+        """时刻之后的第一个时间槽边界序号（向上取整）"""
+        quotient, remainder = divmod(moment - self.start, self.slot)
+        return int(quotient) + (1 if remainder else 0)
+
+    def range_mask(self, start: datetime, end: datetime) -> int:
+        """与 [start, end) 有交集的时间槽掩码"""
+        first = max(self.slot_index(start), 0)
+        last = min(self.slot_index_ceil(end), self.slot_count)
+        if first >= last:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def slot_time(self, index: int) -> datetime:
+        return self.start + self.slot * index
+
+
+class AvailabilityCalendar:
+    """
+    可用性位图日历
+
+    - 窗口按需构建，员工位图在首次查询时批量加载（一次查询）
+    - 最多缓存 max_windows 个窗口，超出后淘汰最久未使用的窗口
+    - 分配写入后按变更明细对已加载的位图置位/清位，不访问数据库；
+      没有明细的变更（手动通知、回滚）丢弃受影响员工的位图，下次查询时重新加载
+
+    时间槽只要与任何活跃分配有交集即视为占用，因此返回的空闲时间一定完全空闲。
+    """
+
+    def __init__(self, slot_minutes: int = 30, max_windows: int = 32):
+        if slot_minutes <= 0:
+            raise ValueError("时间槽粒度必须大于0")
+        self.slot = timedelta(minutes=slot_minutes)
+        self.max_windows = max_windows
+        self._windows: "OrderedDict[Tuple[datetime, datetime], CalendarWindow]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def free_slots(
+        self,
+        db: Session,
+        employee_ids: List[int],
+        start: datetime,
+        end: datetime
+    ) -> Dict[int, List[Dict]]:
+        """
+        获取多个员工在 [start, end) 内的空闲时间段
+
+        Returns:
+            Dict[int, List[Dict]]: 员工ID -> 空闲时间段（与 get_employee_availability 结构一致）
+        """
+        window = self._window(start, end)
+        busy = self._busy_bits(db, window, employee_ids)
+        return {
+            employee_id: self._bits_to_slots(window, ~busy[employee_id], start, end)
+            for employee_id in employee_ids
+        }
+
+    def common_free_slots(
+        self,
+        db: Session,
+        employee_ids: List[int],
+        start: datetime,
+        end: datetime
+    ) -> List[Dict]:
+        """所有员工在 [start, end) 内的共同空闲时间段（位图按位或后取反）"""
+        window = self._window(start, end)
+        busy = self._busy_bits(db, window, employee_ids)
+        combined = 0
+        for bits in busy.values():
+            combined |= bits
+        return self._bits_to_slots(window, ~combined, start, end)
+
+    def invalidate(self, employee_id: int) -> None:
+        """丢弃某个员工在所有窗口中的位图"""
+        with self._lock:
+            self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+            for window in self._windows.values():
+                window.busy.pop(employee_id, None)
+                window.masks.pop(employee_id, None)
+
+    def clear(self) -> None:
+        """清空所有窗口"""
+        with self._lock:
+            for window in self._windows.values():
+                for employee_id in window.busy:
+                    self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+            self._windows.clear()
+
+    def handle_change(self, change: change_events.ScheduleChange) -> None:
+        """变更监听器：有写入明细时增量更新位图，否则丢弃受影响员工的位图"""
+        if not change.assignments:
+            for employee_id in change.employee_ids:
+                self.invalidate(employee_id)
+            return
+        with self._lock:
+            # 正在加载的位图可能读到写入前的数据，不再缓存
+            for employee_id in change.employee_ids:
+                self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+            for window in self._windows.values():
+                window.apply(change)
+
+    def _window(self, start: datetime, end: datetime) -> CalendarWindow:
+        """获取覆盖 [start, end) 的窗口，不存在时按时间槽对齐后新建"""
+        with self._lock:
+            for key, window in reversed(self._windows.items()):
+                if window.covers(start, end):
+                    self._windows.move_to_end(key)
+                    return window
+
+            # 以当天零点为基准对齐到时间槽边界
+            midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+            aligned_start = start - (start - midnight) % self.slot
+            quotient, remainder = divmod(end - aligned_start, self.slot)
+            slot_count = max(int(quotient) + (1 if remainder else 0), 1)
+
+            window = CalendarWindow(aligned_start, slot_count, self.slot)
+            self._windows[(window.start, window.end)] = window
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+            return window
+
+    def _busy_bits(
+        self,
+        db: Session,
+        window: CalendarWindow,
+        employee_ids: List[int]
+    ) -> Dict[int, int]:
+        """获取员工在窗口内的占用位图，缺失的员工一次查询批量加载"""
+        with self._lock:
+            result = {eid: window.busy[eid] for eid in employee_ids if eid in window.busy}
+            missing = [eid for eid in dict.fromkeys(employee_ids) if eid not in result]
+            generations = {eid: self._generations.get(eid, 0) for eid in missing}
+
+        if missing:
+            loaded = {employee_id: 0 for employee_id in missing}
+            masks = {employee_id: {} for employee_id in missing}
+            rows = db.query(
+                Assignment.id, Assignment.employee_id, Assignment.start_time, Assignment.end_time
+            ).filter(
+                Assignment.employee_id.in_(missing),
+                Assignment.status.in_(ACTIVE_STATUSES),
+                Assignment.start_time < window.end,
+                Assignment.end_time > window.start
+            ).all()
+            for assignment_id, employee_id, start_time, end_time in rows:
+                mask = window.range_mask(start_time, end_time)
+                if mask:
+                    masks[employee_id][assignment_id] = mask
+                    loaded[employee_id] |= mask
+
+            with self._lock:
+                for employee_id, bits in loaded.items():
+                    # 加载期间发生写入时不缓存
+                    if self._generations.get(employee_id, 0) == generations[employee_id]:
+                        window.busy[employee_id] = bits
+                        window.masks[employee_id] = masks[employee_id]
+            result.update(loaded)
+
+        return result
+
+    def _bits_to_slots(
+        self,
+        window: CalendarWindow,
+        free_bits: int,
+        start: datetime,
+        end: datetime
+    ) -> List[Dict]:
+        """把空闲位图转换为 [start, end) 内的时间段列表"""
+        free_bits &= window.full_mask
+        slots = []
+        for first, last in iter_bit_runs(free_bits):
+            slot_start = max(window.slot_time(first), start)
+            slot_end = min(window.slot_time(last), end)
+            if slot_start < slot_end:
+                slots.append({
+                    "start_time": slot_start,
+                    "end_time": slot_end,
+                    "duration_hours": (slot_end - slot_start).total_seconds() / 3600
+                })
+        return slots
+
+
+# 进程级日历实例，按配置延迟创建，见 api.deps.get_conflict_detector
+availability_calendar = None
+
+
+def get_availability_calendar(slot_minutes: int, max_windows: int) -> AvailabilityCalendar:
+    """获取（必要时创建）进程级日历实例"""
+    global availability_calendar
+    if availability_calendar is None:
+        availability_calendar = AvailabilityCalendar(slot_minutes, max_windows)
+        change_events.subscribe(availability_calendar.handle_change)
+    return availability_calendar
@@ -0,0 +1,227 @@
+"""
+二进制导出
+大批量读取分配和时间轴时使用 Arrow IPC（分析）或 MessagePack（前端）代替JSON：
+分配按列分批从数据库读取，每批转换为列数组后直接编码，不经过逐行的pydantic校验。
+
+pyarrow 和 msgpack 为可选依赖，未安装时对应格式不可用（见 is_available）。
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from models.assignment import Assignment
+from models.employee import Employee
+from models.project import Project
+from .overlap_matrix import to_epoch_seconds
+
+try:
+    import pyarrow as pa
+except ImportError:  # 可选依赖
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖
+    msgpack = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+MEDIA_TYPES = {
+    "arrow": ARROW_MEDIA_TYPE,
+    "msgpack": MSGPACK_MEDIA_TYPE
+}
+
+
+def is_available(format: str) -> bool:
+    """对应格式的可选依赖是否已安装"""
+    if format == "arrow":
+        return pa is not None
+    if format == "msgpack":
+        return msgpack is not None
+    return True
+
+
+def iter_assignment_batches(
+    db: Session,
+    batch_size: int = 5000,
+    employee_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    按列分批读取分配
+
+    只查询导出所需的列，通过服务端游标每次读取 batch_size 行，
+    每批转置为列：数值和时间列为 numpy 数组，文本列为对象数组。
+
+    Yields:
+        Dict[str, np.ndarray]: 列名 -> 该批的列数据
+    """
+    query = db.query(
+        Assignment.id,
+        Assignment.employee_id,
+        Employee.name,
+        Assignment.project_id,
+        Project.name,
+        Assignment.start_time,
+        Assignment.end_time,
+        Assignment.status,
+        Assignment.notes
+    ).outerjoin(
+        Employee, Employee.id == Assignment.employee_id
+    ).outerjoin(
+        Project, Project.id == Assignment.project_id
+    )
+    if employee_id:
+        query = query.filter(Assignment.employee_id == employee_id)
+    if project_id:
+        query = query.filter(Assignment.project_id == project_id)
+    if status:
+        query = query.filter(Assignment.status == status)
+
+    result = db.execute(
+        query.order_by(Assignment.id).statement,
+        execution_options={"stream_results": True, "yield_per": batch_size}
+    )
+    for rows in result.partitions():
+        ids, employee_ids, employee_names, project_ids, project_names, starts, ends, statuses, notes = zip(*rows)
+        start_seconds = to_epoch_seconds(starts)
+        end_seconds = to_epoch_seconds(ends)
+        yield {
+            "id": np.array(ids, dtype=np.int64),
+            "employee_id": np.array(employee_ids, dtype=np.int64),
+            "employee_name": np.array(employee_names, dtype=object),
+            "project_id": np.array(project_ids, dtype=np.int64),
+            "project_name": np.array(project_names, dtype=object),
+            "start_time": start_seconds.astype(np.int64),
+            "end_time": end_seconds.astype(np.int64),
+            "status": np.array(statuses, dtype=object),
+            "notes": np.array(notes, dtype=object),
+            "duration_hours": (end_seconds - start_seconds) / 3600
+        }
+
+
+class _ChunkSink:
+    """收集 Arrow 写入的数据块，每写完一批取出，用于流式响应"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _assignment_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("employee_id", pa.int64()),
+        ("employee_name", pa.string()),
+        ("project_id", pa.int64()),
+        ("project_name", pa.string()),
+        ("start_time", pa.timestamp("s")),
+        ("end_time", pa.timestamp("s")),
+        ("status", pa.string()),
+        ("notes", pa.string()),
+        ("duration_hours", pa.float64())
+    ])
+
+
+def iter_assignments_arrow(batches: Iterator[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+    """
+    编码为 Arrow IPC 流：先输出结构，之后每批一个记录批次
+
+    数值和时间列直接包装 numpy 缓冲区，不复制
+    """
+    schema = _assignment_schema()
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    yield sink.drain()
+    for batch in batches:
+        writer.write_batch(pa.record_batch(
+            [pa.array(batch[field.name], type=field.type) for field in schema],
+            schema=schema
+        ))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def iter_assignments_msgpack(batches: Iterator[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+    """
+    编码为连续的 MessagePack 对象，每批一个 {列名: 数组} 映射（时间为纪元秒），
+    客户端用流式解包器逐批读取
+    """
+    packer = msgpack.Packer()
+    for batch in batches:
+        yield packer.pack({name: column.tolist() for name, column in batch.items()})
+
+
+def encode_timeline_arrow(timeline: Dict) -> bytes:
+    """
+    把列式时间轴编码为 Arrow IPC 流
+
+    每个分配一行，员工、项目、状态为字典编码列（直接复用列式时间轴的编码和字典，
+    字典值显式指定为字符串，空时间轴的结构不变），
+    视图头信息、时间范围和统计以JSON存放在结构元数据中
+    """
+    columns = timeline["columns"]
+    items = columns["items"]
+    employee_codes = np.array(items["employee"], dtype=np.int32)
+    project_codes = np.array(items["project"], dtype=np.int32)
+    starts = columns["origin"] + np.array(items["start"], dtype=np.int64)
+    ends = starts + np.array(items["width"], dtype=np.int64)
+
+    metadata = {
+        key: json.dumps(timeline[key], default=_json_default, ensure_ascii=False)
+        for key in ("employee", "project", "department", "time_range", "statistics")
+        if timeline.get(key) is not None
+    }
+    batch = pa.RecordBatch.from_pydict({
+        "assignment_id": pa.array(np.array(items["assignment_id"], dtype=np.int64)),
+        "employee_id": pa.array(np.array(columns["employees"]["id"], dtype=np.int64)[employee_codes]),
+        "employee_name": pa.DictionaryArray.from_arrays(
+            employee_codes, pa.array(columns["employees"]["name"], type=pa.string())
+        ),
+        "project_id": pa.array(np.array(columns["projects"]["id"], dtype=np.int64)[project_codes]),
+        "project_name": pa.DictionaryArray.from_arrays(
+            project_codes, pa.array(columns["projects"]["name"], type=pa.string())
+        ),
+        "status": pa.DictionaryArray.from_arrays(
+            np.array(items["status"], dtype=np.int32), pa.array(columns["statuses"], type=pa.string())
+        ),
+        "actual_start": pa.array(starts.astype("datetime64[s]")),
+        "actual_end": pa.array(ends.astype("datetime64[s]")),
+        "row": pa.array(np.array(items["row"], dtype=np.int32)),
+        "is_partial": pa.array(np.array(items["partial"], dtype=bool))
+    }, metadata=metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_timeline_msgpack(timeline: Dict) -> bytes:
+    """把列式时间轴编码为 MessagePack，结构与列式JSON一致（时间为ISO格式字符串）"""
+    return msgpack.packb(timeline, default=_json_default)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"无法序列化 {type(value).__name__}")
@@ -0,0 +1,151 @@
+"""
+排班数据变更通知
+监听员工、项目、分配的写入，通知进程内的索引和缓存失效
+"""
+from datetime import datetime
+from typing import Callable, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models.assignment import Assignment
+from models.employee import Employee
+from models.project import Project
+
+
+class AssignmentWrite(NamedTuple):
+    """一条分配写入后的值（删除时 deleted 为 True）"""
+    id: int
+    employee_id: Optional[int]
+    start_time: Optional[datetime]
+    end_time: Optional[datetime]
+    status: Optional[str]
+    deleted: bool = False
+
+
+class ScheduleChange(NamedTuple):
+    """一次写入涉及的实体"""
+    employee_ids: FrozenSet[int]  # 分配发生变化的员工（含更新前的员工）
+    project_ids: FrozenSet[int]   # 分配发生变化的项目（含更新前的项目）
+    employees: FrozenSet[int] = frozenset()  # 员工记录本身被修改
+    projects: FrozenSet[int] = frozenset()   # 项目记录本身被修改
+    # 按写入顺序的分配明细，可据此增量更新缓存；为空时（手动通知、回滚）只能按员工失效
+    assignments: Tuple[AssignmentWrite, ...] = ()
+
+
+ChangeListener = Callable[[ScheduleChange], None]
+
+_listeners: List[ChangeListener] = []
+
+_PENDING_KEY = "schedule_changes"
+
+
+def subscribe(listener: ChangeListener) -> ChangeListener:
+    """注册变更监听器"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def unsubscribe(listener: ChangeListener) -> None:
+    """移除变更监听器"""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def publish(change: ScheduleChange) -> None:
+    """通知所有监听器"""
+    if not (change.employee_ids or change.project_ids or change.employees or change.projects):
+        return
+    for listener in list(_listeners):
+        listener(change)
+
+
+def notify_assignment_change(
+    employee_ids: Iterable[int],
+    project_ids: Iterable[int] = ()
+) -> None:
+    """
+    手动发布分配变更
+
+    绕过ORM单元的批量写入（如 Core insert/update）不会触发会话事件，需要调用此函数
+    """
+    publish(ScheduleChange(frozenset(employee_ids), frozenset(project_ids)))
+
+
+def _attribute_values(obj, key: str) -> set:
+    """获取属性的当前值及刷新前的旧值"""
+    history = inspect(obj).attrs[key].history
+    values = set(history.added) | set(history.unchanged) | set(history.deleted)
+    current = getattr(obj, key, None)
+    if current is not None:
+        values.add(current)
+    values.discard(None)
+    return values
+
+
+def _collect_change(session: Session) -> ScheduleChange:
+    """收集本次flush中涉及的实体"""
+    employee_ids, project_ids = set(), set()
+    employees, projects = set(), set()
+    assignments = []
+
+    deleted = set(session.deleted)
+    for obj in list(session.new) + list(session.dirty) + list(deleted):
+        if isinstance(obj, Assignment):
+            employee_ids |= _attribute_values(obj, "employee_id")
+            project_ids |= _attribute_values(obj, "project_id")
+            if obj.id is not None:
+                assignments.append(AssignmentWrite(
+                    obj.id, obj.employee_id, obj.start_time, obj.end_time, obj.status, obj in deleted
+                ))
+        elif isinstance(obj, Employee) and obj.id is not None:
+            employees.add(obj.id)
+        elif isinstance(obj, Project) and obj.id is not None:
+            projects.add(obj.id)
+
+    return ScheduleChange(
+        frozenset(employee_ids), frozenset(project_ids),
+        frozenset(employees), frozenset(projects),
+        tuple(assignments)
+    )
+
+
+def _merge(first: ScheduleChange, second: ScheduleChange) -> ScheduleChange:
+    return ScheduleChange(
+        first.employee_ids | second.employee_ids,
+        first.project_ids | second.project_ids,
+        first.employees | second.employees,
+        first.projects | second.projects,
+        first.assignments + second.assignments
+    )
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """修改前加载旧值：提交后对象已过期，直接赋值时历史中没有旧值（如分配换人前的员工）"""
+
+
+for _attribute in (Assignment.employee_id, Assignment.project_id):
+    event.listen(_attribute, "set", _load_previous_value, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    change = _collect_change(session)
+    # 立即通知，保证同一会话内后续读取的一致性；提交或回滚时再通知一次
+    publish(change)
+    pending = session.info.get(_PENDING_KEY)
+    session.info[_PENDING_KEY] = _merge(pending, change) if pending else change
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        # 写入已撤销，明细不再有效，只通知涉及的实体
+        publish(pending._replace(assignments=()))
@@ -0,0 +1,96 @@
+"""
+列式时间轴编码
+把时间轴项目编码为并行数组：每个数组下标对应一个分配，项目名称和状态字典编码，
+时间为相对视图开始的整数秒。直接由查询结果行构建，不生成逐项目的字典。
+"""
+from datetime import datetime
+from typing import Dict, Hashable, List, Sequence, Tuple
+import numpy as np
+from .overlap_matrix import to_epoch_seconds
+
+# Accept 请求头中选择列式格式的媒体类型
+COLUMNAR_MEDIA_TYPE = "application/vnd.timeline.columnar+json"
+
+
+def dictionary_encode(values: Sequence[Hashable]) -> Tuple[List[int], List]:
+    """
+    字典编码
+
+    Returns:
+        Tuple[List[int], List]: (每个值在字典中的下标, 按首次出现顺序排列的字典)
+    """
+    table: Dict[Hashable, int] = {}
+    codes = [table.setdefault(value, len(table)) for value in values]
+    return codes, list(table)
+
+
+def timeline_columns(
+    rows: Sequence[Tuple],
+    start_date: datetime,
+    end_date: datetime,
+    employee_index: Dict[int, int],
+    runner=None
+) -> Dict:
+    """
+    由查询结果行构建列式时间轴
+
+    Args:
+        rows: (分配ID, 员工ID, 项目ID, 项目名称, 开始时间, 结束时间, 状态)，
+            按 (员工ID, 开始时间) 排序
+        start_date: 视图开始
+        end_date: 视图结束
+        employee_index: 员工ID -> 员工表下标
+        runner: 计算池 runner，布局分行通过它执行，默认在当前线程计算
+
+    Returns:
+        Dict: origin（视图开始的纪元秒）、items（并行数组）、projects（项目字典）、statuses（状态字典）
+            items 中 start/width 为裁剪到视图后相对 origin 的秒数，row 为员工内的布局行号，
+            partial 为1表示分配超出视图范围
+    """
+    from .compute_pool import INLINE_RUNNER
+    from .timeline_layout import layout_rows  # timeline_layout 导入本模块，避免循环导入
+
+    origin, limit = to_epoch_seconds([start_date, end_date])
+    if rows:
+        assignment_ids, employee_ids, project_ids, project_names, starts, ends, statuses = zip(*rows)
+    else:
+        assignment_ids = employee_ids = project_ids = project_names = starts = ends = statuses = ()
+
+    raw_starts = to_epoch_seconds(starts)
+    raw_ends = to_epoch_seconds(ends)
+    clipped_starts = np.maximum(raw_starts, origin)
+    clipped_ends = np.minimum(raw_ends, limit)
+    keep = clipped_ends > clipped_starts
+    indices = np.flatnonzero(keep)
+
+    employees = np.fromiter(
+        (employee_index[employee_id] for employee_id in employee_ids), dtype=np.int64, count=len(rows)
+    )[keep]
+    clipped_starts, clipped_ends = clipped_starts[keep], clipped_ends[keep]
+    partial = (raw_starts[keep] < origin) | (raw_ends[keep] > limit)
+
+    # 行已按员工排序，每段连续的员工单独分配布局行号
+    rows_by_employee = layout_rows(employees, clipped_starts, clipped_ends, runner or INLINE_RUNNER)
+
+    project_codes, project_table = dictionary_encode([project_ids[i] for i in indices])
+    status_codes, status_table = dictionary_encode([statuses[i] for i in indices])
+    names = dict(zip(project_ids, project_names))
+
+    return {
+        "origin": int(origin),
+        "items": {
+            "assignment_id": [assignment_ids[i] for i in indices],
+            "employee": employees.tolist(),
+            "project": project_codes,
+            "status": status_codes,
+            "start": (clipped_starts - origin).astype(np.int64).tolist(),
+            "width": (clipped_ends - clipped_starts).astype(np.int64).tolist(),
+            "row": rows_by_employee.tolist(),
+            "partial": partial.astype(np.int64).tolist()
+        },
+        "projects": {
+            "id": project_table,
+            "name": [names[project_id] or "未知项目" for project_id in project_table]
+        },
+        "statuses": status_table
+    }
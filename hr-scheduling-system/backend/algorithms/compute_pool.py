@@ -0,0 +1,279 @@
+"""
+算法计算池
+大视图布局和时间段搜索是纯Python的CPU计算，放在请求线程中执行时会与其他请求争用GIL。
+请求在线程池中加载数据，把紧凑的区间数组交给计算池（进程池、线程池或当前线程）计算：
+
+    result = await pool.offload(lambda runner: engine_or_detector_work(runner), is_disconnected)
+
+- 数据加载和结果组装在请求线程中执行，不受配额限制；计算通过 runner(fn, *args) /
+  runner.map(fn, args_list) 提交到计算池。进程池要求 fn 为模块级函数，参数为 numpy 数组等可序列化的数据
+- 只有一次提交的数据量（各次计算中最长参数的长度之和）达到 min_items 时才交给计算池，
+  小计算直接在请求线程中执行，省去提交和序列化的开销
+- 配额只在提交到计算池的计算期间占用：同时进行的计算数有上限，超出的在请求线程中等待，
+  等待超时后拒绝（ComputePoolBusy）
+- 只有进程池（process，默认）能让计算绕开GIL。线程池（thread）中的纯Python计算仍持有GIL，
+  与请求线程直接计算相比不减少争用，只是用配额限制同时计算的数量
+- 客户端断开时取消尚未开始的计算，请求线程在下一次提交计算时结束（ComputeCancelled）。
+  请求线程可能仍在使用数据库会话，offload 等请求线程结束后才返回
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+# 等待计算池配额时的检查间隔（秒）
+_ACQUIRE_POLL_INTERVAL = 0.01
+
+
+class ComputePoolBusy(Exception):
+    """等待计算池配额超时"""
+
+
+class ComputeCancelled(Exception):
+    """计算已取消（客户端断开连接）"""
+
+
+class InlineRunner:
+    """在调用线程中直接执行计算（未使用计算池时的默认值）"""
+
+    def __call__(self, fn: Callable[..., T], *args) -> T:
+        return fn(*args)
+
+    def map(self, fn: Callable[..., T], arg_list: Iterable[tuple]) -> List[T]:
+        return [fn(*args) for args in arg_list]
+
+
+INLINE_RUNNER = InlineRunner()
+
+
+def _work_size(arg_list: List[tuple]) -> int:
+    """一次提交的数据量：各次计算中最长参数（数组、列表）的长度之和"""
+    return sum(
+        max((len(arg) for arg in args if hasattr(arg, "__len__") and not isinstance(arg, str)), default=0)
+        for args in arg_list
+    )
+
+
+class PoolRunner:
+    """
+    把计算提交到计算池并在请求线程中等待结果，取消后不再提交新的计算
+
+    数据量小于 min_items 的计算直接在请求线程中执行；提交到计算池前取得配额，计算结束后释放
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        slots: Optional[threading.BoundedSemaphore] = None,
+        queue_timeout: float = 10.0,
+        min_items: int = 0
+    ):
+        self.executor = executor
+        self.slots = slots
+        self.queue_timeout = queue_timeout
+        self.min_items = min_items
+        self.cancelled = threading.Event()
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, fn: Callable[..., T], *args) -> T:
+        return self.map(fn, [args])[0]
+
+    def map(self, fn: Callable[..., T], arg_list: Iterable[tuple]) -> List[T]:
+        """提交多个计算（可在多个工作线程/进程中并行），按提交顺序返回结果"""
+        self._check_cancelled()
+        arg_list = list(arg_list)
+        if _work_size(arg_list) < self.min_items:
+            return [fn(*args) for args in arg_list]
+
+        self._acquire()
+        try:
+            return self._submit(fn, arg_list)
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+
+    def _submit(self, fn: Callable[..., T], arg_list: List[tuple]) -> List[T]:
+        futures = [self.executor.submit(fn, *args) for args in arg_list]
+        with self._lock:
+            self._pending.update(futures)
+            # 提交期间已取消时 cancel() 看不到这些计算
+            if self.cancelled.is_set():
+                for future in futures:
+                    future.cancel()
+        try:
+            return [future.result() for future in futures]
+        except CancelledError:
+            raise ComputeCancelled()
+        finally:
+            with self._lock:
+                self._pending.difference_update(futures)
+            self._check_cancelled()
+
+    def _acquire(self) -> None:
+        """在请求线程中等待配额，超时拒绝，等待期间取消时结束"""
+        if self.slots is None:
+            return
+        deadline = time.monotonic() + self.queue_timeout
+        while not self.slots.acquire(timeout=_ACQUIRE_POLL_INTERVAL):
+            self._check_cancelled()
+            if time.monotonic() >= deadline:
+                raise ComputePoolBusy()
+
+    def cancel(self) -> None:
+        """取消：尚未开始的计算不再执行，正在执行的计算完成后请求线程结束"""
+        with self._lock:
+            self.cancelled.set()
+            for future in self._pending:
+                future.cancel()
+
+    def _check_cancelled(self) -> None:
+        if self.cancelled.is_set():
+            raise ComputeCancelled()
+
+
+class _InlineExecutor(Executor):
+    """在提交线程中同步执行的执行器"""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+class ComputePool:
+    """算法计算池"""
+
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: int = 4,
+        max_jobs: int = 2,
+        queue_timeout: float = 10.0,
+        min_items: int = 0
+    ):
+        """
+        Args:
+            kind: process（进程池，绕开GIL）、thread（线程池，不绕开GIL）或 inline（在请求线程中执行）
+            max_workers: 工作线程/进程数
+            max_jobs: 同时提交到计算池的计算数上限
+            queue_timeout: 等待配额的最长时间（秒），0表示不等待
+            min_items: 交给计算池的最小数据量，更小的计算在请求线程中执行
+        """
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"未知的计算池类型: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.queue_timeout = queue_timeout
+        self.min_items = min_items
+        self._slots = threading.BoundedSemaphore(max_jobs)
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        """首次使用时创建执行器"""
+        with self._executor_lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # spawn 避免在多线程的服务进程中 fork
+                    self._executor = ProcessPoolExecutor(
+                        self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                elif self.kind == "thread":
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="algorithm")
+                else:
+                    self._executor = _InlineExecutor()
+            return self._executor
+
+    def runner(self) -> PoolRunner:
+        """创建提交到本计算池的 runner（提交计算时占用配额）"""
+        return PoolRunner(self.executor, self._slots, self.queue_timeout, self.min_items)
+
+    async def offload(
+        self,
+        func: Callable[[PoolRunner], T],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        poll_interval: float = 0.1
+    ) -> T:
+        """
+        在线程池中执行 func(runner)，等待期间定期检查客户端是否断开
+
+        数据加载和结果组装不占用配额，runner 提交计算时才等待配额
+
+        Args:
+            func: 请求的同步处理逻辑，计算通过 runner 提交到计算池
+            is_disconnected: 检查客户端是否已断开（如 Request.is_disconnected）
+            poll_interval: 检查间隔（秒）
+
+        Raises:
+            ComputePoolBusy: 提交计算时等待配额超时
+            ComputeCancelled: 客户端已断开，未开始的计算已取消，请求线程已结束
+        """
+        runner = self.runner()
+        task = asyncio.ensure_future(run_in_threadpool(func, runner))
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=poll_interval)
+                if done:
+                    return task.result()
+                if is_disconnected is not None and await is_disconnected():
+                    await self._cancel(runner, task)
+                    raise ComputeCancelled()
+        except asyncio.CancelledError:
+            await self._cancel(runner, task)
+            raise
+
+    @staticmethod
+    async def _cancel(runner: PoolRunner, task: asyncio.Future) -> None:
+        """取消计算并等待请求线程结束（请求线程结束前数据库会话不能关闭）"""
+        runner.cancel()
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            # 客户端已断开，不再需要结果或异常（通常为 ComputeCancelled）
+            pass
+
+    def shutdown(self) -> None:
+        """关闭执行器，取消未开始的计算"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_pools: Dict[Tuple[str, int, int, float, int], ComputePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_compute_pool(
+    kind: str = "process",
+    max_workers: int = 4,
+    max_jobs: int = 2,
+    queue_timeout: float = 10.0,
+    min_items: int = 0
+) -> ComputePool:
+    """获取按配置创建的全局计算池（同一配置共享一个实例）"""
+    with _pools_lock:
+        key = (kind, max_workers, max_jobs, queue_timeout, min_items)
+        if key not in _pools:
+            _pools[key] = ComputePool(kind, max_workers, max_jobs, queue_timeout, min_items)
+        return _pools[key]
+
+
+def shutdown_compute_pools() -> None:
+    """关闭所有全局计算池（应用关闭时调用）"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown()
+        _pools.clear()
@@ -0,0 +1,107 @@
+"""
+全公司冲突审计
+一次扫描全部活跃分配，找出同一员工所有相互重叠的分配对
+
+也可作为离线任务运行：
+    python -m algorithms.conflict_audit [-o 输出文件]
+"""
+import heapq
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from sqlalchemy.orm import Session
+from models.assignment import Assignment
+from .interval_index import ACTIVE_STATUSES
+
+
+def iter_overlapping_pairs(
+    db: Session,
+    batch_size: int = 1000,
+    employee_id: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    扫描线审计：按 (employee_id, start_time) 顺序读取活跃分配
+
+    每名员工维护一个以结束时间为键的小顶堆，新分配开始前弹出已结束的分配，
+    堆中剩余的都与新分配重叠。查询通过服务端游标分批读取，内存只与单个员工
+    同时进行的分配数相关。
+
+    Args:
+        db: 数据库会话
+        batch_size: 每批读取的行数
+        employee_id: 只审计指定员工
+
+    Yields:
+        Dict: 重叠的分配对
+    """
+    query = db.query(
+        Assignment.id,
+        Assignment.employee_id,
+        Assignment.project_id,
+        Assignment.start_time,
+        Assignment.end_time
+    ).filter(Assignment.status.in_(ACTIVE_STATUSES))
+    if employee_id is not None:
+        query = query.filter(Assignment.employee_id == employee_id)
+
+    rows = query.order_by(
+        Assignment.employee_id, Assignment.start_time, Assignment.id
+    ).execution_options(stream_results=True).yield_per(batch_size)
+
+    current_employee = None
+    active = []  # (end_time, id, project_id, start_time)
+    for assignment_id, row_employee_id, project_id, start_time, end_time in rows:
+        if row_employee_id != current_employee:
+            current_employee = row_employee_id
+            active = []
+
+        while active and active[0][0] <= start_time:
+            heapq.heappop(active)
+
+        for other_end, other_id, other_project_id, other_start in sorted(active, key=lambda a: (a[3], a[1])):
+            overlap_end = min(other_end, end_time)
+            yield {
+                "employee_id": row_employee_id,
+                "first_assignment_id": other_id,
+                "first_project_id": other_project_id,
+                "second_assignment_id": assignment_id,
+                "second_project_id": project_id,
+                "overlap_start": start_time,
+                "overlap_end": overlap_end,
+                "overlap_hours": (overlap_end - start_time).total_seconds() / 3600
+            }
+
+        heapq.heappush(active, (end_time, assignment_id, project_id, start_time))
+
+
+def main(argv=None) -> int:
+    """离线审计任务：输出NDJSON，每行一个重叠分配对"""
+    import argparse
+    import sys
+    from core.database import SessionLocal
+    from schemas.algorithm import ConflictAuditItem
+
+    parser = argparse.ArgumentParser(description="扫描全部活跃分配，输出重复排班")
+    parser.add_argument("-o", "--output", help="输出文件，默认标准输出")
+    parser.add_argument("--batch-size", type=int, default=5000, help="每批读取的行数")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    db = SessionLocal()
+    count = 0
+    started = datetime.now()
+    try:
+        for pair in iter_overlapping_pairs(db, batch_size=args.batch_size):
+            output.write(ConflictAuditItem(**pair).model_dump_json() + "\n")
+            count += 1
+    finally:
+        db.close()
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"发现 {count} 对重叠分配，耗时 {elapsed:.1f} 秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
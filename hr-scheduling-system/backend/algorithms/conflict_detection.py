@@ -1,18 +1,65 @@
 """
 时间冲突检测算法
 """
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from sqlalchemy.orm import Session
+from itertools import groupby
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
 from models.assignment import Assignment
 from models.employee import Employee
+from .interval_index import ACTIVE_STATUSES, AssignmentIntervalIndex
+from .availability_calendar import AvailabilityCalendar
+from .compute_pool import INLINE_RUNNER
+from .overlap_matrix import overlap_matrix, sparse_overlaps, to_epoch_seconds
+from .slot_search import (
+    MICROSECOND, free_intervals, from_wall_micros, quorum_time_slots, rank_common_slots, to_wall_micros
+)
 
 
 class ConflictDetector:
     """时间冲突检测器"""
     
-    def __init__(self, db_session: Session):
+    def __init__(
+        self, 
+        db_session: Session, 
+        interval_index: Optional[AssignmentIntervalIndex] = None,
+        calendar: Optional[AvailabilityCalendar] = None,
+        runner=INLINE_RUNNER
+    ):
+        """
+        Args:
+            db_session: 数据库会话
+            interval_index: 可选的内存区间索引，提供时冲突查询不再访问数据库
+            calendar: 可选的可用性位图日历，提供时可用性查询和最优时间段查找使用位图计算
+            runner: 计算池 runner，时间段搜索通过它执行，默认在当前线程计算
+        """
         self.db = db_session
+        self.interval_index = interval_index
+        self.calendar = calendar
+        self.runner = runner
+    
+    def find_conflicts(
+        self, 
+        employee_id: int, 
+        start_time: datetime, 
+        end_time: datetime,
+        exclude_assignment_id: Optional[int] = None
+    ) -> List:
+        """
+        查找与指定时间段重叠的活跃分配
+        
+        Returns:
+            List: 冲突记录（Assignment 或 IntervalEntry），均包含
+                id / project_id / start_time / end_time 属性
+        """
+        if self.interval_index is not None:
+            return self.interval_index.query(
+                self.db, employee_id, start_time, end_time, exclude_assignment_id
+            )
+        return Assignment.check_conflicts(
+            self.db, employee_id, start_time, end_time, exclude_assignment_id
+        )
     
     def check_employee_conflict(
         self, 
@@ -34,38 +81,11 @@ class ConflictDetector:
             Dict: 冲突检测结果
         """
         # 获取冲突的分配
-        conflicts = Assignment.check_conflicts(
-            self.db, employee_id, start_time, end_time, exclude_assignment_id
+        conflicts = self.find_conflicts(
+            employee_id, start_time, end_time, exclude_assignment_id
         )
         
-        result = {
-            "has_conflict": len(conflicts) > 0,
-            "conflict_count": len(conflicts),
-            "conflicts": [],
-            "total_overlap_hours": 0
-        }
-        
-        for conflict in conflicts:
-            overlap_hours = self._calculate_overlap_hours(
-                start_time, end_time, conflict.start_time, conflict.end_time
-            )
-            
-            conflict_info = {
-                "assignment_id": conflict.id,
-                "project_id": conflict.project_id,
-                "project_name": conflict.project.name if conflict.project else "未知项目",
-                "conflict_start": conflict.start_time,
-                "conflict_end": conflict.end_time,
-                "overlap_hours": overlap_hours,
-                "overlap_percentage": self._calculate_overlap_percentage(
-                    start_time, end_time, conflict.start_time, conflict.end_time
-                )
-            }
-            
-            result["conflicts"].append(conflict_info)
-            result["total_overlap_hours"] += overlap_hours
-        
-        return result
+        return self._build_conflict_result(start_time, end_time, conflicts)
     
     def check_multiple_employees_conflict(
         self, 
@@ -74,35 +94,89 @@ class ConflictDetector:
         """
         批量检查多个员工的时间冲突
         
+        所有候选分配通过一次查询获取（预加载项目），再用向量化的稀疏重叠矩阵
+        一次计算所有同员工的 请求 × 候选 重叠时长和百分比
+        
         Args:
             employee_assignments: 员工分配列表
-                [{"employee_id": 1, "start_time": datetime, "end_time": datetime}, ...]
+                [{"employee_id": 1, "start_time": datetime, "end_time": datetime,
+                  "exclude_assignment_id": Optional[int]}, ...]
         
         Returns:
             Dict: 批量冲突检测结果
         """
+        # 一次查询获取所有员工在整体时间窗口内的候选分配
+        candidates_by_employee = {}
+        if employee_assignments:
+            candidates_by_employee = self._load_active_assignments(
+                list(dict.fromkeys(a["employee_id"] for a in employee_assignments)),
+                min(a["start_time"] for a in employee_assignments),
+                max(a["end_time"] for a in employee_assignments)
+            )
+        return self._multiple_conflict_result(employee_assignments, candidates_by_employee)
+    
+    def _multiple_conflict_result(
+        self, 
+        employee_assignments: List[Dict], 
+        candidates_by_employee: Dict[int, List]
+    ) -> Dict:
+        """根据已加载的候选分配计算批量冲突检测结果（不访问数据库）"""
         results = {}
         employees_with_conflicts = set()
         
+        # 按员工分组
+        requests_by_employee: Dict[int, List[Dict]] = {}
         for assignment in employee_assignments:
-            employee_id = assignment["employee_id"]
-            start_time = assignment["start_time"]
-            end_time = assignment["end_time"]
-            exclude_id = assignment.get("exclude_assignment_id")
-            
-            conflict_result = self.check_employee_conflict(
-                employee_id, start_time, end_time, exclude_id
-            )
-            
-            # 如果员工已经有结果，合并冲突信息
-            if employee_id in results:
-                if conflict_result["has_conflict"]:
-                    results[employee_id]["has_conflict"] = True
-                    results[employee_id]["conflicts"].extend(conflict_result["conflicts"])
-            else:
-                results[employee_id] = conflict_result
+            requests_by_employee.setdefault(assignment["employee_id"], []).append(assignment)
+        
+        # 候选按员工排列，稀疏重叠矩阵一次计算所有同员工的 请求 × 候选 区间对
+        requests = [r for group in requests_by_employee.values() for r in group]
+        candidates, candidate_keys = [], []
+        for employee_id in sorted(candidates_by_employee):
+            candidates.extend(candidates_by_employee[employee_id])
+            candidate_keys.extend([employee_id] * len(candidates_by_employee[employee_id]))
+        rows, cols, hours, percentages = sparse_overlaps(
+            to_epoch_seconds([r["start_time"] for r in requests]),
+            to_epoch_seconds([r["end_time"] for r in requests]),
+            to_epoch_seconds([c.start_time for c in candidates]),
+            to_epoch_seconds([c.end_time for c in candidates]),
+            np.array([r["employee_id"] for r in requests], dtype=np.int64),
+            np.array(candidate_keys, dtype=np.int64)
+        )
+        
+        matches: Dict[int, List] = {}
+        for row, col, overlap_hours, percentage in zip(
+            rows.tolist(), cols.tolist(), hours.tolist(), percentages.tolist()
+        ):
+            candidate = candidates[col]
+            if candidate.id == requests[row].get("exclude_assignment_id"):
+                continue
+            matches.setdefault(row, []).append((candidate, overlap_hours, percentage))
+        
+        row = 0
+        for employee_id, group in requests_by_employee.items():
+            # 同一员工的多个请求合并为一个结果
+            merged = {
+                "has_conflict": False,
+                "conflict_count": 0,
+                "conflicts": [],
+                "total_overlap_hours": 0
+            }
+            for request in group:
+                matched = matches.get(row, [])
+                row += 1
+                conflict_result = self._build_conflict_result(
+                    request["start_time"], request["end_time"],
+                    [candidate for candidate, _, _ in matched],
+                    [(overlap_hours, percentage) for _, overlap_hours, percentage in matched]
+                )
+                merged["has_conflict"] = merged["has_conflict"] or conflict_result["has_conflict"]
+                merged["conflict_count"] += conflict_result["conflict_count"]
+                merged["conflicts"].extend(conflict_result["conflicts"])
+                merged["total_overlap_hours"] += conflict_result["total_overlap_hours"]
             
-            if conflict_result["has_conflict"]:
+            results[employee_id] = merged
+            if merged["has_conflict"]:
                 employees_with_conflicts.add(employee_id)
         
         unique_employees = len(results)
@@ -115,6 +189,110 @@ class ConflictDetector:
             "details": results
         }
     
+    def find_batch_conflicts(self, intervals: List[Dict]) -> List[List[Dict]]:
+        """
+        集合式检查一批待写入区间的冲突
+        
+        数据库中的候选分配通过一次查询获取，与批次中的活跃区间合并后，
+        用稀疏重叠矩阵一次计算所有同员工的 待写入 × (已有 + 批次内) 重叠。
+        批次内的冲突只记在排在后面的一项上；批次中被更新的分配，其旧区间的冲突
+        带 replaced_by（更新项下标），由调用方按更新项是否写入决定是否保留。
+        
+        Args:
+            intervals: 待写入区间列表
+                [{"employee_id": 1, "project_id": 2, "start_time": datetime, "end_time": datetime,
+                  "status": "assigned", "assignment_id": Optional[int]}, ...]
+                同一 assignment_id 在批次中至多出现一次
+        
+        Returns:
+            List[List[Dict]]: 与 intervals 一一对应的冲突列表，每个冲突包含
+                assignment_id（已有分配，批次内新建项为None）、batch_index（批次内项下标，
+                已有分配为None）、replaced_by（已有分配被批次中哪一项更新，未更新为None）、
+                project_id、start_time、end_time、overlap_hours
+        """
+        if not intervals:
+            return []
+        
+        replaced = {
+            i["assignment_id"]: index for index, i in enumerate(intervals)
+            if i.get("assignment_id") is not None
+        }
+        existing = self._load_active_assignments(
+            sorted({i["employee_id"] for i in intervals}),
+            min(i["start_time"] for i in intervals),
+            max(i["end_time"] for i in intervals)
+        )
+        
+        # 候选: (员工ID, 开始, 结束, 分配ID, 批次内下标, 更新项下标, 项目ID)，按员工稳定排序
+        candidates = [
+            (employee_id, a.start_time, a.end_time, a.id, None, replaced.get(a.id), a.project_id)
+            for employee_id in existing for a in existing[employee_id]
+        ]
+        candidates += [
+            (i["employee_id"], i["start_time"], i["end_time"], i.get("assignment_id"), index, None, i["project_id"])
+            for index, i in enumerate(intervals) if i["status"] in ACTIVE_STATUSES
+        ]
+        candidates.sort(key=lambda c: c[0])
+        
+        rows, cols, hours, _ = sparse_overlaps(
+            to_epoch_seconds([i["start_time"] for i in intervals]),
+            to_epoch_seconds([i["end_time"] for i in intervals]),
+            to_epoch_seconds([c[1] for c in candidates]),
+            to_epoch_seconds([c[2] for c in candidates]),
+            np.array([i["employee_id"] for i in intervals], dtype=np.int64),
+            np.array([c[0] for c in candidates], dtype=np.int64)
+        )
+        
+        conflicts: List[List[Dict]] = [[] for _ in intervals]
+        for row, col, overlap_hours in zip(rows.tolist(), cols.tolist(), hours.tolist()):
+            _, start_time, end_time, assignment_id, batch_index, replaced_by, project_id = candidates[col]
+            if (batch_index is not None and batch_index >= row) or replaced_by == row:
+                continue
+            conflicts[row].append({
+                "assignment_id": assignment_id,
+                "batch_index": batch_index,
+                "replaced_by": replaced_by,
+                "project_id": project_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "overlap_hours": overlap_hours
+            })
+        return conflicts
+    
+    def _load_active_assignments(
+        self, 
+        employee_ids: List[int], 
+        start_time: datetime, 
+        end_time: datetime
+    ) -> Dict[int, List]:
+        """
+        一次性获取多个员工在时间窗口内的活跃分配（预加载项目）
+        
+        Returns:
+            Dict[int, List]: 员工ID -> 按开始时间排序的分配列表
+        """
+        result: Dict[int, List] = {}
+        
+        if self.interval_index is not None:
+            for employee_id in employee_ids:
+                result[employee_id] = self.interval_index.query(
+                    self.db, employee_id, start_time, end_time
+                )
+            return result
+        
+        assignments = self.db.query(Assignment).options(
+            joinedload(Assignment.project)
+        ).filter(
+            Assignment.employee_id.in_(employee_ids),
+            Assignment.status.in_(ACTIVE_STATUSES),
+            Assignment.start_time < end_time,
+            Assignment.end_time > start_time
+        ).order_by(Assignment.employee_id, Assignment.start_time).all()
+        
+        for assignment in assignments:
+            result.setdefault(assignment.employee_id, []).append(assignment)
+        return result
+    
     def get_employee_availability(
         self, 
         employee_id: int, 
@@ -132,28 +310,113 @@ class ConflictDetector:
         Returns:
             List[Dict]: 可用时间段列表
         """
+        if self.calendar is not None:
+            return self.calendar.free_slots(
+                self.db, [employee_id], start_date, end_date
+            )[employee_id]
+        
         # 获取该时间段内的所有分配
         assignments = self.db.query(Assignment).filter(
             Assignment.employee_id == employee_id,
-            Assignment.status.in_(["assigned", "in_progress"]),
+            Assignment.status.in_(ACTIVE_STATUSES),
             Assignment.start_time < end_date,
             Assignment.end_time > start_date
         ).order_by(Assignment.start_time).all()
         
+        return self._compute_available_slots(
+            [(a.start_time, a.end_time) for a in assignments], start_date, end_date
+        )
+    
+    def get_employees_availability(
+        self, 
+        employee_ids: List[int], 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> Dict[int, List[Dict]]:
+        """
+        一次查询获取多个员工的可用时间段
+        
+        Args:
+            employee_ids: 员工ID列表
+            start_date: 开始日期
+            end_date: 结束日期
+        
+        Returns:
+            Dict[int, List[Dict]]: 员工ID -> 可用时间段列表
+        """
+        return dict(self.iter_employees_availability(employee_ids, start_date, end_date))
+    
+    def iter_employees_availability(
+        self, 
+        employee_ids: List[int], 
+        start_date: datetime, 
+        end_date: datetime,
+        batch_size: int = 1000
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        按员工ID顺序逐个产出可用时间段
+        
+        所有员工的分配通过一次按 (employee_id, start_time) 排序的查询分批读取，
+        再按员工分组单次遍历计算空闲时间段，内存占用与单个员工的分配数相关。
+        
+        Args:
+            employee_ids: 员工ID列表
+            start_date: 开始日期
+            end_date: 结束日期
+            batch_size: 每批读取的行数
+        
+        Yields:
+            Tuple[int, List[Dict]]: (员工ID, 可用时间段列表)
+        """
+        employee_ids = sorted(set(employee_ids))
+        if not employee_ids:
+            return
+        
+        if self.calendar is not None:
+            availability = self.calendar.free_slots(self.db, employee_ids, start_date, end_date)
+            for employee_id in employee_ids:
+                yield employee_id, availability[employee_id]
+            return
+        
+        rows = self.db.query(
+            Assignment.employee_id, Assignment.start_time, Assignment.end_time
+        ).filter(
+            Assignment.employee_id.in_(employee_ids),
+            Assignment.status.in_(ACTIVE_STATUSES),
+            Assignment.start_time < end_date,
+            Assignment.end_time > start_date
+        ).order_by(Assignment.employee_id, Assignment.start_time).yield_per(batch_size)
+        
+        groups = groupby(rows, key=lambda row: row[0])
+        current = next(groups, None)
+        for employee_id in employee_ids:
+            busy = []
+            if current is not None and current[0] == employee_id:
+                busy = [(start_time, end_time) for _, start_time, end_time in current[1]]
+                current = next(groups, None)
+            yield employee_id, self._compute_available_slots(busy, start_date, end_date)
+    
+    def _compute_available_slots(
+        self, 
+        busy_intervals: List[Tuple[datetime, datetime]], 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> List[Dict]:
+        """根据按开始时间排序的占用区间计算空闲时间段"""
         available_slots = []
         current_time = start_date
         
-        for assignment in assignments:
+        for busy_start, busy_end in busy_intervals:
             # 如果当前时间早于分配开始时间，则有可用时间段
-            if current_time < assignment.start_time:
+            if current_time < busy_start:
                 available_slots.append({
                     "start_time": current_time,
-                    "end_time": assignment.start_time,
-                    "duration_hours": (assignment.start_time - current_time).total_seconds() / 3600
+                    "end_time": busy_start,
+                    "duration_hours": (busy_start - current_time).total_seconds() / 3600
                 })
             
             # 更新当前时间为分配结束时间
-            current_time = max(current_time, assignment.end_time)
+            current_time = max(current_time, busy_end)
         
         # 检查最后一个分配后是否还有可用时间
         if current_time < end_date:
@@ -186,32 +449,186 @@ class ConflictDetector:
         Returns:
             Optional[Dict]: 最优时间段信息
         """
-        # 获取所有员工的可用时间段
-        all_availability = {}
-        for employee_id in employee_ids:
-            all_availability[employee_id] = self.get_employee_availability(
-                employee_id, start_date, end_date
+        candidates = self.find_candidate_time_slots(
+            employee_ids, duration_hours, start_date, end_date, working_hours,
+            max_candidates=1
+        )
+        return candidates[0] if candidates else None
+    
+    def find_candidate_time_slots(
+        self, 
+        employee_ids: List[int], 
+        duration_hours: float,
+        start_date: datetime,
+        end_date: datetime,
+        working_hours: Tuple[int, int] = (8, 18),
+        max_candidates: int = 5
+    ) -> List[Dict]:
+        """
+        为多个员工寻找按置信度排序的共同可用时间段候选
+        
+        Args:
+            employee_ids: 员工ID列表
+            duration_hours: 需要的持续时间（小时）
+            start_date: 搜索开始日期
+            end_date: 搜索结束日期
+            working_hours: 工作时间范围
+            max_candidates: 返回的候选数量上限
+        
+        Returns:
+            List[Dict]: 候选时间段，置信度从高到低
+        """
+        if not employee_ids or duration_hours <= 0 or start_date >= end_date:
+            return []
+        
+        if self.calendar is not None:
+            # 位图日历：共同空闲直接由位运算得到，作为单名员工的空闲时间计算
+            all_availability = {
+                0: self.calendar.common_free_slots(self.db, employee_ids, start_date, end_date)
+            }
+        else:
+            # 一次查询获取所有员工的可用时间段
+            all_availability = self.get_employees_availability(
+                employee_ids, start_date, end_date
             )
         
-        # 寻找共同可用的时间段
-        common_slots = self._find_common_time_slots(
-            all_availability, duration_hours, working_hours
+        # 裁剪、共同空闲扫描和排序编码为数组交给 runner
+        free = free_intervals(all_availability)
+        duration = timedelta(hours=duration_hours)
+        search_start, search_end = to_wall_micros([start_date, end_date]).tolist()
+        common_slots = self.runner(
+            rank_common_slots, free.keys, free.starts, free.ends, len(all_availability),
+            working_hours[0], working_hours[1], duration // MICROSECOND, max_candidates,
+            search_start, search_end
         )
         
-        if not common_slots:
-            return None
+        return [
+            {
+                "start_time": from_wall_micros(free_start, start_date.tzinfo),
+                "end_time": from_wall_micros(free_start, start_date.tzinfo) + duration,
+                "duration_hours": duration_hours,
+                "available_employees": list(employee_ids),
+                "confidence_score": confidence_score
+            }
+            for free_start, _, confidence_score in common_slots
+        ]
+    
+    def find_quorum_time_slots(
+        self, 
+        employee_ids: List[int], 
+        min_available: int,
+        duration_hours: float,
+        start_date: datetime,
+        end_date: datetime,
+        working_hours: Tuple[int, int] = (8, 18),
+        max_candidates: int = 5
+    ) -> Dict[str, List[Dict]]:
+        """
+        寻找至少 min_available 名员工同时可用的时间段（法定人数模式）
+        
+        员工在 [s, s + duration] 全程空闲，当且仅当 s 落在其某个空闲片段
+        [free_start, free_end - duration] 内。把每个空闲片段转换为“可开始区间”，
+        对所有可开始区间做覆盖计数扫描，覆盖数不少于 min_available 的连续区域
+        即为可行区域，复杂度 O(总区间数 · log)。
+        
+        Args:
+            employee_ids: 候选员工ID列表
+            min_available: 至少需要的可用员工数
+            duration_hours: 需要的持续时间（小时）
+            start_date: 搜索开始日期
+            end_date: 搜索结束日期
+            working_hours: 工作时间范围
+            max_candidates: 每类结果返回的数量上限
+        
+        Returns:
+            Dict[str, List[Dict]]: 
+                earliest: 按时间先后的可行区域（取各区域最早开始时刻）
+                best_covered: 按可用人数从多到少的可行区域（取各区域人数最多的时刻）
+        """
+        result = {"earliest": [], "best_covered": []}
+        employee_ids = list(dict.fromkeys(employee_ids))
+        if (not employee_ids or min_available < 1 or min_available > len(employee_ids)
+                or duration_hours <= 0 or start_date >= end_date):
+            return result
+        
+        duration = timedelta(hours=duration_hours)
+        all_availability = self.get_employees_availability(
+            employee_ids, start_date, end_date
+        )
         
-        # 选择最优时间段（最早的）
-        optimal_slot = min(common_slots, key=lambda x: x["start_time"])
+        # 裁剪和覆盖计数扫描编码为数组交给 runner
+        free = free_intervals(all_availability)
+        regions = self.runner(
+            quorum_time_slots, free.keys, free.starts, free.ends,
+            working_hours[0], working_hours[1], duration // MICROSECOND, min_available, max_candidates
+        )
+        
+        def build_slot(slot_start: int, employees: List[int]) -> Dict:
+            start_time = from_wall_micros(slot_start, start_date.tzinfo)
+            return {
+                "start_time": start_time,
+                "end_time": start_time + duration,
+                "duration_hours": duration_hours,
+                "available_employees": employees,
+                "available_count": len(employees)
+            }
         
         return {
-            "start_time": optimal_slot["start_time"],
-            "end_time": optimal_slot["end_time"],
-            "duration_hours": duration_hours,
-            "available_employees": employee_ids,
-            "confidence_score": self._calculate_confidence_score(optimal_slot)
+            kind: [build_slot(slot_start, employees) for slot_start, employees in slots]
+            for kind, slots in regions.items()
         }
     
+    def _build_conflict_result(
+        self, 
+        start_time: datetime, 
+        end_time: datetime, 
+        conflicts: List,
+        overlaps: Optional[List[Tuple[float, float]]] = None
+    ) -> Dict:
+        """
+        根据冲突分配构建单个时间段的冲突检测结果
+        
+        Args:
+            overlaps: 与 conflicts 一一对应的 (重叠小时数, 重叠百分比)，未提供时向量化计算
+        """
+        result = {
+            "has_conflict": len(conflicts) > 0,
+            "conflict_count": len(conflicts),
+            "conflicts": [],
+            "total_overlap_hours": 0
+        }
+        
+        if overlaps is None and conflicts:
+            hours, percentages = overlap_matrix(
+                to_epoch_seconds([start_time]),
+                to_epoch_seconds([end_time]),
+                to_epoch_seconds([c.start_time for c in conflicts]),
+                to_epoch_seconds([c.end_time for c in conflicts])
+            )
+            overlaps = list(zip(hours[0].tolist(), percentages[0].tolist()))
+        
+        for conflict, (overlap_hours, overlap_percentage) in zip(conflicts, overlaps or []):
+            conflict_info = {
+                "assignment_id": conflict.id,
+                "project_id": conflict.project_id,
+                "project_name": self._get_project_name(conflict),
+                "conflict_start": conflict.start_time,
+                "conflict_end": conflict.end_time,
+                "overlap_hours": overlap_hours,
+                "overlap_percentage": overlap_percentage
+            }
+            
+            result["conflicts"].append(conflict_info)
+            result["total_overlap_hours"] += overlap_hours
+        
+        return result
+    
+    def _get_project_name(self, conflict) -> str:
+        """获取冲突记录的项目名称"""
+        if isinstance(conflict, Assignment):
+            return conflict.project.name if conflict.project else "未知项目"
+        return conflict.project_name or "未知项目"
+    
     def _calculate_overlap_hours(
         self, 
         start1: datetime, 
@@ -243,19 +660,3 @@ class ConflictDetector:
             return 0
         
         return (overlap_hours / total_hours) * 100
-    
-    def _find_common_time_slots(
-        self, 
-        all_availability: Dict, 
-        duration_hours: float,
-        working_hours: Tuple[int, int]
-    ) -> List[Dict]:
-        """寻找所有员工的共同可用时间段"""
-        # 这里实现复杂的时间段交集算法
-        # 为了简化，返回空列表，实际项目中需要完整实现
-        return []
-    
-    def _calculate_confidence_score(self, time_slot: Dict) -> float:
-        """计算时间段的置信度分数"""
-        # 基于多个因素计算置信度：时间段长度、工作时间匹配度等
-        return 0.8  # 简化实现
\ No newline at end of file
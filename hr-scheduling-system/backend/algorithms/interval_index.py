@@ -0,0 +1,191 @@
+"""
+进程内员工分配区间索引
+按员工缓存活跃分配（assigned / in_progress），冲突查询无需访问数据库
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from models.assignment import Assignment
+from models.project import Project
+from . import change_events
+
+ACTIVE_STATUSES = ("assigned", "in_progress")
+
+
+class IntervalEntry(NamedTuple):
+    """索引中的一条分配记录"""
+    id: int
+    project_id: int
+    project_name: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    status: str
+
+
+class _CenterNode(NamedTuple):
+    """中心区间树节点：保存包含中心点的区间，左右子树分别为完全在中心点左侧/右侧的区间"""
+    center: datetime
+    by_start: List[IntervalEntry]   # 按开始时间升序
+    by_end: List[IntervalEntry]     # 按结束时间降序
+    left: Optional["_CenterNode"]
+    right: Optional["_CenterNode"]
+
+
+def _build_tree(entries: List[IntervalEntry]) -> Optional[_CenterNode]:
+    """由按开始时间排序的区间构建中心区间树，中心点取开始时间的中位数，树高 O(log n)"""
+    if not entries:
+        return None
+    center = entries[len(entries) // 2].start_time
+    left, middle, right = [], [], []
+    for entry in entries:
+        if entry.end_time <= center:
+            left.append(entry)
+        elif entry.start_time > center:
+            right.append(entry)
+        else:
+            middle.append(entry)
+    return _CenterNode(
+        center,
+        middle,
+        sorted(middle, key=lambda e: e.end_time, reverse=True),
+        _build_tree(left),
+        _build_tree(right)
+    )
+
+
+class EmployeeIntervals:
+    """
+    单个员工的区间集合
+
+    使用中心区间树：每个节点保存包含中心点的区间（按开始、结束时间各排一份），
+    其余区间按完全在中心点左侧或右侧分到子树。查询时在每个节点只扫描确实重叠的区间，
+    长区间只出现在一个节点中，复杂度为 O(log n + k)，与区间是否嵌套无关。
+    """
+
+    def __init__(self, entries: List[IntervalEntry]):
+        # 空区间不与任何区间重叠
+        self.entries = sorted(
+            (e for e in entries if e.start_time < e.end_time), key=lambda e: (e.start_time, e.id)
+        )
+        self._root = _build_tree(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def overlapping(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_assignment_id: Optional[int] = None
+    ) -> List[IntervalEntry]:
+        """返回与 [start_time, end_time) 重叠的区间，按开始时间排序"""
+        result = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end_time <= node.center:
+                # 查询在中心点左侧：节点区间都在查询开始后结束，只需开始早于查询结束
+                for entry in node.by_start:
+                    if entry.start_time >= end_time:
+                        break
+                    result.append(entry)
+                stack.append(node.left)
+            elif start_time >= node.center:
+                # 查询在中心点右侧：节点区间都在查询结束前开始，只需结束晚于查询开始
+                for entry in node.by_end:
+                    if entry.end_time <= start_time:
+                        break
+                    result.append(entry)
+                stack.append(node.right)
+            else:
+                # 查询跨过中心点：节点区间全部重叠
+                result.extend(node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        result.sort(key=lambda e: (e.start_time, e.id))
+        return [entry for entry in result if entry.id != exclude_assignment_id]
+
+
+class AssignmentIntervalIndex:
+    """
+    员工分配区间索引
+
+    首次查询某员工时从数据库加载其全部活跃分配，之后的查询只在内存中进行。
+    分配写入通过 change_events 通知失效对应员工，下次查询时重新加载。
+    """
+
+    def __init__(self):
+        self._employees: Dict[int, EmployeeIntervals] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def query(
+        self,
+        db: Session,
+        employee_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_assignment_id: Optional[int] = None
+    ) -> List[IntervalEntry]:
+        """查询员工在指定时间段内重叠的活跃分配"""
+        intervals = self._employees.get(employee_id)
+        if intervals is None:
+            intervals = self._load(db, employee_id)
+        return intervals.overlapping(start_time, end_time, exclude_assignment_id)
+
+    def invalidate(self, employee_id: int) -> None:
+        """使某个员工的索引失效"""
+        with self._lock:
+            self._employees.pop(employee_id, None)
+            self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+
+    def clear(self) -> None:
+        """清空索引"""
+        with self._lock:
+            for employee_id in list(self._employees):
+                self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+            self._employees.clear()
+
+    def handle_change(self, change: change_events.ScheduleChange) -> None:
+        """变更监听器：分配写入失效对应员工，项目修改（名称）清空索引"""
+        if change.projects:
+            self.clear()
+            return
+        for employee_id in change.employee_ids:
+            self.invalidate(employee_id)
+
+    def __contains__(self, employee_id: int) -> bool:
+        return employee_id in self._employees
+
+    def _load(self, db: Session, employee_id: int) -> EmployeeIntervals:
+        """从数据库加载员工的活跃分配"""
+        with self._lock:
+            generation = self._generations.get(employee_id, 0)
+
+        rows = db.query(
+            Assignment.id,
+            Assignment.project_id,
+            Project.name,
+            Assignment.start_time,
+            Assignment.end_time,
+            Assignment.status
+        ).outerjoin(Project, Assignment.project_id == Project.id).filter(
+            Assignment.employee_id == employee_id,
+            Assignment.status.in_(ACTIVE_STATUSES)
+        ).all()
+
+        intervals = EmployeeIntervals([IntervalEntry(*row) for row in rows])
+
+        with self._lock:
+            # 加载期间发生写入时不缓存，避免保存过期数据
+            if self._generations.get(employee_id, 0) == generation:
+                self._employees[employee_id] = intervals
+        return intervals
+
+
+# 进程级索引实例
+assignment_index = AssignmentIntervalIndex()
+change_events.subscribe(assignment_index.handle_change)
@@ -0,0 +1,110 @@
+"""
+时间桶占用聚合
+缩小时间轴时按时间桶（网格单元）汇总每组（员工或项目）的占用情况，
+结果大小只与 组数 × 桶数 有关，与分配数量无关。
+"""
+from typing import NamedTuple, Optional
+import numpy as np
+
+
+class BucketOccupancy(NamedTuple):
+    """每组每个时间桶的占用汇总，数组形状均为 (组数, 桶数)"""
+    busy_hours: np.ndarray        # 占用小时数（重叠的分配重复计入）
+    project_count: np.ndarray     # 涉及的不同项目数
+    peak_concurrency: np.ndarray  # 同时进行的最大分配数
+
+
+def uniform_bucket_edges(start: float, end: float, step: float) -> np.ndarray:
+    """[start, end) 按固定步长划分的桶边界（纪元秒），最后一个桶截断到 end"""
+    count = max(int(np.ceil((end - start) / step)), 0)
+    edges = start + np.arange(count + 1, dtype=np.float64) * step
+    if count:
+        edges[-1] = min(edges[-1], end)
+    return edges
+
+
+def bucket_occupancy(
+    edges: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    group_index: np.ndarray,
+    group_count: int,
+    project_ids: Optional[np.ndarray] = None,
+    counted: Optional[np.ndarray] = None
+) -> BucketOccupancy:
+    """
+    一次向量化计算所有组在所有时间桶内的占用
+
+    - 占用时长：把每个区间展开为 (区间, 桶) 对，累加各对的重叠时长
+    - 不同项目数：对 (组, 桶, 项目) 去重后计数
+    - 峰值并发：按 (组, 时间, 结束先于开始) 排序开始/结束事件后做全局累加，
+      由于每组的事件之和为0，累加值就是该组在事件后的并发数；
+      桶内峰值为桶开始时的并发数与桶内各开始事件后并发数的最大值
+
+    Args:
+        edges: 升序的桶边界（纪元秒），桶数为 len(edges) - 1
+        starts: 区间开始（纪元秒）
+        ends: 区间结束（纪元秒）
+        group_index: 每个区间所属的组下标 [0, group_count)
+        group_count: 组数
+        project_ids: 每个区间的项目ID，不提供时不统计项目数
+        counted: 每个区间是否计入峰值并发（如已取消的分配不计入），不提供时全部计入
+
+    Returns:
+        BucketOccupancy: 形状为 (group_count, 桶数) 的汇总数组
+    """
+    bucket_count = max(len(edges) - 1, 0)
+    shape = (group_count, bucket_count)
+    busy = np.zeros(shape, dtype=np.float64)
+    projects = np.zeros(shape, dtype=np.int64)
+    peak = np.zeros(shape, dtype=np.int64)
+    if bucket_count == 0:
+        return BucketOccupancy(busy, projects, peak)
+
+    # 裁剪到桶范围，丢弃空区间
+    starts = np.maximum(starts, edges[0])
+    ends = np.minimum(ends, edges[-1])
+    keep = ends > starts
+    starts, ends, group_index = starts[keep], ends[keep], group_index[keep]
+    if project_ids is not None:
+        project_ids = project_ids[keep]
+    counted = np.ones(len(starts), dtype=bool) if counted is None else counted[keep]
+    if len(starts) == 0:
+        return BucketOccupancy(busy, projects, peak)
+
+    # 每个区间覆盖的桶 [first, last]
+    first = np.searchsorted(edges, starts, side="right") - 1
+    last = np.searchsorted(edges, ends, side="left") - 1
+    counts = last - first + 1
+    total = int(counts.sum())
+    interval_of_pair = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    bucket_of_pair = first[interval_of_pair] + offsets
+    group_of_pair = group_index[interval_of_pair]
+
+    overlap = np.minimum(ends[interval_of_pair], edges[bucket_of_pair + 1]) - \
+        np.maximum(starts[interval_of_pair], edges[bucket_of_pair])
+    np.add.at(busy, (group_of_pair, bucket_of_pair), overlap / 3600)
+
+    if project_ids is not None:
+        triples = np.unique(np.stack([group_of_pair, bucket_of_pair, project_ids[interval_of_pair]]), axis=1)
+        np.add.at(projects, (triples[0], triples[1]), 1)
+
+    # 桶开始时仍在进行的区间数
+    active_at_bucket_start = (starts[interval_of_pair] <= edges[bucket_of_pair]) & counted[interval_of_pair]
+    np.add.at(peak, (group_of_pair[active_at_bucket_start], bucket_of_pair[active_at_bucket_start]), 1)
+
+    # 开始/结束事件扫描
+    starts, ends, group_index = starts[counted], ends[counted], group_index[counted]
+    event_times = np.concatenate([starts, ends])
+    event_deltas = np.concatenate([np.ones(len(starts), np.int64), -np.ones(len(ends), np.int64)])
+    event_groups = np.concatenate([group_index, group_index])
+    order = np.lexsort((event_deltas, event_times, event_groups))
+    levels = np.cumsum(event_deltas[order])
+
+    is_start = event_deltas[order] > 0
+    start_times = event_times[order][is_start]
+    start_buckets = np.searchsorted(edges, start_times, side="right") - 1
+    np.maximum.at(peak, (event_groups[order][is_start], start_buckets), levels[is_start])
+
+    return BucketOccupancy(busy, projects, peak)
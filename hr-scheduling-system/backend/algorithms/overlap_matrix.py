@@ -0,0 +1,137 @@
+"""
+向量化时间重叠计算
+以纪元秒数组表示时间区间，一次性计算候选区间与已有区间的重叠时长和重叠百分比
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+
+def to_epoch_seconds(values: Sequence[datetime]) -> np.ndarray:
+    """
+    转换为纪元秒数组（float64）
+
+    不带时区的时间按UTC处理，同一批数据只需保持一致即可得到正确的时长差
+    """
+    return np.fromiter(
+        (
+            (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
+            for value in values
+        ),
+        dtype=np.float64,
+        count=len(values)
+    )
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_micros(values: Sequence[datetime]) -> np.ndarray:
+    """
+    转换为纪元微秒数组（int64），精确表示 datetime，比较和相减结果与 datetime 一致
+
+    不带时区的时间按UTC处理
+    """
+    return np.fromiter(
+        (
+            ((value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)) - _EPOCH) // _MICROSECOND
+            for value in values
+        ),
+        dtype=np.int64,
+        count=len(values)
+    )
+
+
+def overlap_matrix(
+    candidate_starts: np.ndarray,
+    candidate_ends: np.ndarray,
+    existing_starts: np.ndarray,
+    existing_ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算 候选 × 已有 的完整重叠矩阵
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (重叠小时数矩阵, 重叠百分比矩阵)，
+            百分比相对于候选区间的时长
+    """
+    overlap = np.minimum(candidate_ends[:, None], existing_ends[None, :]) - \
+        np.maximum(candidate_starts[:, None], existing_starts[None, :])
+    np.clip(overlap, 0, None, out=overlap)
+
+    durations = (candidate_ends - candidate_starts)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentage = np.where(durations > 0, overlap / durations * 100, 0.0)
+    return overlap / 3600, percentage
+
+
+def sparse_overlaps(
+    candidate_starts: np.ndarray,
+    candidate_ends: np.ndarray,
+    existing_starts: np.ndarray,
+    existing_ends: np.ndarray,
+    candidate_keys: Optional[np.ndarray] = None,
+    existing_keys: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    计算稀疏重叠矩阵，只返回重叠时长大于0的元素
+
+    提供分组键（如员工ID）时只比较键相同的区间对。候选和已有区间的开始/结束事件
+    按 (键, 时间, 结束先于开始) 排序后扫描一遍，维护两类进行中的区间：
+    区间开始时与另一类中所有进行中的区间配对，每个重叠对恰好产生一次，
+    复杂度为 O(m log m + k)（m 为区间数，k 为重叠对数），不随同组区间数平方增长。
+
+    Returns:
+        Tuple: (候选下标, 已有下标, 重叠小时数, 重叠百分比)，按候选下标、已有下标升序
+    """
+    if candidate_keys is None or existing_keys is None:
+        candidate_keys = np.zeros(len(candidate_starts), dtype=np.int64)
+        existing_keys = np.zeros(len(existing_starts), dtype=np.int64)
+
+    # 空区间不与任何区间重叠
+    candidates = np.flatnonzero(candidate_ends > candidate_starts)
+    existing = np.flatnonzero(existing_ends > existing_starts)
+    ones_c, ones_e = np.ones(len(candidates), dtype=np.int64), np.ones(len(existing), dtype=np.int64)
+    zeros_c, zeros_e = np.zeros(len(candidates), dtype=np.int64), np.zeros(len(existing), dtype=np.int64)
+
+    times = np.concatenate([
+        candidate_starts[candidates], candidate_ends[candidates], existing_starts[existing], existing_ends[existing]
+    ])
+    keys = np.concatenate([
+        candidate_keys[candidates], candidate_keys[candidates], existing_keys[existing], existing_keys[existing]
+    ])
+    is_start = np.concatenate([ones_c, zeros_c, ones_e, zeros_e])
+    is_candidate = np.concatenate([ones_c, ones_c, zeros_e, zeros_e])
+    indices = np.concatenate([candidates, candidates, existing, existing])
+    order = np.lexsort((is_start, times, keys))
+
+    # 同一键的区间都在该键的事件中结束，换键时进行中的集合已清空
+    active = ({}, {})  # (进行中的已有区间, 进行中的候选区间)，按插入顺序
+    pair_rows, pair_cols = [], []
+    for start, candidate, index in zip(
+        is_start[order].tolist(), is_candidate[order].tolist(), indices[order].tolist()
+    ):
+        if not start:
+            active[candidate].pop(index, None)
+            continue
+        others = active[1 - candidate]
+        if candidate:
+            pair_rows.extend([index] * len(others))
+            pair_cols.extend(others)
+        else:
+            pair_rows.extend(others)
+            pair_cols.extend([index] * len(others))
+        active[candidate][index] = None
+
+    rows = np.array(pair_rows, dtype=np.int64)
+    cols = np.array(pair_cols, dtype=np.int64)
+    pair_order = np.lexsort((cols, rows))
+    rows, cols = rows[pair_order], cols[pair_order]
+
+    overlap = np.minimum(candidate_ends[rows], existing_ends[cols]) - \
+        np.maximum(candidate_starts[rows], existing_starts[cols])
+    durations = (candidate_ends - candidate_starts)[rows]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentage = np.where(durations > 0, overlap / durations * 100, 0.0)
+    return rows, cols, overlap / 3600, percentage
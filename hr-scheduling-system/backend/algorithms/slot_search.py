@@ -0,0 +1,248 @@
+"""
+时间段搜索计算
+共同空闲时间段和法定人数时间段的数组计算，时间为墙上时间的纪元微秒（int64）。
+计算函数只接收数组和数值参数，返回普通 Python 数据，可提交到进程池执行。
+"""
+import heapq
+from datetime import datetime, timedelta, tzinfo
+from itertools import groupby
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+HOUR = 3600 * 10**6
+DAY = 24 * HOUR
+MICROSECOND = timedelta(microseconds=1)
+_WALL_EPOCH = datetime(1970, 1, 1)
+
+
+class FreeIntervals(NamedTuple):
+    """按员工分组的空闲区间：同一员工的区间连续存放并按开始时间排序"""
+    keys: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+
+
+def to_wall_micros(values: Sequence[datetime]) -> np.ndarray:
+    """
+    转换为墙上时间的纪元微秒
+
+    忽略时区信息，按每天的工作时间裁剪时以时间本身的日期和钟点为准（与 datetime.replace 一致）
+    """
+    return np.fromiter(
+        ((value.replace(tzinfo=None) - _WALL_EPOCH) // MICROSECOND for value in values),
+        dtype=np.int64,
+        count=len(values)
+    )
+
+
+def from_wall_micros(value: int, tz: Optional[tzinfo] = None) -> datetime:
+    """墙上时间的纪元微秒转换为 datetime，to_wall_micros 的逆运算"""
+    return (_WALL_EPOCH + timedelta(microseconds=int(value))).replace(tzinfo=tz)
+
+
+def free_intervals(availability: Dict[int, List[Dict]]) -> FreeIntervals:
+    """员工ID -> 空闲时间段（含 start_time / end_time）编码为数组"""
+    keys = [employee_id for employee_id, slots in availability.items() for _ in slots]
+    slots = [slot for slots in availability.values() for slot in slots]
+    return FreeIntervals(
+        np.array(keys, dtype=np.int64),
+        to_wall_micros([slot["start_time"] for slot in slots]),
+        to_wall_micros([slot["end_time"] for slot in slots])
+    )
+
+
+def merge_touching(
+    keys: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """合并同一键下首尾相接的相邻区间"""
+    if not len(keys):
+        return keys, starts, ends
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (keys[1:] != keys[:-1]) | (starts[1:] != ends[:-1])
+    first_index = np.flatnonzero(first)
+    last_index = np.concatenate([first_index[1:] - 1, [len(keys) - 1]])
+    return keys[first_index], starts[first_index], ends[last_index]
+
+
+def clip_to_working_hours(
+    keys: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    work_start: int,
+    work_end: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    将空闲区间裁剪到每天的工作时间内，同一员工相接的片段合并
+
+    每个区间按覆盖的天数展开为逐天片段，再与当天的 [work_start, work_end) 求交
+    """
+    first_day = starts // DAY * DAY
+    day_counts = np.maximum(-((first_day - ends) // DAY), 0)
+    index = np.repeat(np.arange(len(keys)), day_counts)
+    day_offset = np.arange(len(index)) - np.repeat(np.cumsum(day_counts) - day_counts, day_counts)
+    days = first_day[index] + day_offset * DAY
+
+    piece_starts = np.maximum(starts[index], days + int(work_start * HOUR))
+    piece_ends = np.minimum(ends[index], days + int(work_end * HOUR))
+    keep = piece_starts < piece_ends
+    return merge_touching(keys[index][keep], piece_starts[keep], piece_ends[keep])
+
+
+def common_free_intervals(
+    starts: np.ndarray, ends: np.ndarray, employee_count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    所有员工的共同空闲区间（各员工的区间互不重叠且不相接）
+
+    空闲开始记 +1、结束记 -1，同一时刻先处理结束，避免首尾相接被视为重叠；
+    计数达到员工数的位置到下一个事件（必为结束）即为共同空闲，相接的区间合并。
+    """
+    if employee_count == 0 or not len(starts):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    times = np.concatenate([starts, ends])
+    deltas = np.concatenate([np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64)])
+    order = np.lexsort((deltas, times))
+    times, deltas = times[order], deltas[order]
+
+    opened = np.flatnonzero((deltas > 0) & (np.cumsum(deltas) == employee_count))
+    segment_starts, segment_ends = times[opened], times[opened + 1]
+    keep = segment_ends > segment_starts
+    _, common_starts, common_ends = merge_touching(
+        np.zeros(int(keep.sum()), dtype=np.int64), segment_starts[keep], segment_ends[keep]
+    )
+    return common_starts, common_ends
+
+
+def rank_slots(
+    free_starts: np.ndarray,
+    free_ends: np.ndarray,
+    duration: int,
+    max_candidates: int,
+    search_start: int,
+    search_end: int
+) -> List[Tuple[int, int, float]]:
+    """
+    从共同空闲区间中选出置信度最高的前 N 个候选（每个区间取起点）
+
+    置信度（0-1，保留4位小数）：
+    - 缓冲（权重0.6）：共同空闲时间相对需求时长的富余，富余越多越能容忍工期延误
+    - 及时性（权重0.4）：越靠近搜索窗口开始越好
+    置信度相同时取更早的区间。
+
+    Returns:
+        List[Tuple[int, int, float]]: (空闲开始, 空闲结束, 置信度)，置信度从高到低
+    """
+    order = np.flatnonzero(free_ends - free_starts >= duration)
+    if not len(order) or duration <= 0 or max_candidates <= 0:
+        return []
+
+    starts, ends = free_starts[order], free_ends[order]
+    duration_seconds = duration / 1e6
+    slack = (ends - starts) / 1e6 - duration_seconds
+    buffer_scores = np.clip(slack / duration_seconds, 0.0, 1.0)
+
+    timeliness_scores = np.ones(len(order))
+    if search_end > search_start:
+        offset = (starts - search_start) / 1e6
+        window = (search_end - search_start) / 1e6
+        timeliness_scores = 1.0 - np.clip(offset / window, 0.0, 1.0)
+
+    scores = [round(score, 4) for score in (0.6 * buffer_scores + 0.4 * timeliness_scores).tolist()]
+    best = heapq.nsmallest(max_candidates, range(len(order)), key=lambda i: (-scores[i], i))
+    return [(int(starts[i]), int(ends[i]), scores[i]) for i in best]
+
+
+def rank_common_slots(
+    keys: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    employee_count: int,
+    work_start: int,
+    work_end: int,
+    duration: int,
+    max_candidates: int,
+    search_start: int,
+    search_end: int
+) -> List[Tuple[int, int, float]]:
+    """
+    裁剪到工作时间、求共同空闲并排序候选
+
+    Returns:
+        List[Tuple[int, int, float]]: 见 rank_slots
+    """
+    _, clipped_starts, clipped_ends = clip_to_working_hours(keys, starts, ends, work_start, work_end)
+    common_starts, common_ends = common_free_intervals(clipped_starts, clipped_ends, employee_count)
+    return rank_slots(common_starts, common_ends, duration, max_candidates, search_start, search_end)
+
+
+def quorum_time_slots(
+    keys: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    work_start: int,
+    work_end: int,
+    duration: int,
+    min_available: int,
+    max_candidates: int
+) -> Dict[str, List[Tuple[int, List[int]]]]:
+    """
+    至少 min_available 名员工同时可用的区域（覆盖计数扫描）
+
+    员工在 [s, s + duration] 全程空闲，当且仅当 s 落在其某个空闲片段
+    [free_start, free_end - duration] 内。同一时刻先处理开始，再处理结束，区间为闭区间。
+
+    Returns:
+        Dict[str, List[Tuple[int, List[int]]]]: (开始, 可用员工ID) 列表
+            earliest: 按时间先后的可行区域（取各区域最早开始时刻）
+            best_covered: 按可用人数从多到少的可行区域（取各区域人数最多的时刻，人数相同取更早的）
+    """
+    keys, starts, ends = clip_to_working_hours(keys, starts, ends, work_start, work_end)
+    long_enough = ends - starts >= duration
+    keys, starts, ends = keys[long_enough], starts[long_enough], ends[long_enough] - duration
+
+    times = np.concatenate([starts, ends])
+    kinds = np.concatenate([np.zeros(len(starts), dtype=np.int64), np.ones(len(ends), dtype=np.int64)])
+    employees = np.concatenate([keys, keys])
+    order = np.lexsort((kinds, times))
+    events = zip(times[order].tolist(), kinds[order].tolist(), employees[order].tolist())
+
+    available = set()
+    regions = []  # [(最早时刻, 最早时刻可用员工, 最佳时刻, 最佳时刻可用员工)]
+    current = None
+    for time_point, group in groupby(events, key=lambda event: event[0]):
+        group = list(group)
+        for _, kind, employee_id in group:
+            if kind == 0:
+                available.add(employee_id)
+
+        if len(available) >= min_available:
+            if current is None:
+                current = [time_point, frozenset(available), time_point, frozenset(available)]
+            elif len(available) > len(current[3]):
+                current[2], current[3] = time_point, frozenset(available)
+
+        for _, kind, employee_id in group:
+            if kind == 1:
+                available.discard(employee_id)
+
+        if current is not None and len(available) < min_available:
+            regions.append(tuple(current))
+            current = None
+
+    # 有界堆保留人数最多的区域（人数相同取更早的）
+    heap = []
+    for order_index, region in enumerate(regions):
+        entry = (len(region[3]), -order_index)
+        if len(heap) < max_candidates:
+            heapq.heappush(heap, (entry, region))
+        elif entry > heap[0][0]:
+            heapq.heapreplace(heap, (entry, region))
+
+    return {
+        "earliest": [(region[0], sorted(region[1])) for region in regions[:max_candidates]],
+        "best_covered": [
+            (region[2], sorted(region[3]))
+            for _, region in sorted(heap, key=lambda e: e[0], reverse=True)
+        ]
+    }
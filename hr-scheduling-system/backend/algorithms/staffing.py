@@ -0,0 +1,122 @@
+"""
+扫描线人员统计
+对区间的开始/结束事件排序后扫描一遍（O(n log n)），得到精确的峰值并发数
+以及在岗人数随时间变化的阶梯函数（人员曲线）
+"""
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+# 不计入在岗人数和峰值并发的分配状态（各视图的峰值统计统一按此规则）
+EXCLUDED_STATUSES = ("cancelled",)
+
+
+def step_function(starts: Sequence, ends: Sequence) -> List[Tuple[datetime, int]]:
+    """
+    计算同时进行的区间数的阶梯函数
+
+    同一时刻先处理结束事件再处理开始事件，首尾相接的区间不算重叠；
+    同一时刻的所有事件处理完后才输出一个点，只在数值变化时输出。
+
+    Returns:
+        List[Tuple[datetime, int]]: 变化点 (时刻, 该时刻起的区间数)，数值保持到下一个变化点
+    """
+    events = sorted(
+        [(start, 1) for start, end in zip(starts, ends) if start < end] +
+        [(end, -1) for start, end in zip(starts, ends) if start < end],
+        key=lambda event: (event[0], event[1])
+    )
+
+    steps = []
+    level = 0
+    for index, (moment, delta) in enumerate(events):
+        level += delta
+        if index + 1 < len(events) and events[index + 1][0] == moment:
+            continue
+        if not steps or steps[-1][1] != level:
+            steps.append((moment, level))
+    return steps
+
+
+def peak_of(steps: List[Tuple[datetime, int]]) -> Tuple[int, Optional[datetime]]:
+    """阶梯函数的最大值及首次达到最大值的时刻"""
+    peak, peak_time = 0, None
+    for moment, level in steps:
+        if level > peak:
+            peak, peak_time = level, moment
+    return peak, peak_time
+
+
+def merge_by_key(
+    keys: Sequence[Hashable],
+    starts: Sequence,
+    ends: Sequence
+) -> Tuple[List, List]:
+    """
+    合并同一键（如员工）的重叠区间
+
+    一名员工同时有多个分配时只算一个人，合并后再扫描得到在岗人数
+    """
+    merged_starts, merged_ends = [], []
+    current_key = current_start = current_end = None
+    for key, start, end in sorted(zip(keys, starts, ends), key=lambda row: (row[0], row[1])):
+        if key == current_key and start <= current_end:
+            current_end = max(current_end, end)
+            continue
+        if current_key is not None:
+            merged_starts.append(current_start)
+            merged_ends.append(current_end)
+        current_key, current_start, current_end = key, start, end
+    if current_key is not None:
+        merged_starts.append(current_start)
+        merged_ends.append(current_end)
+    return merged_starts, merged_ends
+
+
+def peak_counts(keys: Sequence[Hashable], starts: Sequence, ends: Sequence) -> Tuple[int, int]:
+    """
+    峰值并发区间数和峰值在岗人数（同一键的重叠区间合并计一人）
+
+    只依赖时间值的比较，传入纪元微秒等整数时可提交到进程池执行
+    """
+    peak_intervals, _ = peak_of(step_function(starts, ends))
+    peak_headcount, _ = peak_of(step_function(*merge_by_key(keys, starts, ends)))
+    return peak_intervals, peak_headcount
+
+
+def staffing_curve(
+    employee_ids: Sequence[int],
+    starts: Sequence[datetime],
+    ends: Sequence[datetime],
+    range_start: datetime,
+    range_end: datetime
+) -> Dict:
+    """
+    在岗人数曲线与峰值统计
+
+    Args:
+        employee_ids: 每个分配的员工ID
+        starts: 分配开始时间
+        ends: 分配结束时间
+        range_start: 统计范围开始（区间会被裁剪到范围内）
+        range_end: 统计范围结束
+
+    Returns:
+        Dict: steps（从 range_start 开始的在岗人数变化点）、peak_headcount、peak_time、
+            peak_concurrent_assignments
+    """
+    starts = [max(start, range_start) for start in starts]
+    ends = [min(end, range_end) for end in ends]
+
+    peak_assignments, _ = peak_of(step_function(starts, ends))
+    headcount_steps = step_function(*merge_by_key(employee_ids, starts, ends))
+    peak_headcount, peak_time = peak_of(headcount_steps)
+
+    if not headcount_steps or headcount_steps[0][0] > range_start:
+        headcount_steps.insert(0, (range_start, 0))
+
+    return {
+        "steps": [{"time": moment, "headcount": level} for moment, level in headcount_steps],
+        "peak_headcount": peak_headcount,
+        "peak_time": peak_time,
+        "peak_concurrent_assignments": peak_assignments
+    }
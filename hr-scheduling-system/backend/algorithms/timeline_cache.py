@@ -0,0 +1,202 @@
+"""
+时间轴结果缓存
+按 (视图类型, 实体, 开始, 结束, 时间单位) 缓存序列化后的时间轴响应，并附带内容ETag。
+有效性由版本计数判断：每个缓存项记录它依赖的员工、项目（以及部门成员），
+分配或实体写入时递增对应的版本，依赖的版本变化后缓存项失效。
+
+版本时钟只在本进程内：变更通知来自本进程的会话写入，
+其他 worker 进程（多 worker 部署）或其他服务的写入不会使本进程的缓存失效，
+只能等缓存项过期。因此准确失效要求单 worker 部署；
+多 worker 部署时缓存结果最多滞后 TIMELINE_CACHE_TTL_SECONDS，
+不能接受时将 TIMELINE_CACHE_SIZE 设为 0 关闭缓存（仍返回ETag）。
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple
+from . import change_events
+
+# 依赖键：("employee", id)、("project", id)、("roster", None)、("projects", None)
+Dependency = Tuple[str, Optional[int]]
+
+# 员工记录的任何变化（新增、调岗、停用）都可能改变部门成员
+ROSTER: Dependency = ("roster", None)
+
+# 项目记录的任何变化（新增、修改区域）都可能改变区域包含的项目
+PROJECT_CATALOG: Dependency = ("projects", None)
+
+
+class CachedTimeline(NamedTuple):
+    """缓存项"""
+    body: bytes                           # 序列化后的响应体
+    etag: str                             # 响应体内容的ETag
+    dependencies: Tuple[Dependency, ...]  # 依赖的实体
+    computed_at: int                      # 开始计算时的版本时钟
+    expires_at: float                     # 过期时间（monotonic秒）
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应体生成强ETag，多个进程对相同内容生成相同的ETag"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 请求头是否与ETag匹配（弱比较）"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def timeline_dependencies(kind: str, entity_id, timeline: Dict) -> Set[Dependency]:
+    """
+    从时间轴结果推导缓存依赖
+
+    - 员工视图：该员工、出现的项目（项目名称）
+    - 项目视图：该项目、出现的员工（员工信息）
+    - 部门视图：部门成员、每名成员、出现的项目
+    - 区域视图：项目列表、每个项目及其中出现的员工
+    """
+    dependencies: Set[Dependency] = set()
+    if kind == "employee":
+        dependencies.add(("employee", entity_id))
+    elif kind == "project":
+        dependencies.add(("project", entity_id))
+    elif kind == "region":
+        dependencies.add(PROJECT_CATALOG)
+    else:
+        dependencies.add(ROSTER)
+
+    for item in timeline.get("timeline_items") or []:
+        dependencies.add(("project", item["project_id"]))
+    for employee_timeline in timeline.get("employee_timelines") or []:
+        dependencies.add(("employee", employee_timeline["employee"]["id"]))
+        for item in employee_timeline.get("timeline_items") or []:
+            dependencies.add(("project", item["project_id"]))
+    columns = timeline.get("columns")
+    if columns:
+        dependencies.update(("employee", employee_id) for employee_id in columns["employees"]["id"])
+        dependencies.update(("project", project_id) for project_id in columns["projects"]["id"])
+    for project_timeline in timeline.get("projects") or []:
+        dependencies |= timeline_dependencies("project", project_timeline["project"]["id"], project_timeline)
+    return dependencies
+
+
+class TimelineCache:
+    """
+    时间轴结果缓存
+
+    - 最多保留 max_entries 项，超出后淘汰最久未使用的项
+    - 缓存项超过 ttl_seconds 后过期，兜底处理未发布变更的写入（包括其他进程的写入）
+    - 版本使用单调递增的时钟：实体被写入时记录当时的时钟值，
+      缓存项只有在依赖的实体都没有在其开始计算之后被写入时才有效，
+      因此计算期间发生的写入也会使结果失效
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 15):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedTimeline]" = OrderedDict()
+        self._versions: Dict[Dependency, int] = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def clock(self) -> int:
+        """当前版本时钟，计算开始前获取并传给 put"""
+        with self._lock:
+            return self._clock
+
+    def get(self, key: Hashable) -> Optional[CachedTimeline]:
+        """获取仍然有效的缓存项"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic() or not self._is_current(entry):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        body: bytes,
+        dependencies: Iterable[Dependency],
+        computed_at: int
+    ) -> CachedTimeline:
+        """
+        保存计算结果
+
+        Args:
+            key: 缓存键
+            body: 序列化后的响应体
+            dependencies: 结果依赖的实体
+            computed_at: 开始计算前通过 clock() 获取的时钟值
+
+        Returns:
+            CachedTimeline: 缓存项（计算期间依赖被写入时不会保存，但仍返回给调用方使用）
+        """
+        entry = CachedTimeline(
+            body, make_etag(body), tuple(dependencies), computed_at,
+            time.monotonic() + self.ttl_seconds
+        )
+        with self._lock:
+            if self.max_entries > 0 and self._is_current(entry):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def bump(self, dependencies: Iterable[Dependency]) -> None:
+        """递增实体版本"""
+        with self._lock:
+            self._clock += 1
+            for dependency in dependencies:
+                self._versions[dependency] = self._clock
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def handle_change(self, change: change_events.ScheduleChange) -> None:
+        """变更监听器：递增受影响员工、项目的版本"""
+        dependencies = [("employee", eid) for eid in change.employee_ids | change.employees]
+        dependencies += [("project", pid) for pid in change.project_ids | change.projects]
+        if change.employees:
+            dependencies.append(ROSTER)
+        if change.projects:
+            dependencies.append(PROJECT_CATALOG)
+        self.bump(dependencies)
+
+    def _is_current(self, entry: CachedTimeline) -> bool:
+        return all(
+            self._versions.get(dependency, 0) <= entry.computed_at
+            for dependency in entry.dependencies
+        )
+
+
+# 进程级缓存实例，按配置延迟创建，见 api.deps.get_timeline_cache
+timeline_cache = None
+
+
+def get_timeline_cache(max_entries: int, ttl_seconds: float) -> TimelineCache:
+    """获取（必要时创建）进程级缓存实例"""
+    global timeline_cache
+    if timeline_cache is None:
+        timeline_cache = TimelineCache(max_entries, ttl_seconds)
+        change_events.subscribe(timeline_cache.handle_change)
+    return timeline_cache
@@ -2,26 +2,314 @@
 时间轴布局算法
 用于生成甘特图和时间轴视图的布局数据
 """
+import bisect
+import heapq
+import math
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterator, List, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload
 from models.assignment import Assignment
 from models.employee import Employee
 from models.project import Project
+from .columnar import timeline_columns
+from .compute_pool import INLINE_RUNNER
+from .occupancy import bucket_occupancy, uniform_bucket_edges
+from .overlap_matrix import to_epoch_micros, to_epoch_seconds
+from .staffing import EXCLUDED_STATUSES, peak_counts, peak_of, staffing_curve, step_function
+
+
+def assign_layout_rows(starts: Sequence, ends: Sequence) -> List[int]:
+    """
+    区间分行（最小堆区间划分），O(n log n)
+    
+    输入需按开始时间排序。每个项目放入当前空闲的最小行号，
+    行号越小越靠上，因此先派工的项目总是占据更靠上的行。
+    
+    Args:
+        starts: 按升序排列的开始时间
+        ends: 对应的结束时间
+    
+    Returns:
+        List[int]: 每个项目的行号
+    """
+    busy_rows = []  # (结束时间, 行号) 小顶堆
+    free_rows = []  # 空闲行号小顶堆
+    row_count = 0
+    rows = []
+    
+    for start, end in zip(starts, ends):
+        # 释放已结束的行
+        while busy_rows and busy_rows[0][0] <= start:
+            heapq.heappush(free_rows, heapq.heappop(busy_rows)[1])
+        
+        if free_rows:
+            row = heapq.heappop(free_rows)
+        else:
+            row = row_count
+            row_count += 1
+        
+        heapq.heappush(busy_rows, (end, row))
+        rows.append(row)
+    
+    return rows
+
+
+# 每个布局计算任务的项目数上限（按分组边界切分，任务之间可并行、可取消）
+LAYOUT_CHUNK_ITEMS = 5000
+
+
+def layout_rows_by_key(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    分组分行：键相同的连续项目为一组，每组独立调用 assign_layout_rows
+    
+    只接收数组参数，可提交到进程池执行。
+    
+    Args:
+        keys: 分组键，输入需按 (键, 开始时间) 排序
+        starts: 开始时间
+        ends: 结束时间
+    
+    Returns:
+        np.ndarray: 每个项目在组内的行号
+    """
+    rows = np.zeros(len(keys), dtype=np.int64)
+    boundaries = np.flatnonzero(np.diff(keys)) + 1
+    for segment_start, segment_end in zip(
+        np.concatenate([[0], boundaries]), np.concatenate([boundaries, [len(keys)]])
+    ):
+        rows[segment_start:segment_end] = assign_layout_rows(
+            starts[segment_start:segment_end].tolist(),
+            ends[segment_start:segment_end].tolist()
+        )
+    return rows
+
+
+def layout_rows(
+    keys: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    runner=INLINE_RUNNER,
+    chunk_items: Optional[int] = None
+) -> np.ndarray:
+    """
+    分组分行，按分组边界切成约 chunk_items 个项目的块交给 runner 计算（单个组不拆分）
+    
+    Args:
+        keys: 分组键，输入需按 (键, 开始时间) 排序
+        starts: 开始时间
+        ends: 结束时间
+        runner: 计算池 runner，默认在当前线程计算
+        chunk_items: 每块的项目数上限，默认 LAYOUT_CHUNK_ITEMS
+    
+    Returns:
+        np.ndarray: 每个项目在组内的行号
+    """
+    if not len(keys):
+        return np.zeros(0, dtype=np.int64)
+    
+    chunk_items = chunk_items or LAYOUT_CHUNK_ITEMS
+    cuts = [0]
+    for group_start in (np.flatnonzero(np.diff(keys)) + 1).tolist():
+        if group_start - cuts[-1] >= chunk_items:
+            cuts.append(group_start)
+    cuts.append(len(keys))
+    
+    return np.concatenate(runner.map(layout_rows_by_key, [
+        (keys[chunk_start:chunk_end], starts[chunk_start:chunk_end], ends[chunk_start:chunk_end])
+        for chunk_start, chunk_end in zip(cuts[:-1], cuts[1:])
+    ]))
+
+
+def assign_stable_rows(
+    starts: Sequence,
+    ends: Sequence,
+    previous_rows: Sequence[Optional[int]]
+) -> List[int]:
+    """
+    增量分行：保留已有行号，只为新项目和行号失效的项目分配行号
+    
+    已有行号与同一行中更早的项目重叠时视为失效。需要放置的项目按开始时间
+    依次放入与其不重叠的最小行号，因此未改动的项目不会在行之间跳动。
+    
+    Args:
+        starts: 开始时间
+        ends: 对应的结束时间
+        previous_rows: 之前的行号，None 表示需要放置
+    
+    Returns:
+        List[int]: 每个项目的行号
+    """
+    occupied: Dict[int, Tuple[list, list]] = {}  # 行号 -> (按开始时间排序的开始时间, 结束时间)
+    
+    def is_free(row: int, start, end) -> bool:
+        row_starts, row_ends = occupied.get(row, ((), ()))
+        position = bisect.bisect_right(row_starts, start)
+        if position > 0 and row_ends[position - 1] > start:
+            return False
+        return position == len(row_starts) or row_starts[position] >= end
+    
+    def occupy(row: int, start, end) -> None:
+        row_starts, row_ends = occupied.setdefault(row, ([], []))
+        position = bisect.bisect_right(row_starts, start)
+        row_starts.insert(position, start)
+        row_ends.insert(position, end)
+    
+    order = sorted(range(len(starts)), key=lambda i: starts[i])
+    rows: List[Optional[int]] = [None] * len(starts)
+    pending = []
+    for i in order:
+        row = previous_rows[i]
+        if row is not None and row >= 0 and is_free(row, starts[i], ends[i]):
+            rows[i] = row
+            occupy(row, starts[i], ends[i])
+        else:
+            pending.append(i)
+    
+    for i in pending:
+        row = 0
+        while not is_free(row, starts[i], ends[i]):
+            row += 1
+        rows[i] = row
+        occupy(row, starts[i], ends[i])
+    
+    return rows
+
+
+TIME_UNIT_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+# 紧凑网格的标签格式：小时、天为 strftime 格式，周为 WEEK_LABEL_FORMAT 模板
+TIME_LABEL_FORMATS = {
+    "hour": "%H:%M",
+    "day": "%m/%d",
+}
+
+WEEK_LABEL_FORMAT = "第{week}周"  # week 为ISO周数，不补零
+
+
+def format_time_label(time: datetime, time_unit: str) -> str:
+    """格式化时间标签"""
+    if time_unit == "hour":
+        return time.strftime("%H:%M")
+    elif time_unit == "day":
+        return time.strftime("%m/%d")
+    elif time_unit == "week":
+        return WEEK_LABEL_FORMAT.format(week=time.isocalendar()[1])
+    else:
+        return time.strftime("%m/%d")
+
+
+@lru_cache(maxsize=128)
+def full_time_grid(start_date: datetime, end_date: datetime, time_unit: str) -> Tuple[Dict, ...]:
+    """
+    逐格生成时间网格，按 (start, end, unit) 缓存
+    
+    返回的单元格在多个响应之间共享，调用方不应修改
+    """
+    delta = TIME_UNIT_STEPS.get(time_unit, timedelta(days=1))
+    mark_weekends = time_unit in ["day", "hour"]
+    
+    grid = []
+    current = start_date
+    while current < end_date:
+        next_time = current + delta
+        grid.append({
+            "start": current,
+            "end": min(next_time, end_date),
+            "label": format_time_label(current, time_unit),
+            "is_weekend": current.weekday() >= 5 if mark_weekends else False
+        })
+        current = next_time
+    
+    return tuple(grid)
+
+
+def compact_time_grid(start_date: datetime, end_date: datetime, time_unit: str) -> Dict:
+    """
+    紧凑时间网格：起点、步长、格数、周末位图和标签格式，由客户端自行展开
+    
+    第 i 格为 [start + i * step, min(start + (i + 1) * step, end))。
+    周末位图为小端字节序的十六进制字符串：第 j 个字节的第 k 位对应第 8j+k 格。
+    小时、天的标签为格起点按 label_format（strftime）格式化；周的标签为
+    week_label 模板填入 iso_weeks 中该格的ISO周数（跨年时周数回绕，客户端不必自行计算）。
+    """
+    delta = TIME_UNIT_STEPS.get(time_unit, timedelta(days=1))
+    step_seconds = delta.total_seconds()
+    count = max(math.ceil((end_date - start_date).total_seconds() / step_seconds), 0)
+    
+    weekend_bitmap = ""
+    if time_unit in ["day", "hour"] and count:
+        # 各格起点距离起点所在周一零点的天数，模7得到星期
+        monday = (start_date - timedelta(days=start_date.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        offsets = (start_date - monday).total_seconds() + np.arange(count) * step_seconds
+        weekdays = (offsets // 86400).astype(np.int64) % 7
+        weekend_bitmap = np.packbits(weekdays >= 5, bitorder="little").tobytes().hex()
+    
+    return {
+        "start": start_date,
+        "end": end_date,
+        "unit": time_unit,
+        "step_seconds": int(step_seconds),
+        "count": count,
+        "weekend_bitmap": weekend_bitmap,
+        "label_format": None if time_unit == "week" else TIME_LABEL_FORMATS.get(time_unit, "%m/%d"),
+        "week_label": WEEK_LABEL_FORMAT if time_unit == "week" else None,
+        "iso_weeks": [
+            (start_date + delta * i).isocalendar()[1] for i in range(count)
+        ] if time_unit == "week" else None
+    }
+
+
+class TimelineViewport(NamedTuple):
+    """
+    虚拟滚动视口：员工行游标 + 可见时间窗口
+    
+    行号和统计始终在完整时间范围内计算，只裁剪返回的数据，
+    因此不同页、不同时间窗口中同一项目的行号一致。
+    """
+    after_employee_id: Optional[int] = None  # 只返回ID大于该值的员工
+    limit: Optional[int] = None              # 每页员工数
+    view_start: Optional[datetime] = None    # 可见窗口开始
+    view_end: Optional[datetime] = None      # 可见窗口结束
+    prefetch: float = 0.5                    # 窗口前后各预取窗口宽度的比例
+    
+    def fetch_range(self, start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
+        """加上预取边距后实际返回的时间范围（不超出完整时间范围）"""
+        view_start = max(self.view_start or start_date, start_date)
+        view_end = min(self.view_end or end_date, end_date)
+        margin = max(view_end - view_start, timedelta(0)) * self.prefetch
+        return max(view_start - margin, start_date), min(view_end + margin, end_date)
 
 
 class TimelineLayoutEngine:
     """时间轴布局引擎"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, runner=INLINE_RUNNER):
+        """
+        Args:
+            db_session: 数据库会话
+            runner: 计算池 runner，布局分行通过它执行，默认在当前线程计算
+        """
         self.db = db_session
+        self.runner = runner
     
     def generate_employee_timeline(
         self, 
         employee_id: int, 
         start_date: datetime, 
         end_date: datetime,
-        time_unit: str = "day"  # "hour", "day", "week"
+        time_unit: str = "day",  # "hour", "day", "week"
+        grid_format: str = "full",  # "full", "compact"
+        viewport: Optional[TimelineViewport] = None
     ) -> Dict:
         """
         生成单个员工的时间轴布局
@@ -31,6 +319,8 @@ class TimelineLayoutEngine:
             start_date: 开始日期
             end_date: 结束日期
             time_unit: 时间单位
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+            viewport: 可见时间窗口，只返回窗口（含预取边距）内的项目
         
         Returns:
             Dict: 时间轴布局数据
@@ -40,25 +330,64 @@ class TimelineLayoutEngine:
             return {"error": "员工不存在"}
         
         # 获取时间段内的所有分配
-        assignments = self.db.query(Assignment).filter(
+        assignments = self.db.query(Assignment).options(
+            joinedload(Assignment.project)
+        ).filter(
             Assignment.employee_id == employee_id,
             Assignment.start_time < end_date,
             Assignment.end_time > start_date
         ).order_by(Assignment.start_time).all()
         
         # 生成时间网格
-        time_grid = self._generate_time_grid(start_date, end_date, time_unit)
+        time_grid = self._generate_time_grid(start_date, end_date, time_unit, grid_format)
         
-        # 处理分配数据
+        timeline = self._build_employee_timeline(
+            employee, assignments, start_date, end_date, time_unit, time_grid
+        )
+        return self._apply_viewport(timeline, viewport, start_date, end_date)
+    
+    def _build_employee_timeline(
+        self, 
+        employee: Employee, 
+        assignments: List[Assignment], 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str,
+        time_grid: Union[List[Dict], Dict, None]
+    ) -> Dict:
+        """根据已加载的员工和分配构建员工时间轴"""
+        timeline_items = self._employee_timeline_items(assignments, start_date, end_date, time_unit)
+        
+        # 检测重叠并调整布局
+        layout_items = self._resolve_overlaps(timeline_items)
+        
+        return self._employee_timeline(employee, layout_items, start_date, end_date, time_unit, time_grid)
+    
+    def _employee_timeline_items(
+        self, 
+        assignments: List[Assignment], 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str
+    ) -> List[Dict]:
+        """把员工的分配处理为时间轴项目（未分行）"""
         timeline_items = []
         for assignment in assignments:
             item = self._process_assignment_for_timeline(assignment, start_date, end_date, time_unit)
             if item:
                 timeline_items.append(item)
-        
-        # 检测重叠并调整布局
-        layout_items = self._resolve_overlaps(timeline_items)
-        
+        return timeline_items
+    
+    def _employee_timeline(
+        self, 
+        employee: Employee, 
+        layout_items: List[Dict], 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str,
+        time_grid: Union[List[Dict], Dict, None]
+    ) -> Dict:
+        """由已分行的时间轴项目组装员工时间轴"""
         return {
             "employee": {
                 "id": employee.id,
@@ -81,7 +410,9 @@ class TimelineLayoutEngine:
         project_id: int, 
         start_date: datetime, 
         end_date: datetime,
-        time_unit: str = "day"
+        time_unit: str = "day",
+        grid_format: str = "full",
+        viewport: Optional[TimelineViewport] = None
     ) -> Dict:
         """
         生成项目的时间轴布局（显示所有参与员工）
@@ -91,6 +422,8 @@ class TimelineLayoutEngine:
             start_date: 开始日期
             end_date: 结束日期
             time_unit: 时间单位
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+            viewport: 虚拟滚动视口，按员工ID分页并只返回窗口（含预取边距）内的项目
         
         Returns:
             Dict: 项目时间轴布局数据
@@ -100,11 +433,20 @@ class TimelineLayoutEngine:
             return {"error": "项目不存在"}
         
         # 获取项目的所有分配
-        assignments = self.db.query(Assignment).filter(
+        query = self.db.query(Assignment).filter(
             Assignment.project_id == project_id,
             Assignment.start_time < end_date,
             Assignment.end_time > start_date
-        ).order_by(Assignment.employee_id, Assignment.start_time).all()
+        )
+        
+        has_more = False
+        if viewport is not None and (viewport.after_employee_id is not None or viewport.limit):
+            # 先确定当前页的员工，只加载这些员工的分配
+            employee_query = query.with_entities(Assignment.employee_id).distinct()
+            rows, has_more = self._page_by_employee(employee_query, Assignment.employee_id, viewport)
+            query = query.filter(Assignment.employee_id.in_([employee_id for (employee_id,) in rows]))
+        
+        assignments = query.order_by(Assignment.employee_id, Assignment.start_time).all()
         
         # 按员工分组
         employee_timelines = {}
@@ -120,10 +462,10 @@ class TimelineLayoutEngine:
             if item:
                 employee_timelines[employee_id]["assignments"].append(item)
         
-        # 生成每个员工的布局
+        # 生成每个员工的布局（所有员工一次分行）
         employee_layouts = []
-        for employee_id, data in employee_timelines.items():
-            layout_items = self._resolve_overlaps(data["assignments"])
+        layout_groups = self._layout_groups([data["assignments"] for data in employee_timelines.values()])
+        for data, layout_items in zip(employee_timelines.values(), layout_groups):
             employee_layouts.append({
                 "employee": {
                     "id": data["employee"].id,
@@ -133,9 +475,9 @@ class TimelineLayoutEngine:
                 "timeline_items": layout_items
             })
         
-        time_grid = self._generate_time_grid(start_date, end_date, time_unit)
+        time_grid = self._generate_time_grid(start_date, end_date, time_unit, grid_format)
         
-        return {
+        timeline = {
             "project": {
                 "id": project.id,
                 "name": project.name,
@@ -151,13 +493,138 @@ class TimelineLayoutEngine:
             "employee_timelines": employee_layouts,
             "statistics": self._calculate_project_statistics(employee_layouts)
         }
+        return self._apply_viewport(timeline, viewport, start_date, end_date, has_more)
+    
+    def generate_project_timeline_patch(
+        self, 
+        project_id: int, 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str,
+        assignment_id: int,
+        previous_rows: Dict[int, int],
+        previous_employee_id: Optional[int] = None
+    ) -> Dict:
+        """
+        单个分配新增、修改或删除后，增量更新项目时间轴
+        
+        只重新加载并布局受影响员工的泳道：该分配当前所属员工，以及客户端显示它的
+        原员工（分配换人或删除时原泳道的行数可能减少）。其他项目保留客户端已有的行号，
+        返回补丁而不是完整的时间轴。
+        
+        Args:
+            project_id: 项目ID
+            start_date: 开始日期
+            end_date: 结束日期
+            time_unit: 时间单位
+            assignment_id: 发生变化的分配ID
+            previous_rows: 客户端当前的行号（分配ID -> 行号）
+            previous_employee_id: 客户端当前显示该分配的员工，新增的分配为None
+        
+        Returns:
+            Dict: 补丁数据，包括移除的分配、位置变化的项目、受影响泳道的行数和项目统计
+        """
+        project = self.db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            return {"error": "项目不存在"}
+        
+        changed = self.db.query(Assignment).filter(Assignment.id == assignment_id).first()
+        
+        lane_employee_ids = []
+        if changed is not None and changed.project_id == project_id:
+            lane_employee_ids.append(changed.employee_id)
+        if previous_employee_id is not None and previous_employee_id not in lane_employee_ids:
+            lane_employee_ids.append(previous_employee_id)
+        
+        moved = []
+        lanes = {}
+        visible_ids = set()
+        for employee_id in lane_employee_ids:
+            # 受影响的泳道：该员工在本项目中的分配
+            assignments = self.db.query(Assignment).options(
+                joinedload(Assignment.project)
+            ).filter(
+                Assignment.project_id == project_id,
+                Assignment.employee_id == employee_id,
+                Assignment.start_time < end_date,
+                Assignment.end_time > start_date
+            ).order_by(Assignment.start_time).all()
+            
+            items = []
+            for assignment in assignments:
+                item = self._process_assignment_for_timeline(assignment, start_date, end_date, time_unit)
+                if item:
+                    items.append(item)
+            
+            rows = assign_stable_rows(
+                [item["actual_start"] for item in items],
+                [item["actual_end"] for item in items],
+                [None if item["id"] == assignment_id else previous_rows.get(item["id"]) for item in items]
+            )
+            for item, row in zip(items, rows):
+                item["layout"]["row"] = row
+                item["employee_id"] = employee_id
+                visible_ids.add(item["id"])
+                if previous_rows.get(item["id"]) != row or item["id"] == assignment_id:
+                    moved.append(item)
+            
+            # 原员工的泳道可能已经没有项目，行数为0
+            lanes[employee_id] = max(rows) + 1 if rows else 0
+        
+        return {
+            "project_id": project_id,
+            "assignment_id": assignment_id,
+            "time_range": {
+                "start": start_date,
+                "end": end_date,
+                "unit": time_unit
+            },
+            "removed": [] if assignment_id in visible_ids else [assignment_id],
+            "moved": moved,
+            "lanes": lanes,
+            "statistics": self._calculate_project_statistics(
+                self._load_project_durations(project_id, start_date, end_date)
+            )
+        }
+    
+    def _load_project_durations(
+        self, 
+        project_id: int, 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> List[Dict]:
+        """只读取时间和状态列，按员工整理视图范围内的时段，结构与 employee_timelines 一致"""
+        rows = self.db.query(
+            Assignment.employee_id, Assignment.start_time, Assignment.end_time, Assignment.status
+        ).filter(
+            Assignment.project_id == project_id,
+            Assignment.start_time < end_date,
+            Assignment.end_time > start_date
+        ).all()
+        
+        items_by_employee: Dict[int, List[Dict]] = {}
+        for employee_id, start_time, end_time, status in rows:
+            actual_start, actual_end = max(start_time, start_date), min(end_time, end_date)
+            if actual_start < actual_end:
+                items_by_employee.setdefault(employee_id, []).append({
+                    "actual_start": actual_start,
+                    "actual_end": actual_end,
+                    "duration_hours": (actual_end - actual_start).total_seconds() / 3600,
+                    "status": status
+                })
+        return [
+            {"employee": {"id": employee_id}, "timeline_items": items}
+            for employee_id, items in items_by_employee.items()
+        ]
     
     def generate_department_overview(
         self, 
         department: str, 
         start_date: datetime, 
         end_date: datetime,
-        time_unit: str = "day"
+        time_unit: str = "day",
+        grid_format: str = "full",
+        viewport: Optional[TimelineViewport] = None
     ) -> Dict:
         """
         生成部门概览时间轴
@@ -167,27 +634,54 @@ class TimelineLayoutEngine:
             start_date: 开始日期
             end_date: 结束日期
             time_unit: 时间单位
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+            viewport: 虚拟滚动视口，按员工ID分页并只返回窗口（含预取边距）内的项目
         
         Returns:
             Dict: 部门概览数据
         """
-        # 获取部门所有员工
-        employees = self.db.query(Employee).filter(
+        # 获取部门所有员工（查询1）
+        employee_query = self.db.query(Employee).filter(
             Employee.department == department,
             Employee.status == "active"
-        ).all()
+        )
         
-        department_data = []
-        for employee in employees:
-            timeline = self.generate_employee_timeline(
-                employee.id, start_date, end_date, time_unit
-            )
-            if "error" not in timeline:
-                department_data.append(timeline)
+        has_more = False
+        if viewport is not None and (viewport.after_employee_id is not None or viewport.limit):
+            employees, has_more = self._page_by_employee(employee_query, Employee.id, viewport)
+        else:
+            employees = employee_query.order_by(Employee.id).all()
         
-        time_grid = self._generate_time_grid(start_date, end_date, time_unit)
+        # 一次查询获取所有员工的分配并预加载项目（查询2），在内存中按员工分组
+        assignments_by_employee: Dict[int, List[Assignment]] = {}
+        if employees:
+            assignments = self.db.query(Assignment).options(
+                joinedload(Assignment.project)
+            ).filter(
+                Assignment.employee_id.in_([employee.id for employee in employees]),
+                Assignment.start_time < end_date,
+                Assignment.end_time > start_date
+            ).order_by(Assignment.employee_id, Assignment.start_time).all()
+            
+            for assignment in assignments:
+                assignments_by_employee.setdefault(assignment.employee_id, []).append(assignment)
         
-        return {
+        # 时间网格只生成一次，所有员工共用
+        time_grid = self._generate_time_grid(start_date, end_date, time_unit, grid_format)
+        
+        # 所有员工的时间轴项目一次分行
+        layout_groups = self._layout_groups([
+            self._employee_timeline_items(
+                assignments_by_employee.get(employee.id, []), start_date, end_date, time_unit
+            )
+            for employee in employees
+        ])
+        department_data = [
+            self._employee_timeline(employee, layout_items, start_date, end_date, time_unit, time_grid)
+            for employee, layout_items in zip(employees, layout_groups)
+        ]
+        
+        timeline = {
             "department": department,
             "time_range": {
                 "start": start_date,
@@ -198,37 +692,572 @@ class TimelineLayoutEngine:
             "employee_timelines": department_data,
             "statistics": self._calculate_department_statistics(department_data)
         }
+        return self._apply_viewport(timeline, viewport, start_date, end_date, has_more)
     
-    def _generate_time_grid(
+    def generate_region_overview(
         self, 
+        region: str, 
         start_date: datetime, 
-        end_date: datetime, 
-        time_unit: str
-    ) -> List[Dict]:
-        """生成时间网格"""
-        grid = []
-        current = start_date
-        
-        if time_unit == "hour":
-            delta = timedelta(hours=1)
-        elif time_unit == "day":
-            delta = timedelta(days=1)
-        elif time_unit == "week":
-            delta = timedelta(weeks=1)
-        else:
-            delta = timedelta(days=1)
-        
-        while current < end_date:
-            next_time = current + delta
-            grid.append({
-                "start": current,
-                "end": min(next_time, end_date),
-                "label": self._format_time_label(current, time_unit),
-                "is_weekend": current.weekday() >= 5 if time_unit in ["day", "hour"] else False
+        end_date: datetime,
+        time_unit: str = "day",
+        grid_format: str = "full"
+    ) -> Dict:
+        """
+        生成区域时间轴：区域内每个项目的员工时间轴及区域统计
+        
+        固定两次查询：区域内的项目、这些项目在时间段内的分配（预加载员工）。
+        时间轴项目在当前线程构建，所有 (项目, 员工) 的重叠解析编码为紧凑数组，
+        按块交给 runner 计算（使用计算池时各块并行）。
+        
+        Args:
+            region: 区域名称（Project.region）
+            start_date: 开始日期
+            end_date: 结束日期
+            time_unit: 时间单位
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+        
+        Returns:
+            Dict: 区域时间轴数据
+        """
+        # 查询1：区域内的项目
+        projects = self.db.query(Project).filter(
+            Project.region == region
+        ).order_by(Project.id).all()
+        
+        # 查询2：所有项目的分配，预加载员工（项目已在会话中，访问 assignment.project 不再查询）
+        assignments = []
+        if projects:
+            assignments = self.db.query(Assignment).options(
+                joinedload(Assignment.employee)
+            ).filter(
+                Assignment.project_id.in_([project.id for project in projects]),
+                Assignment.start_time < end_date,
+                Assignment.end_time > start_date
+            ).order_by(Assignment.project_id, Assignment.employee_id, Assignment.start_time).all()
+        
+        # 按 项目 -> 员工 分组为普通数据
+        items_by_project: Dict[int, Dict[int, List[Dict]]] = {project.id: {} for project in projects}
+        employee_info: Dict[int, Dict] = {}
+        for assignment in assignments:
+            item = self._process_assignment_for_timeline(assignment, start_date, end_date, time_unit)
+            if not item:
+                continue
+            items_by_project[assignment.project_id].setdefault(assignment.employee_id, []).append(item)
+            if assignment.employee_id not in employee_info:
+                employee_info[assignment.employee_id] = {
+                    "id": assignment.employee.id,
+                    "name": assignment.employee.name,
+                    "position": assignment.employee.position
+                }
+        
+        project_info = [
+            {
+                "id": project.id,
+                "name": project.name,
+                "status": project.status,
+                "priority": project.priority
+            }
+            for project in projects
+        ]
+        
+        groups = [
+            (project_id, employee_id, items)
+            for project_id, items_by_employee in items_by_project.items()
+            for employee_id, items in items_by_employee.items()
+        ]
+        layout_groups = self._layout_groups([items for _, _, items in groups])
+        
+        employee_layouts_by_project: Dict[int, List[Dict]] = {project.id: [] for project in projects}
+        for (project_id, employee_id, _), layout_items in zip(groups, layout_groups):
+            employee_layouts_by_project[project_id].append({
+                "employee": employee_info[employee_id],
+                "timeline_items": layout_items
             })
-            current = next_time
         
-        return grid
+        project_timelines = [
+            {
+                "project": info,
+                "employee_timelines": employee_layouts_by_project[info["id"]],
+                "statistics": self._calculate_project_statistics(employee_layouts_by_project[info["id"]])
+            }
+            for info in project_info
+        ]
+        
+        return {
+            "region": region,
+            "time_range": {
+                "start": start_date,
+                "end": end_date,
+                "unit": time_unit
+            },
+            "time_grid": self._generate_time_grid(start_date, end_date, time_unit, grid_format),
+            "projects": project_timelines,
+            "statistics": self._calculate_region_statistics(project_timelines)
+        }
+    
+    def generate_occupancy(
+        self, 
+        scope: str, 
+        scope_value, 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str = "week",
+        grid_format: str = "full"
+    ) -> Dict:
+        """
+        层次细节模式：按时间网格单元汇总每名员工的占用，代替逐条分配
+        
+        每名员工每个时间桶返回占用小时数、不同项目数和峰值并发数（已取消的分配不计入峰值），
+        只读取时间和状态列并一次向量化计算，响应大小只与员工数 × 桶数有关。
+        
+        Args:
+            scope: 视图类型，employee、project 或 department
+            scope_value: 员工ID、项目ID或部门名称
+            start_date: 开始日期
+            end_date: 结束日期
+            time_unit: 时间单位（即桶宽度）
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+        
+        Returns:
+            Dict: 汇总后的时间轴数据
+        """
+        scope_data = self._load_scope(
+            self.db.query(
+                Assignment.employee_id, Assignment.project_id, Assignment.start_time, Assignment.end_time,
+                Assignment.status
+            ),
+            0, scope, scope_value, start_date, end_date
+        )
+        if "error" in scope_data:
+            return scope_data
+        header, employees, rows = scope_data["header"], scope_data["employees"], scope_data["rows"]
+        
+        group_of = {employee.id: index for index, employee in enumerate(employees)}
+        group_index = np.fromiter((group_of[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+        project_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        starts = to_epoch_seconds([row[2] for row in rows])
+        ends = to_epoch_seconds([row[3] for row in rows])
+        
+        edges = uniform_bucket_edges(
+            to_epoch_seconds([start_date])[0],
+            to_epoch_seconds([end_date])[0],
+            TIME_UNIT_STEPS.get(time_unit, timedelta(days=1)).total_seconds()
+        )
+        counted = np.fromiter((row[4] not in EXCLUDED_STATUSES for row in rows), dtype=bool, count=len(rows))
+        occupancy = bucket_occupancy(edges, starts, ends, group_index, len(employees), project_ids, counted)
+        assignment_counts = np.bincount(group_index, minlength=len(employees))
+        
+        employee_timelines = []
+        for index, employee in enumerate(employees):
+            assigned_hours = float(occupancy.busy_hours[index].sum())
+            employee_timelines.append({
+                "employee": {
+                    "id": employee.id,
+                    "name": employee.name,
+                    "position": employee.position,
+                    "department": employee.department
+                },
+                "occupancy": {
+                    "busy_hours": occupancy.busy_hours[index].tolist(),
+                    "project_count": occupancy.project_count[index].tolist(),
+                    "peak_concurrency": occupancy.peak_concurrency[index].tolist()
+                },
+                "statistics": {
+                    "assignment_count": int(assignment_counts[index]),
+                    "assigned_hours": assigned_hours,
+                    "peak_concurrent_assignments": int(occupancy.peak_concurrency[index].max(initial=0))
+                }
+            })
+        
+        timeline = {
+            **header,
+            "time_range": {
+                "start": start_date,
+                "end": end_date,
+                "unit": time_unit
+            },
+            "time_grid": self._generate_time_grid(start_date, end_date, time_unit, grid_format)
+        }
+        
+        if scope == "employee":
+            total_hours = (end_date - start_date).total_seconds() / 3600
+            single = employee_timelines[0]
+            timeline["employee"] = single["employee"]
+            timeline["occupancy"] = single["occupancy"]
+            timeline["statistics"] = {
+                **single["statistics"],
+                "total_hours": total_hours,
+                "utilization_rate": (single["statistics"]["assigned_hours"] / total_hours) * 100 if total_hours > 0 else 0
+            }
+            return timeline
+        
+        staffed = [row for row in rows if row[4] not in EXCLUDED_STATUSES]
+        curve = staffing_curve(
+            [row[0] for row in staffed], [row[2] for row in staffed], [row[3] for row in staffed],
+            start_date, end_date
+        )
+        timeline["employee_timelines"] = employee_timelines
+        timeline["statistics"] = {
+            "total_employees": len(employees),
+            "total_assignments": len(rows),
+            "total_hours": float(occupancy.busy_hours.sum()),
+            "peak_concurrent_assignments": curve["peak_concurrent_assignments"],
+            "peak_headcount": curve["peak_headcount"]
+        }
+        return timeline
+    
+    def generate_columnar_timeline(
+        self, 
+        scope: str, 
+        scope_value, 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str = "day",
+        grid_format: str = "full"
+    ) -> Dict:
+        """
+        列式时间轴：与逐项目时间轴包含相同的分配和布局行号，编码为并行数组
+        
+        分配只查询所需的列（连接项目名称），查询结果行直接转换为数组，
+        不构建逐项目的字典；项目名称和状态字典编码，时间为相对视图开始的整数秒，
+        百分比位置由客户端按 start / (结束 - 开始) 计算。不包含备注。
+        
+        Args:
+            scope: 视图类型，employee、project 或 department
+            scope_value: 员工ID、项目ID或部门名称
+            start_date: 开始日期
+            end_date: 结束日期
+            time_unit: 时间单位（只影响时间网格）
+            grid_format: 时间网格格式，full 逐格列出，compact 为紧凑编码
+        
+        Returns:
+            Dict: 列式时间轴数据
+        """
+        scope_data = self._load_scope(
+            self.db.query(
+                Assignment.id, Assignment.employee_id, Assignment.project_id, Project.name,
+                Assignment.start_time, Assignment.end_time, Assignment.status
+            ).outerjoin(
+                Project, Project.id == Assignment.project_id
+            ),
+            1, scope, scope_value, start_date, end_date
+        )
+        if "error" in scope_data:
+            return scope_data
+        header, employees, rows = scope_data["header"], scope_data["employees"], scope_data["rows"]
+        
+        columns = timeline_columns(
+            rows, start_date, end_date,
+            {employee.id: index for index, employee in enumerate(employees)},
+            self.runner
+        )
+        columns["employees"] = {
+            "id": [employee.id for employee in employees],
+            "name": [employee.name for employee in employees],
+            "position": [employee.position for employee in employees]
+        }
+        
+        items = columns["items"]
+        total_hours = (end_date - start_date).total_seconds() / 3600
+        assigned_hours = sum(items["width"]) / 3600
+        staffed = [row for row in rows if row[6] not in EXCLUDED_STATUSES]
+        curve = staffing_curve(
+            [row[1] for row in staffed], [row[4] for row in staffed], [row[5] for row in staffed],
+            start_date, end_date
+        )
+        statistics = {
+            "total_employees": len(employees),
+            "total_assignments": len(items["assignment_id"]),
+            "total_hours": assigned_hours,
+            "peak_concurrent_assignments": curve["peak_concurrent_assignments"],
+            "peak_headcount": curve["peak_headcount"]
+        }
+        if scope == "employee":
+            statistics.update({
+                "total_hours": total_hours,
+                "assigned_hours": assigned_hours,
+                "utilization_rate": (assigned_hours / total_hours) * 100 if total_hours > 0 else 0
+            })
+        
+        return {
+            **header,
+            "time_range": {
+                "start": start_date,
+                "end": end_date,
+                "unit": time_unit
+            },
+            "time_grid": self._generate_time_grid(start_date, end_date, time_unit, grid_format),
+            "columns": columns,
+            "statistics": statistics
+        }
+    
+    def _load_scope(
+        self,
+        query,
+        employee_column: int,
+        scope: str,
+        scope_value,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict:
+        """
+        按视图类型过滤分配查询，加载视图头部信息、员工列表和查询结果
+        
+        Args:
+            query: 选择所需列的分配查询
+            employee_column: 员工ID在结果行中的位置
+            scope: 视图类型，employee、project 或 department
+            scope_value: 员工ID、项目ID或部门名称
+            start_date: 开始日期
+            end_date: 结束日期
+        
+        Returns:
+            Dict: header（员工、项目信息或部门名称）、employees（按ID排序）、
+                  rows（按员工、开始时间、分配ID排序），实体不存在时为 error
+        """
+        query = query.filter(
+            Assignment.start_time < end_date,
+            Assignment.end_time > start_date
+        )
+        
+        employees = None
+        header = {}
+        if scope == "employee":
+            employee = self.db.query(Employee).filter(Employee.id == scope_value).first()
+            if not employee:
+                return {"error": "员工不存在"}
+            employees = [employee]
+            header["employee"] = {
+                "id": employee.id,
+                "name": employee.name,
+                "position": employee.position,
+                "department": employee.department
+            }
+            query = query.filter(Assignment.employee_id == scope_value)
+        elif scope == "project":
+            project = self.db.query(Project).filter(Project.id == scope_value).first()
+            if not project:
+                return {"error": "项目不存在"}
+            header["project"] = {
+                "id": project.id,
+                "name": project.name,
+                "status": project.status,
+                "priority": project.priority
+            }
+            query = query.filter(Assignment.project_id == scope_value)
+        else:
+            header["department"] = scope_value
+            employees = self.db.query(Employee).filter(
+                Employee.department == scope_value,
+                Employee.status == "active"
+            ).order_by(Employee.id).all()
+            query = query.filter(Assignment.employee_id.in_([employee.id for employee in employees]))
+        
+        rows = query.order_by(
+            Assignment.employee_id, Assignment.start_time, Assignment.id
+        ).all() if employees != [] else []
+        if employees is None:
+            employees = self.db.query(Employee).filter(
+                Employee.id.in_({row[employee_column] for row in rows})
+            ).order_by(Employee.id).all()
+        
+        return {"header": header, "employees": employees, "rows": rows}
+    
+    def generate_staffing_curve(
+        self, 
+        scope: str, 
+        scope_value, 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> Dict:
+        """
+        生成项目、部门或区域的在岗人数曲线
+        
+        只读取 (员工ID, 开始, 结束) 三列，扫描线得到在岗人数阶梯函数、
+        峰值在岗人数和峰值并发分配数，已取消的分配不计入。
+        
+        Args:
+            scope: 统计范围，project、department 或 region
+            scope_value: 项目ID、部门名称或区域名称
+            start_date: 开始日期
+            end_date: 结束日期
+        
+        Returns:
+            Dict: 人员曲线数据
+        """
+        query = self.db.query(
+            Assignment.employee_id, Assignment.start_time, Assignment.end_time
+        ).filter(
+            Assignment.status.notin_(EXCLUDED_STATUSES),
+            Assignment.start_time < end_date,
+            Assignment.end_time > start_date
+        )
+        
+        if scope == "project":
+            if not self.db.query(Project.id).filter(Project.id == scope_value).first():
+                return {"error": "项目不存在"}
+            query = query.filter(Assignment.project_id == scope_value)
+        elif scope == "department":
+            query = query.join(Employee, Employee.id == Assignment.employee_id).filter(
+                Employee.department == scope_value,
+                Employee.status == "active"
+            )
+        else:
+            query = query.join(Project, Project.id == Assignment.project_id).filter(
+                Project.region == scope_value
+            )
+        
+        rows = query.all()
+        curve = staffing_curve(
+            [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows],
+            start_date, end_date
+        )
+        return {
+            "scope": scope,
+            "scope_value": str(scope_value),
+            "time_range": {
+                "start": start_date,
+                "end": end_date
+            },
+            "total_assignments": len(rows),
+            "total_employees": len({row[0] for row in rows}),
+            **curve
+        }
+    
+    def iter_employee_timelines(
+        self, 
+        start_date: datetime, 
+        end_date: datetime,
+        time_unit: str = "day",
+        department: Optional[str] = None,
+        region: Optional[str] = None,
+        batch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        逐个生成员工时间轴，用于流式输出
+        
+        员工、分配和项目通过一条外连接查询按 (员工ID, 开始时间) 顺序读取，
+        使用服务端游标分批获取，每读完一名员工就产出其时间轴，内存只与单个员工的分配数相关。
+        产出的时间轴结构与 generate_employee_timeline 一致，但不含时间网格。
+        
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            time_unit: 时间单位
+            department: 部门名称
+            region: 区域，按员工参与过的项目所属区域判断
+            batch_size: 每批读取的行数
+        
+        Yields:
+            Dict: 员工时间轴
+        """
+        query = self.db.query(Employee, Assignment, Project).outerjoin(
+            Assignment, and_(
+                Assignment.employee_id == Employee.id,
+                Assignment.start_time < end_date,
+                Assignment.end_time > start_date
+            )
+        ).outerjoin(
+            Project, Project.id == Assignment.project_id
+        ).filter(Employee.status == "active")
+        
+        if department:
+            query = query.filter(Employee.department == department)
+        if region:
+            region_employees = self.db.query(Assignment.employee_id).join(
+                Project, Project.id == Assignment.project_id
+            ).filter(Project.region == region)
+            query = query.filter(Employee.id.in_(region_employees))
+        
+        rows = query.order_by(
+            Employee.id, Assignment.start_time
+        ).execution_options(stream_results=True).yield_per(batch_size)
+        
+        # 同一行中的项目已进入会话标识映射，访问 assignment.project 不会再次查询
+        for _, group in groupby(rows, key=lambda row: row[0].id):
+            group = list(group)
+            assignments = [assignment for _, assignment, _ in group if assignment is not None]
+            yield self._build_employee_timeline(
+                group[0][0], assignments, start_date, end_date, time_unit, time_grid=None
+            )
+    
+    def _page_by_employee(self, query, employee_id_column, viewport: TimelineViewport) -> Tuple[list, bool]:
+        """
+        按员工ID游标分页（多取一行判断是否还有下一页）
+        
+        Returns:
+            Tuple[list, bool]: (当前页的查询结果, 是否还有下一页)
+        """
+        if viewport.after_employee_id is not None:
+            query = query.filter(employee_id_column > viewport.after_employee_id)
+        query = query.order_by(employee_id_column)
+        if not viewport.limit:
+            return query.all(), False
+        
+        rows = query.limit(viewport.limit + 1).all()
+        return rows[:viewport.limit], len(rows) > viewport.limit
+    
+    def _apply_viewport(
+        self, 
+        timeline: Dict, 
+        viewport: Optional[TimelineViewport], 
+        start_date: datetime, 
+        end_date: datetime,
+        has_more: bool = False
+    ) -> Dict:
+        """
+        按视口裁剪时间轴：只保留与预取范围重叠的项目和网格单元
+        
+        行号、百分比位置和统计已在完整时间范围内计算，裁剪不会改变它们
+        """
+        if viewport is None:
+            return timeline
+        
+        fetch_start, fetch_end = viewport.fetch_range(start_date, end_date)
+        
+        def visible(items: List[Dict]) -> List[Dict]:
+            return [
+                item for item in items
+                if item["actual_start"] < fetch_end and item["actual_end"] > fetch_start
+            ]
+        
+        # 逐格网格在多个员工时间轴之间共享，只裁剪一次
+        grid = timeline.get("time_grid")
+        sliced_grid = grid
+        if isinstance(grid, list):
+            sliced_grid = [cell for cell in grid if cell["start"] < fetch_end and cell["end"] > fetch_start]
+        
+        timelines = [timeline] + (timeline.get("employee_timelines") or [])
+        for item_timeline in timelines:
+            if item_timeline.get("time_grid") is grid:
+                item_timeline["time_grid"] = sliced_grid
+            if "timeline_items" in item_timeline:
+                item_timeline["timeline_items"] = visible(item_timeline["timeline_items"])
+        
+        employee_ids = [t["employee"]["id"] for t in timeline.get("employee_timelines") or []]
+        timeline["window"] = {
+            "after_employee_id": viewport.after_employee_id,
+            "limit": viewport.limit,
+            "has_more": has_more,
+            "next_after_employee_id": employee_ids[-1] if has_more and employee_ids else None,
+            "view_start": viewport.view_start,
+            "view_end": viewport.view_end,
+            "fetch_start": fetch_start,
+            "fetch_end": fetch_end
+        }
+        return timeline
+    
+    def _generate_time_grid(
+        self, 
+        start_date: datetime, 
+        end_date: datetime, 
+        time_unit: str,
+        grid_format: str = "full"
+    ) -> Union[List[Dict], Dict]:
+        """生成时间网格，grid_format 为 compact 时返回紧凑编码"""
+        if grid_format == "compact":
+            return compact_time_grid(start_date, end_date, time_unit)
+        return list(full_time_grid(start_date, end_date, time_unit))
     
     def _process_assignment_for_timeline(
         self, 
@@ -275,31 +1304,30 @@ class TimelineLayoutEngine:
     
     def _resolve_overlaps(self, timeline_items: List[Dict]) -> List[Dict]:
         """解决时间轴项目的重叠问题"""
-        if not timeline_items:
-            return []
-        
-        # 按开始时间排序
-        sorted_items = sorted(timeline_items, key=lambda x: x["actual_start"])
-        
-        # 分配行号以避免重叠
-        rows = []
-        for item in sorted_items:
-            # 寻找可以放置的行
-            placed = False
-            for row_idx, row in enumerate(rows):
-                # 检查是否与该行的最后一个项目重叠
-                if not row or item["actual_start"] >= row[-1]["actual_end"]:
-                    row.append(item)
-                    item["layout"]["row"] = row_idx
-                    placed = True
-                    break
-            
-            # 如果没有找到合适的行，创建新行
-            if not placed:
-                rows.append([item])
-                item["layout"]["row"] = len(rows) - 1
+        return self._layout_groups([timeline_items])[0]
+    
+    def _layout_groups(self, groups: List[List[Dict]]) -> List[List[Dict]]:
+        """
+        多组时间轴项目一次分行：各组按开始时间排序，编码为 (组号, 开始, 结束) 数组交给 runner
+        
+        Returns:
+            List[List[Dict]]: 每组按开始时间排序、已设置行号的项目
+        """
+        sorted_groups = [sorted(items, key=lambda x: x["actual_start"]) for items in groups]
+        items = [item for group in sorted_groups for item in group]
+        if not items:
+            return sorted_groups
         
-        return sorted_items
+        rows = layout_rows(
+            np.repeat(np.arange(len(sorted_groups)), [len(group) for group in sorted_groups]),
+            to_epoch_micros([item["actual_start"] for item in items]),
+            to_epoch_micros([item["actual_end"] for item in items]),
+            self.runner
+        )
+        for item, row in zip(items, rows.tolist()):
+            item["layout"]["row"] = row
+        
+        return sorted_groups
     
     def _calculate_timeline_statistics(
         self, 
@@ -310,13 +1338,18 @@ class TimelineLayoutEngine:
         """计算时间轴统计信息"""
         total_hours = (end_date - start_date).total_seconds() / 3600
         assigned_hours = sum(item["duration_hours"] for item in timeline_items)
+        staffed = [item for item in timeline_items if item["status"] not in EXCLUDED_STATUSES]
         
         return {
             "total_hours": total_hours,
             "assigned_hours": assigned_hours,
             "utilization_rate": (assigned_hours / total_hours) * 100 if total_hours > 0 else 0,
             "assignment_count": len(timeline_items),
-            "max_concurrent_assignments": max((item["layout"]["row"] for item in timeline_items), default=0) + 1
+            "max_concurrent_assignments": max((item["layout"]["row"] for item in timeline_items), default=0) + 1,
+            "peak_concurrent_assignments": peak_of(step_function(
+                [item["actual_start"] for item in staffed],
+                [item["actual_end"] for item in staffed]
+            ))[0]
         }
     
     def _calculate_project_statistics(self, employee_layouts: List[Dict]) -> Dict:
@@ -332,7 +1365,8 @@ class TimelineLayoutEngine:
             "total_employees": total_employees,
             "total_assignments": total_assignments,
             "total_hours": total_hours,
-            "average_hours_per_employee": total_hours / total_employees if total_employees > 0 else 0
+            "average_hours_per_employee": total_hours / total_employees if total_employees > 0 else 0,
+            **self._peak_statistics(employee_layouts)
         }
     
     def _calculate_department_statistics(self, employee_timelines: List[Dict]) -> Dict:
@@ -349,16 +1383,51 @@ class TimelineLayoutEngine:
             "total_assignments": sum(
                 timeline["statistics"]["assignment_count"] 
                 for timeline in employee_timelines
-            )
+            ),
+            **self._peak_statistics(employee_timelines)
+        }
+    
+    def _calculate_region_statistics(self, project_timelines: List[Dict]) -> Dict:
+        """计算区域统计信息（员工跨项目去重）"""
+        employee_timelines = [
+            timeline
+            for project_timeline in project_timelines
+            for timeline in project_timeline["employee_timelines"]
+        ]
+        total_hours = sum(
+            project_timeline["statistics"]["total_hours"] for project_timeline in project_timelines
+        )
+        
+        return {
+            "total_projects": len(project_timelines),
+            "staffed_projects": sum(1 for p in project_timelines if p["employee_timelines"]),
+            "total_employees": len({timeline["employee"]["id"] for timeline in employee_timelines}),
+            "total_assignments": sum(
+                project_timeline["statistics"]["total_assignments"] for project_timeline in project_timelines
+            ),
+            "total_hours": total_hours,
+            **self._peak_statistics(employee_timelines)
+        }
+    
+    def _peak_statistics(self, employee_timelines: List[Dict]) -> Dict:
+        """扫描线计算整体的峰值并发分配数和峰值在岗人数（同一员工的多条时间轴合并计人，已取消的分配不计入），交给 runner 计算"""
+        keys, starts, ends = [], [], []
+        for timeline in employee_timelines:
+            for item in timeline["timeline_items"]:
+                if item["status"] in EXCLUDED_STATUSES:
+                    continue
+                keys.append(timeline["employee"]["id"])
+                starts.append(item["actual_start"])
+                ends.append(item["actual_end"])
+        
+        peak_assignments, peak_headcount = self.runner(
+            peak_counts, keys, to_epoch_micros(starts).tolist(), to_epoch_micros(ends).tolist()
+        )
+        return {
+            "peak_concurrent_assignments": peak_assignments,
+            "peak_headcount": peak_headcount
         }
     
     def _format_time_label(self, time: datetime, time_unit: str) -> str:
         """格式化时间标签"""
-        if time_unit == "hour":
-            return time.strftime("%H:%M")
-        elif time_unit == "day":
-            return time.strftime("%m/%d")
-        elif time_unit == "week":
-            return f"第{time.isocalendar()[1]}周"
-        else:
-            return time.strftime("%m/%d")
\ No newline at end of file
+        return format_time_label(time, time_unit)
\ No newline at end of file
@@ -1,9 +1,17 @@
 """
 API依赖项
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator, Union
+from fastapi import Depends
 from sqlalchemy.orm import Session
-from core.database import SessionLocal
+from core.config import settings
+from core.database import SessionLocal, get_async_sessionmaker
+from algorithms import (
+    AsyncConflictDetector, ConflictDetector, ThreadedConflictDetector,
+    TimelineCache, assignment_index, get_availability_calendar
+)
+from algorithms.compute_pool import ComputePool, get_compute_pool as _get_compute_pool
+from algorithms.timeline_cache import get_timeline_cache as _get_timeline_cache
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -12,4 +20,54 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _detector_backends() -> dict:
+    """按配置选择冲突检测和可用性后端"""
+    interval_index = assignment_index if settings.CONFLICT_BACKEND == "index" else None
+    calendar = None
+    if settings.AVAILABILITY_BACKEND == "calendar":
+        calendar = get_availability_calendar(
+            settings.AVAILABILITY_SLOT_MINUTES, settings.AVAILABILITY_CACHE_WINDOWS
+        )
+    return {"interval_index": interval_index, "calendar": calendar}
+
+
+def get_conflict_detector(db: Session = Depends(get_db)) -> ConflictDetector:
+    """根据配置的冲突检测和可用性后端创建检测器"""
+    return ConflictDetector(db, **_detector_backends())
+
+
+async def get_async_conflict_detector() -> AsyncGenerator[
+    Union[AsyncConflictDetector, ThreadedConflictDetector], None
+]:
+    """
+    创建供 async 端点使用的检测器
+
+    使用异步数据库会话；未安装异步驱动时退回在线程池中运行的同步检测器
+    """
+    factory = get_async_sessionmaker()
+    if factory is None:
+        db = SessionLocal()
+        try:
+            yield ThreadedConflictDetector(ConflictDetector(db, **_detector_backends()))
+        finally:
+            db.close()
+        return
+    async with factory() as session:
+        yield AsyncConflictDetector(session, **_detector_backends())
+
+
+def get_timeline_cache() -> TimelineCache:
+    """获取按配置创建的时间轴结果缓存"""
+    return _get_timeline_cache(settings.TIMELINE_CACHE_SIZE, settings.TIMELINE_CACHE_TTL_SECONDS)
+
+
+def get_compute_pool() -> ComputePool:
+    """获取按配置创建的算法计算池"""
+    return _get_compute_pool(
+        settings.ALGORITHM_POOL, settings.ALGORITHM_POOL_WORKERS,
+        settings.ALGORITHM_POOL_MAX_JOBS, settings.ALGORITHM_POOL_QUEUE_SECONDS,
+        settings.ALGORITHM_POOL_MIN_ITEMS
+    )
@@ -0,0 +1,119 @@
+"""
+键集分页
+列表按 (排序键, id) 排序，下一页从上一页最后一行之后开始：
+    WHERE (排序键, id) > (上一页最后一行的排序键, id) ORDER BY 排序键, id LIMIT n
+不再扫描并丢弃前面的行，翻页期间的插入也不会造成重复或遗漏。
+
+游标是 (排序方式, 排序键值, id) 的 base64url 编码，对客户端不透明，
+下一页游标通过 X-Next-Cursor 响应头返回，没有下一页时不返回该响应头。
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort: str, sort_value: Any, row_id: int) -> str:
+    """生成游标"""
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort, sort_value, row_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    解析游标
+
+    Returns:
+        Tuple[Any, int]: (排序键值, id)，时间类排序键为ISO格式字符串
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, sort_value, row_id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="分页游标与排序方式不匹配"
+        )
+    return sort_value, row_id
+
+
+def _cursor_sort_value(sort_value: Any, python_type: type) -> Any:
+    """游标中的排序键值转换为排序列的类型，类型不符（游标被篡改）时返回400"""
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(sort_value)
+        if isinstance(sort_value, python_type):
+            return sort_value
+    except (ValueError, TypeError):
+        pass
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="无效的分页游标"
+    )
+
+
+def keyset_page(
+    query: Query,
+    sort: str,
+    sort_columns: Dict[str, Any],
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    response: Response,
+    skip: int = 0
+) -> List:
+    """
+    按 (排序键, id) 读取一页，有下一页时设置 X-Next-Cursor 响应头
+
+    Args:
+        query: 已应用筛选条件的查询
+        sort: 排序方式（sort_columns 的键）
+        sort_columns: 排序方式 -> 排序列，排序列为 id 本身时只按 id 排序
+        id_column: 主键列
+        cursor: 上一页返回的游标
+        limit: 每页行数
+        response: 用于设置响应头
+        skip: 兼容旧的偏移分页，不能与游标同时使用
+
+    Returns:
+        List: 当前页的行
+    """
+    sort_column = sort_columns[sort]
+    single_key = sort_column is id_column
+
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="游标分页不能与 skip 同时使用"
+        )
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort)
+        if single_key:
+            query = query.filter(id_column > row_id)
+        else:
+            sort_value = _cursor_sort_value(sort_value, sort_column.type.python_type)
+            query = query.filter(tuple_(sort_column, id_column) > tuple_(sort_value, row_id))
+
+    order = [id_column] if single_key else [sort_column, id_column]
+    rows = query.order_by(*order).offset(skip).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            sort, getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows
@@ -0,0 +1,54 @@
+"""
+快速JSON序列化
+热点算法端点不经过 response_model 和 jsonable_encoder 的逐值转换：
+响应按 schemas.algorithm 中的类型化模型校验，由模块级创建的 TypeAdapter 直接输出JSON字节串
+（见 model_encoder）；不需要校验的结构用 orjson 序列化，datetime、numpy 数组由 orjson 原生处理。
+"""
+from typing import Any, Callable, Optional
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+# 整数键（如按员工ID分组的结果）转为字符串键，与 pydantic 的输出一致
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+Encoder = Callable[[Any], bytes]
+
+
+def _default(value: Any) -> Any:
+    """orjson 不支持的类型：pydantic 模型转为字典"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """序列化为JSON字节串（不校验）"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def model_encoder(model: Any) -> Encoder:
+    """
+    创建按响应模型校验并序列化的编码函数
+
+    TypeAdapter 在调用时创建一次，应在模块级调用，避免每个请求重建校验器。
+    结构与模型不符时抛出 pydantic.ValidationError（返回500）；
+    算法输出中没有的可选字段不会以 null 输出。
+    """
+    adapter = TypeAdapter(model)
+
+    def encode(content: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(content), exclude_unset=True)
+
+    return encode
+
+
+class ORJSONResponse(JSONResponse):
+    """使用 orjson（或指定的编码函数）序列化的JSON响应"""
+
+    def __init__(self, content: Any, encode: Optional[Encoder] = None, **kwargs):
+        self.encode = encode or dump_json
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return self.encode(content)
@@ -3,21 +3,51 @@
 提供冲突检测和时间轴布局算法的API接口
 """
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from api.deps import get_db
-from algorithms import ConflictDetector, TimelineLayoutEngine
+from api.deps import (
+    get_db, get_compute_pool, get_conflict_detector, get_async_conflict_detector, get_timeline_cache
+)
+from api.responses import ORJSONResponse, model_encoder
+from algorithms import AsyncConflictDetector, ConflictDetector, TimelineCache, TimelineLayoutEngine
+from algorithms import binary_export
+from algorithms.columnar import COLUMNAR_MEDIA_TYPE
+from algorithms.compute_pool import ComputeCancelled, ComputePool, ComputePoolBusy
+from algorithms.conflict_audit import iter_overlapping_pairs
+from algorithms.timeline_cache import CachedTimeline, etag_matches, timeline_dependencies
+from algorithms.timeline_layout import TimelineViewport
+from models.assignment import Assignment
+from models.employee import Employee
+from models.project import Project
 from schemas.algorithm import (
     ConflictCheckRequest, ConflictCheckResponse,
     MultipleConflictCheckRequest, MultipleConflictCheckResponse,
-    TimelineRequest, TimelineResponse,
+    ConflictAuditItem,
+    TimelineRequest, TimelineResponse, TimelinePatchRequest, TimelinePatchResponse,
+    ColumnarTimelineResponse, RegionTimelineResponse, EmployeeTimeline,
     AvailabilityRequest, AvailabilityResponse,
-    OptimalTimeSlotRequest, OptimalTimeSlotResponse
+    BatchAvailabilityRequest, BatchAvailabilityResponse, EmployeeAvailability,
+    OptimalTimeSlotRequest, OptimalTimeSlotResponse,
+    QuorumTimeSlotRequest, QuorumTimeSlotResponse,
+    StaffingCurveResponse
 )
 
 router = APIRouter()
 
+# 热点响应的编码函数：按响应模型校验后由 TypeAdapter 直接输出JSON
+_encode_conflict_check = model_encoder(ConflictCheckResponse)
+_encode_multiple_conflict_check = model_encoder(MultipleConflictCheckResponse)
+_encode_conflict_audit_item = model_encoder(ConflictAuditItem)
+_encode_availability = model_encoder(AvailabilityResponse)
+_encode_batch_availability = model_encoder(BatchAvailabilityResponse)
+_encode_employee_availability = model_encoder(EmployeeAvailability)
+_encode_timeline = model_encoder(TimelineResponse)
+_encode_columnar_timeline = model_encoder(ColumnarTimelineResponse)
+_encode_region_timeline = model_encoder(RegionTimelineResponse)
+_encode_employee_timeline = model_encoder(EmployeeTimeline)
+
 
 @router.get("/health")
 async def algorithm_health_check():
@@ -28,18 +58,17 @@ async def algorithm_health_check():
 @router.post("/conflicts/check", response_model=ConflictCheckResponse)
 async def check_single_conflict(
     request: ConflictCheckRequest,
-    db: Session = Depends(get_db)
+    detector: AsyncConflictDetector = Depends(get_async_conflict_detector)
 ):
     """检查单个员工时间冲突"""
     try:
-        detector = ConflictDetector(db)
-        result = detector.check_employee_conflict(
+        result = await detector.check_employee_conflict(
             employee_id=request.employee_id,
             start_time=request.start_time,
             end_time=request.end_time,
             exclude_assignment_id=request.exclude_assignment_id
         )
-        return result
+        return ORJSONResponse(result, _encode_conflict_check)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -47,68 +76,181 @@ async def check_single_conflict(
 @router.post("/conflicts/check-multiple", response_model=MultipleConflictCheckResponse)
 async def check_multiple_conflicts(
     request: MultipleConflictCheckRequest,
-    db: Session = Depends(get_db)
+    detector: AsyncConflictDetector = Depends(get_async_conflict_detector)
 ):
     """检查多个员工时间冲突"""
     try:
-        detector = ConflictDetector(db)
-        
         # 将Pydantic模型转换为字典列表
         processed_assignments = []
         for assignment in request.employee_assignments:
             assignment_dict = {
                 "employee_id": assignment.employee_id,
                 "start_time": assignment.start_time,
-                "end_time": assignment.end_time
+                "end_time": assignment.end_time,
+                "exclude_assignment_id": assignment.exclude_assignment_id
             }
             processed_assignments.append(assignment_dict)
         
-        result = detector.check_multiple_employees_conflict(processed_assignments)
-        return MultipleConflictCheckResponse(**result)
+        result = await detector.check_multiple_employees_conflict(processed_assignments)
+        return ORJSONResponse(result, _encode_multiple_conflict_check)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/conflicts/audit")
+def audit_conflicts(
+    employee_id: Optional[int] = Query(None, description="只审计指定员工"),
+    db: Session = Depends(get_db)
+):
+    """
+    全公司冲突审计
+    
+    扫描全部活跃分配，以NDJSON流式返回所有重叠的分配对
+    """
+    pairs = iter_overlapping_pairs(db, employee_id=employee_id)
+    return StreamingResponse(
+        (_encode_conflict_audit_item(pair) + b"\n" for pair in pairs),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post("/availability/check", response_model=AvailabilityResponse)
 async def check_availability(
     request: AvailabilityRequest,
-    db: Session = Depends(get_db)
+    detector: AsyncConflictDetector = Depends(get_async_conflict_detector)
 ):
     """检查员工可用性"""
     try:
-        detector = ConflictDetector(db)
-        
-        availability = detector.get_employee_availability(
+        availability = await detector.get_employee_availability(
             request.employee_id,
             request.start_date,
             request.end_date
         )
         
-        return AvailabilityResponse(available_slots=availability)
+        return ORJSONResponse({"available_slots": availability}, _encode_availability)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _resolve_employee_ids(db: Session, request: BatchAvailabilityRequest) -> List[int]:
+    """
+    解析批量请求的员工范围
+    
+    员工没有区域字段，区域按员工参与过的项目所属区域判断
+    """
+    query = db.query(Employee.id)
+    if request.employee_ids is not None:
+        query = query.filter(Employee.id.in_(request.employee_ids))
+    else:
+        query = query.filter(Employee.status == "active")
+    if request.department:
+        query = query.filter(Employee.department == request.department)
+    if request.region:
+        region_employees = db.query(Assignment.employee_id).join(Project).filter(
+            Project.region == request.region
+        )
+        query = query.filter(Employee.id.in_(region_employees))
+    return [employee_id for (employee_id,) in query.order_by(Employee.id).all()]
+
+
+@router.post("/availability/check-batch", response_model=BatchAvailabilityResponse)
+def check_availability_batch(
+    request: BatchAvailabilityRequest,
+    db: Session = Depends(get_db),
+    detector: ConflictDetector = Depends(get_conflict_detector)
+):
+    """批量检查员工可用性（单次查询），可选NDJSON流式返回"""
+    if request.employee_ids is None and not request.department and not request.region:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请指定员工ID列表、部门或区域"
+        )
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="开始时间必须早于结束时间"
+        )
+    
+    employee_ids = _resolve_employee_ids(db, request)
+    results = (
+        {
+            "employee_id": employee_id,
+            "available_slots": slots,
+            "total_available_hours": sum(slot["duration_hours"] for slot in slots)
+        }
+        for employee_id, slots in detector.iter_employees_availability(
+            employee_ids, request.start_date, request.end_date
+        )
+    )
+    
+    if request.stream:
+        return StreamingResponse(
+            (_encode_employee_availability(item) + b"\n" for item in results),
+            media_type="application/x-ndjson"
+        )
+    
+    results = list(results)
+    return ORJSONResponse({"total_employees": len(results), "results": results}, _encode_batch_availability)
+
+
+T = TypeVar("T")
+
+# 客户端在响应前断开连接（nginx 约定的状态码）
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+async def _offload(http_request: Request, pool: ComputePool, func: Callable[[Any], T]) -> T:
+    """
+    在请求线程中执行 func(runner)：数据加载不占用计算池配额，布局和搜索计算通过 runner 交给计算池
+
+    计算排队等待配额超时返回503；客户端断开时取消尚未开始的计算
+    """
+    try:
+        return await pool.offload(func, http_request.is_disconnected)
+    except ComputePoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="算法计算繁忙，请稍后重试",
+            headers={"Retry-After": "1"}
+        )
+    except ComputeCancelled:
+        raise HTTPException(
+            status_code=HTTP_499_CLIENT_CLOSED_REQUEST,
+            detail="客户端已断开连接"
+        )
+
+
+def _with_runner(detector: ConflictDetector, runner) -> ConflictDetector:
+    """让检测器的时间段搜索通过计算池 runner 执行（检测器为每个请求单独创建）"""
+    detector.runner = runner
+    return detector
+
+
 @router.post("/optimal-time/find", response_model=OptimalTimeSlotResponse)
-def find_optimal_time_slot(
+async def find_optimal_time_slot(
     request: OptimalTimeSlotRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    detector: ConflictDetector = Depends(get_conflict_detector),
+    pool: ComputePool = Depends(get_compute_pool)
 ):
     """寻找最优时间段"""
-    detector = ConflictDetector(db)
-    
-    optimal_slot = detector.find_optimal_time_slot(
-        request.employee_ids,
-        request.duration_hours,
-        request.start_date,
-        request.end_date,
-        request.working_hours
+    candidates = await _offload(
+        http_request, pool,
+        lambda runner: _with_runner(detector, runner).find_candidate_time_slots(
+            request.employee_ids,
+            request.duration_hours,
+            request.start_date,
+            request.end_date,
+            request.working_hours,
+            request.max_candidates
+        )
     )
     
-    if optimal_slot:
+    if candidates:
         return OptimalTimeSlotResponse(
             found=True,
-            optimal_slot=optimal_slot
+            optimal_slot=candidates[0],
+            candidates=candidates
         )
     else:
         return OptimalTimeSlotResponse(
@@ -117,67 +259,429 @@ def find_optimal_time_slot(
         )
 
 
+@router.post("/optimal-time/quorum", response_model=QuorumTimeSlotResponse)
+async def find_quorum_time_slots(
+    request: QuorumTimeSlotRequest,
+    http_request: Request,
+    detector: ConflictDetector = Depends(get_conflict_detector),
+    pool: ComputePool = Depends(get_compute_pool)
+):
+    """寻找至少指定人数员工同时可用的时间段"""
+    if request.min_available > len(set(request.employee_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="所需可用人数不能超过候选员工数"
+        )
+    
+    slots = await _offload(
+        http_request, pool,
+        lambda runner: _with_runner(detector, runner).find_quorum_time_slots(
+            request.employee_ids,
+            request.min_available,
+            request.duration_hours,
+            request.start_date,
+            request.end_date,
+            request.working_hours,
+            request.max_candidates
+        )
+    )
+    
+    if slots["earliest"]:
+        return QuorumTimeSlotResponse(found=True, **slots)
+    else:
+        return QuorumTimeSlotResponse(
+            found=False,
+            message="未找到满足人数要求的时间段"
+        )
+
+
+def _time_window(
+    view_start: Optional[datetime] = Query(None, description="可见窗口开始"),
+    view_end: Optional[datetime] = Query(None, description="可见窗口结束"),
+    prefetch: float = Query(0.5, ge=0, le=5, description="窗口前后各预取窗口宽度的比例")
+) -> Optional[TimelineViewport]:
+    """可见时间窗口参数"""
+    if view_start is None and view_end is None:
+        return None
+    if view_start is not None and view_end is not None and view_start >= view_end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="可见窗口开始时间必须早于结束时间"
+        )
+    return TimelineViewport(view_start=view_start, view_end=view_end, prefetch=prefetch)
+
+
+def _timeline_viewport(
+    after_employee_id: Optional[int] = Query(None, description="员工行游标，只返回ID大于该值的员工"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="每页员工数"),
+    window: Optional[TimelineViewport] = Depends(_time_window)
+) -> Optional[TimelineViewport]:
+    """虚拟滚动视口参数：员工行游标 + 可见时间窗口"""
+    if after_employee_id is None and limit is None:
+        return window
+    return (window or TimelineViewport())._replace(after_employee_id=after_employee_id, limit=limit)
+
+
+# 可按 Accept 请求头协商的响应格式（按优先顺序）
+_NEGOTIABLE_FORMATS = (
+    ("arrow", binary_export.ARROW_MEDIA_TYPE),
+    ("msgpack", binary_export.MSGPACK_MEDIA_TYPE),
+    ("columnar", COLUMNAR_MEDIA_TYPE)
+)
+
+
+def _payload_format(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(json|columnar|arrow|msgpack)$", description="响应格式: json, columnar（并行数组）, arrow（Arrow IPC）, msgpack（MessagePack），默认按 Accept 请求头协商")
+) -> str:
+    """响应格式：format 参数优先，否则按 Accept 请求头中的媒体类型选择"""
+    if not format:
+        accept = request.headers.get("accept", "")
+        format = next((name for name, media_type in _NEGOTIABLE_FORMATS if media_type in accept), "json")
+    if not binary_export.is_available(format):
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"服务器未安装 {format} 格式的依赖"
+        )
+    return format
+
+
+def _check_payload_format(payload: str, detail: str, viewport: Optional[TimelineViewport]) -> None:
+    """列式及二进制格式只用于完整的逐条分配视图"""
+    if payload != "json" and (detail == "aggregate" or viewport is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="列式及二进制格式不支持汇总明细级别和视口参数"
+        )
+
+
+def _timeline_response(
+    request: Request,
+    cache: TimelineCache,
+    key: tuple,
+    generate: Callable[[], Dict],
+    encode: Callable[[Dict], bytes] = _encode_timeline,
+    media_type: str = "application/json"
+) -> Response:
+    """
+    返回带ETag的时间轴响应
+
+    缓存命中且 If-None-Match 匹配时直接返回304，不做任何布局计算；
+    未命中时计算并缓存序列化结果，内容未变化时同样返回304
+    """
+    entry = cache.get(key)
+    if entry is None:
+        entry = _compute_timeline(cache, key, generate, encode)
+    return _cached_timeline_response(request, entry, media_type)
+
+
+async def _offloaded_timeline_response(
+    request: Request,
+    pool: ComputePool,
+    cache: TimelineCache,
+    key: tuple,
+    generate: Callable[[Any], Dict],
+    encode: Callable[[Dict], bytes] = _encode_timeline,
+    media_type: str = "application/json"
+) -> Response:
+    """
+    与 _timeline_response 相同，但缓存未命中时在请求线程中生成（generate 接收计算池 runner）
+
+    缓存命中和数据加载都不占用计算池配额，只有通过 runner 提交的大计算排队等待配额
+    """
+    entry = cache.get(key)
+    if entry is None:
+        entry = await _offload(
+            request, pool, lambda runner: _compute_timeline(cache, key, lambda: generate(runner), encode)
+        )
+    return _cached_timeline_response(request, entry, media_type)
+
+
+def _compute_timeline(
+    cache: TimelineCache,
+    key: tuple,
+    generate: Callable[[], Dict],
+    encode: Callable[[Dict], bytes]
+) -> CachedTimeline:
+    """计算时间轴并缓存序列化结果"""
+    computed_at = cache.clock()
+    timeline = generate()
+    if "error" in timeline:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=timeline["error"]
+        )
+    body = encode(timeline)
+    return cache.put(key, body, timeline_dependencies(key[0], key[1], timeline), computed_at)
+
+
+def _cached_timeline_response(request: Request, entry: CachedTimeline, media_type: str) -> Response:
+    """返回缓存的时间轴，If-None-Match 匹配时返回304"""
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache", "Vary": "Accept"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
+
+
+def _columnar_encoding(payload: str) -> Dict:
+    """列式时间轴的序列化方式和媒体类型（JSON、Arrow IPC 或 MessagePack）"""
+    if payload == "arrow":
+        return {"encode": binary_export.encode_timeline_arrow, "media_type": binary_export.ARROW_MEDIA_TYPE}
+    if payload == "msgpack":
+        return {"encode": binary_export.encode_timeline_msgpack, "media_type": binary_export.MSGPACK_MEDIA_TYPE}
+    return {"encode": _encode_columnar_timeline, "media_type": COLUMNAR_MEDIA_TYPE}
+
+
+def _columnar_response(
+    request: Request,
+    cache: TimelineCache,
+    key: tuple,
+    generate: Callable[[], Dict],
+    payload: str
+) -> Response:
+    """返回列式时间轴响应（JSON、Arrow IPC 或 MessagePack）"""
+    return _timeline_response(request, cache, key, generate, **_columnar_encoding(payload))
+
+
 @router.get("/timeline/employee/{employee_id}", response_model=TimelineResponse)
 def get_employee_timeline(
     employee_id: int,
+    request: Request,
     start_date: datetime = Query(..., description="开始日期"),
     end_date: datetime = Query(..., description="结束日期"),
     time_unit: str = Query("day", description="时间单位: hour, day, week"),
-    db: Session = Depends(get_db)
+    detail: str = Query("items", pattern="^(items|aggregate)$", description="明细级别: items 逐条分配, aggregate 按时间单元汇总"),
+    grid: str = Query("full", pattern="^(full|compact)$", description="时间网格格式: full, compact"),
+    db: Session = Depends(get_db),
+    viewport: Optional[TimelineViewport] = Depends(_time_window),
+    payload: str = Depends(_payload_format),
+    cache: TimelineCache = Depends(get_timeline_cache)
 ):
     """获取员工时间轴"""
     engine = TimelineLayoutEngine(db)
+    _check_payload_format(payload, detail, viewport)
     
-    timeline = engine.generate_employee_timeline(
-        employee_id, start_date, end_date, time_unit
-    )
-    
-    if "error" in timeline:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=timeline["error"]
+    if payload != "json":
+        return _columnar_response(
+            request, cache, ("employee", employee_id, start_date, end_date, time_unit, grid, payload),
+            lambda: engine.generate_columnar_timeline("employee", employee_id, start_date, end_date, time_unit, grid),
+            payload
         )
     
-    return TimelineResponse(**timeline)
+    return _timeline_response(
+        request, cache, ("employee", employee_id, start_date, end_date, time_unit, grid, viewport, detail),
+        lambda: (
+            engine.generate_occupancy("employee", employee_id, start_date, end_date, time_unit, grid)
+            if detail == "aggregate"
+            else engine.generate_employee_timeline(employee_id, start_date, end_date, time_unit, grid, viewport)
+        )
+    )
 
 
 @router.get("/timeline/project/{project_id}", response_model=TimelineResponse)
-def get_project_timeline(
+async def get_project_timeline(
     project_id: int,
+    request: Request,
     start_date: datetime = Query(..., description="开始日期"),
     end_date: datetime = Query(..., description="结束日期"),
     time_unit: str = Query("day", description="时间单位: hour, day, week"),
+    detail: str = Query("items", pattern="^(items|aggregate)$", description="明细级别: items 逐条分配, aggregate 按时间单元汇总"),
+    grid: str = Query("full", pattern="^(full|compact)$", description="时间网格格式: full, compact"),
+    db: Session = Depends(get_db),
+    viewport: Optional[TimelineViewport] = Depends(_timeline_viewport),
+    payload: str = Depends(_payload_format),
+    cache: TimelineCache = Depends(get_timeline_cache),
+    pool: ComputePool = Depends(get_compute_pool)
+):
+    """获取项目时间轴（布局分行在计算池中执行）"""
+    _check_payload_format(payload, detail, viewport)
+    
+    if payload != "json":
+        return await _offloaded_timeline_response(
+            request, pool, cache, ("project", project_id, start_date, end_date, time_unit, grid, payload),
+            lambda runner: TimelineLayoutEngine(db, runner).generate_columnar_timeline(
+                "project", project_id, start_date, end_date, time_unit, grid
+            ),
+            **_columnar_encoding(payload)
+        )
+    
+    return await _offloaded_timeline_response(
+        request, pool, cache, ("project", project_id, start_date, end_date, time_unit, grid, viewport, detail),
+        lambda runner: (
+            TimelineLayoutEngine(db).generate_occupancy("project", project_id, start_date, end_date, time_unit, grid)
+            if detail == "aggregate"
+            else TimelineLayoutEngine(db, runner).generate_project_timeline(project_id, start_date, end_date, time_unit, grid, viewport)
+        )
+    )
+
+
+@router.post("/timeline/project/{project_id}/patch", response_model=TimelinePatchResponse)
+def patch_project_timeline(
+    project_id: int,
+    request: TimelinePatchRequest,
     db: Session = Depends(get_db)
 ):
-    """获取项目时间轴"""
+    """单个分配变化后增量更新项目时间轴，未改动的项目保持原来的行号"""
     engine = TimelineLayoutEngine(db)
     
-    timeline = engine.generate_project_timeline(
-        project_id, start_date, end_date, time_unit
+    patch = engine.generate_project_timeline_patch(
+        project_id, request.start_date, request.end_date, request.time_unit,
+        request.assignment_id, request.rows, request.previous_employee_id
     )
     
-    if "error" in timeline:
+    if "error" in patch:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=timeline["error"]
+            detail=patch["error"]
         )
     
-    return TimelineResponse(**timeline)
+    return patch
 
 
 @router.get("/timeline/department/{department}", response_model=TimelineResponse)
-def get_department_timeline(
+async def get_department_timeline(
+    department: str,
+    request: Request,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    time_unit: str = Query("day", description="时间单位: hour, day, week"),
+    detail: str = Query("items", pattern="^(items|aggregate)$", description="明细级别: items 逐条分配, aggregate 按时间单元汇总"),
+    grid: str = Query("full", pattern="^(full|compact)$", description="时间网格格式: full, compact"),
+    db: Session = Depends(get_db),
+    viewport: Optional[TimelineViewport] = Depends(_timeline_viewport),
+    payload: str = Depends(_payload_format),
+    cache: TimelineCache = Depends(get_timeline_cache),
+    pool: ComputePool = Depends(get_compute_pool)
+):
+    """获取部门时间轴概览（布局分行在计算池中执行）"""
+    _check_payload_format(payload, detail, viewport)
+    
+    if payload != "json":
+        return await _offloaded_timeline_response(
+            request, pool, cache, ("department", department, start_date, end_date, time_unit, grid, payload),
+            lambda runner: TimelineLayoutEngine(db, runner).generate_columnar_timeline(
+                "department", department, start_date, end_date, time_unit, grid
+            ),
+            **_columnar_encoding(payload)
+        )
+    
+    return await _offloaded_timeline_response(
+        request, pool, cache, ("department", department, start_date, end_date, time_unit, grid, viewport, detail),
+        lambda runner: (
+            TimelineLayoutEngine(db).generate_occupancy("department", department, start_date, end_date, time_unit, grid)
+            if detail == "aggregate"
+            else TimelineLayoutEngine(db, runner).generate_department_overview(department, start_date, end_date, time_unit, grid, viewport)
+        )
+    )
+
+
+@router.get("/timeline/region/{region}", response_model=RegionTimelineResponse)
+async def get_region_timeline(
+    region: str,
+    request: Request,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    time_unit: str = Query("day", description="时间单位: hour, day, week"),
+    grid: str = Query("full", pattern="^(full|compact)$", description="时间网格格式: full, compact"),
+    db: Session = Depends(get_db),
+    cache: TimelineCache = Depends(get_timeline_cache),
+    pool: ComputePool = Depends(get_compute_pool)
+):
+    """获取区域时间轴，按项目分组（布局分行在计算池中分块并行执行）"""
+    return await _offloaded_timeline_response(
+        request, pool, cache, ("region", region, start_date, end_date, time_unit, grid),
+        lambda runner: TimelineLayoutEngine(db, runner).generate_region_overview(
+            region, start_date, end_date, time_unit, grid
+        ),
+        _encode_region_timeline
+    )
+
+
+def _stream_employee_timelines(timelines) -> StreamingResponse:
+    """以NDJSON逐行输出员工时间轴"""
+    return StreamingResponse(
+        (_encode_employee_timeline(timeline) + b"\n" for timeline in timelines),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/timeline/department/{department}/stream")
+def stream_department_timeline(
     department: str,
     start_date: datetime = Query(..., description="开始日期"),
     end_date: datetime = Query(..., description="结束日期"),
     time_unit: str = Query("day", description="时间单位: hour, day, week"),
     db: Session = Depends(get_db)
 ):
-    """获取部门时间轴概览"""
+    """流式获取部门时间轴，每行一名员工（NDJSON，不含时间网格）"""
+    engine = TimelineLayoutEngine(db)
+    
+    return _stream_employee_timelines(
+        engine.iter_employee_timelines(start_date, end_date, time_unit, department=department)
+    )
+
+
+@router.get("/timeline/region/{region}/stream")
+def stream_region_timeline(
+    region: str,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    time_unit: str = Query("day", description="时间单位: hour, day, week"),
+    db: Session = Depends(get_db)
+):
+    """流式获取区域时间轴，每行一名参与过该区域项目的员工（NDJSON，不含时间网格）"""
     engine = TimelineLayoutEngine(db)
     
-    timeline = engine.generate_department_overview(
-        department, start_date, end_date, time_unit
+    return _stream_employee_timelines(
+        engine.iter_employee_timelines(start_date, end_date, time_unit, region=region)
     )
+
+
+def _staffing_curve_response(engine: TimelineLayoutEngine, scope: str, scope_value, start_date: datetime, end_date: datetime):
+    """生成人员曲线，校验时间范围和实体"""
+    if start_date >= end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="开始时间必须早于结束时间"
+        )
     
-    return TimelineResponse(**timeline)
\ No newline at end of file
+    curve = engine.generate_staffing_curve(scope, scope_value, start_date, end_date)
+    if "error" in curve:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=curve["error"]
+        )
+    return curve
+
+
+@router.get("/staffing/project/{project_id}", response_model=StaffingCurveResponse)
+def get_project_staffing(
+    project_id: int,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    db: Session = Depends(get_db)
+):
+    """获取项目在岗人数曲线"""
+    return _staffing_curve_response(TimelineLayoutEngine(db), "project", project_id, start_date, end_date)
+
+
+@router.get("/staffing/department/{department}", response_model=StaffingCurveResponse)
+def get_department_staffing(
+    department: str,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    db: Session = Depends(get_db)
+):
+    """获取部门在岗人数曲线"""
+    return _staffing_curve_response(TimelineLayoutEngine(db), "department", department, start_date, end_date)
+
+
+@router.get("/staffing/region/{region}", response_model=StaffingCurveResponse)
+def get_region_staffing(
+    region: str,
+    start_date: datetime = Query(..., description="开始日期"),
+    end_date: datetime = Query(..., description="结束日期"),
+    db: Session = Depends(get_db)
+):
+    """获取区域在岗人数曲线"""
+    return _staffing_curve_response(TimelineLayoutEngine(db), "region", region, start_date, end_date)
\ No newline at end of file
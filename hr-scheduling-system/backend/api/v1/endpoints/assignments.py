@@ -1,27 +1,41 @@
 """任务分配API端点"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from api.deps import get_db
+from api.deps import get_db, get_conflict_detector
+from api.pagination import keyset_page
+from api.responses import ORJSONResponse
+from algorithms import ConflictDetector, binary_export
 from models.assignment import Assignment
 from models.employee import Employee
 from models.project import Project
-from schemas.assignment import AssignmentCreate, AssignmentUpdate, AssignmentResponse, AssignmentWithDetails
+from schemas.assignment import (
+    AssignmentCreate, AssignmentUpdate, AssignmentResponse, AssignmentWithDetails,
+    AssignmentBulkRequest, AssignmentBulkResponse
+)
 
 router = APIRouter()
 
+# 创建分配时必须给出的字段
+_REQUIRED_FIELDS = ("employee_id", "project_id", "start_time", "end_time")
+_ITEM_FIELDS = _REQUIRED_FIELDS + ("status", "notes")
+
 
 @router.get("/", response_model=List[AssignmentWithDetails])
 def get_assignments(
-    skip: int = Query(0, ge=0, description="跳过的记录数"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="跳过的记录数（偏移分页，建议改用 cursor）"),
     limit: int = Query(100, ge=1, le=1000, description="返回的记录数"),
     employee_id: Optional[int] = Query(None, description="员工ID筛选"),
     project_id: Optional[int] = Query(None, description="项目ID筛选"),
     status: Optional[str] = Query(None, description="状态筛选"),
+    sort: str = Query("id", pattern="^(id|start_time)$", description="排序: id, start_time"),
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 X-Next-Cursor 响应头"),
     db: Session = Depends(get_db)
 ):
-    """获取任务分配列表"""
+    """获取任务分配列表（键集分页）"""
     query = db.query(Assignment).join(Employee).join(Project)
     
     # 应用筛选条件
@@ -33,7 +47,10 @@ def get_assignments(
         query = query.filter(Assignment.status == status)
     
     # 分页
-    assignments = query.offset(skip).limit(limit).all()
+    assignments = keyset_page(
+        query, sort, {"id": Assignment.id, "start_time": Assignment.start_time}, Assignment.id,
+        cursor, limit, response, skip
+    )
     
     # 构建响应数据
     result = []
@@ -50,6 +67,29 @@ def get_assignments(
     return result
 
 
+@router.get("/export")
+def export_assignments(
+    format: str = Query(..., pattern="^(arrow|msgpack)$", description="导出格式: arrow（Arrow IPC流）, msgpack（MessagePack）"),
+    employee_id: Optional[int] = Query(None, description="员工ID筛选"),
+    project_id: Optional[int] = Query(None, description="项目ID筛选"),
+    status: Optional[str] = Query(None, description="状态筛选"),
+    batch_size: int = Query(5000, ge=100, le=50000, description="每批读取的行数"),
+    db: Session = Depends(get_db)
+):
+    """批量导出任务分配（按列分批读取，二进制流式输出，时间为UTC纪元秒）"""
+    if not binary_export.is_available(format):
+        raise HTTPException(
+            status_code=406,  # status 参数遮蔽了 fastapi.status
+            detail=f"服务器未安装 {format} 格式的依赖"
+        )
+    
+    batches = binary_export.iter_assignment_batches(
+        db, batch_size, employee_id=employee_id, project_id=project_id, status=status
+    )
+    encode = binary_export.iter_assignments_arrow if format == "arrow" else binary_export.iter_assignments_msgpack
+    return StreamingResponse(encode(batches), media_type=binary_export.MEDIA_TYPES[format])
+
+
 @router.get("/{assignment_id}", response_model=AssignmentWithDetails)
 def get_assignment(assignment_id: int, db: Session = Depends(get_db)):
     """获取单个任务分配"""
@@ -75,7 +115,8 @@ def get_assignment(assignment_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=AssignmentResponse, status_code=status.HTTP_201_CREATED)
 def create_assignment(
     assignment: AssignmentCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    detector: ConflictDetector = Depends(get_conflict_detector)
 ):
     """创建新任务分配"""
     # 验证员工是否存在
@@ -102,8 +143,8 @@ def create_assignment(
         )
     
     # 检查时间冲突
-    conflicts = Assignment.check_conflicts(
-        db, assignment.employee_id, assignment.start_time, assignment.end_time
+    conflicts = detector.find_conflicts(
+        assignment.employee_id, assignment.start_time, assignment.end_time
     )
     if conflicts:
         conflict_details = [
@@ -122,11 +163,144 @@ def create_assignment(
     return db_assignment
 
 
+@router.post("/bulk", response_model=AssignmentBulkResponse)
+def bulk_write_assignments(
+    payload: AssignmentBulkRequest,
+    db: Session = Depends(get_db),
+    detector: ConflictDetector = Depends(get_conflict_detector)
+):
+    """
+    批量创建/更新任务分配
+    
+    员工、项目和待更新分配各用一次 IN 查询校验，整批与数据库及批次内部的冲突一次检查，
+    通过校验的项在一个事务内批量写入。all_or_nothing 模式下任一项失败则全部不写入（409），
+    partial 模式写入通过校验的项；每项的错误和冲突在 results 中返回。
+    """
+    items = payload.items
+    results = [
+        {"index": index, "status": "failed", "assignment_id": None, "errors": [], "conflicts": []}
+        for index in range(len(items))
+    ]
+    
+    # 待更新的分配
+    update_ids = {item.id for item in items if item.id is not None}
+    existing = {}
+    if update_ids:
+        existing = {a.id: a for a in db.query(Assignment).filter(Assignment.id.in_(update_ids))}
+    
+    # 合并出每项写入后的字段值；同一分配只按第一次出现的项更新
+    values = []
+    seen_ids = set()
+    for item, result in zip(items, results):
+        data = item.dict(exclude_unset=True, exclude={"id"})
+        if item.id is not None:
+            current = existing.get(item.id)
+            if current is None:
+                result["errors"].append("任务分配不存在")
+                values.append(None)
+                continue
+            if item.id in seen_ids:
+                result["errors"].append("重复的任务分配ID")
+                values.append(None)
+                continue
+            seen_ids.add(item.id)
+            result["assignment_id"] = item.id
+            data = {**{field: getattr(current, field) for field in _ITEM_FIELDS}, **data}
+        else:
+            missing = [field for field in _REQUIRED_FIELDS if data.get(field) is None]
+            if missing:
+                result["errors"].append(f"缺少必填字段: {', '.join(missing)}")
+                values.append(None)
+                continue
+            data.setdefault("status", "assigned")
+        values.append(data)
+    
+    # 验证员工和项目是否存在
+    employee_ids = {v["employee_id"] for v in values if v}
+    project_ids = {v["project_id"] for v in values if v}
+    known_employees = {row.id for row in db.query(Employee.id).filter(Employee.id.in_(employee_ids))} if employee_ids else set()
+    known_projects = {row.id for row in db.query(Project.id).filter(Project.id.in_(project_ids))} if project_ids else set()
+    
+    for value, result in zip(values, results):
+        if value is None:
+            continue
+        if value["employee_id"] not in known_employees:
+            result["errors"].append("员工不存在")
+        if value["project_id"] not in known_projects:
+            result["errors"].append("项目不存在")
+        if value["start_time"] >= value["end_time"]:
+            result["errors"].append("开始时间必须早于结束时间")
+    
+    # 检查时间冲突：按顺序检查，每项视为排在前面的通过项已写入
+    checked = [index for index, result in enumerate(results) if values[index] and not result["errors"]]
+    batch_conflicts = detector.find_batch_conflicts([
+        {**values[index], "assignment_id": items[index].id} for index in checked
+    ])
+    accepted = set()
+    for index, found in zip(checked, batch_conflicts):
+        # 批次内下标映射回请求下标；未通过的项不构成冲突，
+        # 已有分配在更新它的项通过之前仍占用原时间段
+        conflicts = []
+        for conflict in found:
+            conflict = dict(conflict)
+            batch_index, replaced_by = conflict.pop("batch_index"), conflict.pop("replaced_by")
+            if batch_index is not None and checked[batch_index] not in accepted:
+                continue
+            if replaced_by is not None and checked[replaced_by] in accepted:
+                continue
+            conflicts.append({**conflict, "batch_index": checked[batch_index] if batch_index is not None else None})
+        if conflicts:
+            results[index]["errors"].append("员工在该时间段已有分配冲突")
+            results[index]["conflicts"] = conflicts
+        else:
+            accepted.add(index)
+    
+    failed = len(items) - len(accepted)
+    committed = failed == 0 or payload.mode == "partial"
+    created = updated = 0
+    if committed and accepted:
+        # 新建项一次 add_all，刷新时按批插入；全部写入在同一事务内提交
+        new_assignments = {}
+        for index in sorted(accepted):
+            if items[index].id is None:
+                new_assignments[index] = Assignment(**values[index])
+            else:
+                assignment = existing[items[index].id]
+                for field, value in values[index].items():
+                    setattr(assignment, field, value)
+        db.add_all(new_assignments.values())
+        db.flush()
+        for index, assignment in new_assignments.items():
+            results[index]["assignment_id"] = assignment.id
+        db.commit()
+        created = len(new_assignments)
+        updated = len(accepted) - created
+    
+    for index in accepted:
+        if committed:
+            results[index]["status"] = "updated" if items[index].id is not None else "created"
+        else:
+            results[index]["status"] = "skipped"
+    
+    return ORJSONResponse(
+        {
+            "mode": payload.mode,
+            "committed": committed,
+            "created": created,
+            "updated": updated,
+            "failed": failed,
+            "results": results
+        },
+        status_code=status.HTTP_200_OK if committed else status.HTTP_409_CONFLICT
+    )
+
+
 @router.put("/{assignment_id}", response_model=AssignmentResponse)
 def update_assignment(
     assignment_id: int,
     assignment_update: AssignmentUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    detector: ConflictDetector = Depends(get_conflict_detector)
 ):
     """更新任务分配"""
     assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
@@ -169,8 +343,8 @@ def update_assignment(
         )
     
     # 检查时间冲突（排除当前分配）
-    conflicts = Assignment.check_conflicts(
-        db, employee_id, start_time, end_time, exclude_assignment_id=assignment_id
+    conflicts = detector.find_conflicts(
+        employee_id, start_time, end_time, exclude_assignment_id=assignment_id
     )
     if conflicts:
         conflict_details = [
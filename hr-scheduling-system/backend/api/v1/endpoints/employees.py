@@ -2,10 +2,11 @@
 员工管理API端点
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from api.deps import get_db
+from api.pagination import keyset_page
 from models.employee import Employee
 from schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
 
@@ -14,13 +15,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[EmployeeResponse])
 def get_employees(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0, description="跳过的记录数（偏移分页，建议改用 cursor）"),
+    limit: int = Query(100, ge=1, le=1000, description="返回的记录数"),
     department: Optional[str] = None,
     skill: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|name)$", description="排序: id, name"),
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 X-Next-Cursor 响应头"),
     db: Session = Depends(get_db)
 ):
-    """获取员工列表"""
+    """获取员工列表（键集分页）"""
     query = db.query(Employee)
     
     if department:
@@ -28,8 +32,10 @@ def get_employees(
     if skill:
         query = query.filter(Employee.skills.contains([skill]))
     
-    employees = query.offset(skip).limit(limit).all()
-    return employees
+    return keyset_page(
+        query, sort, {"id": Employee.id, "name": Employee.name}, Employee.id,
+        cursor, limit, response, skip
+    )
 
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
@@ -1,8 +1,9 @@
 """项目管理API端点"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from api.deps import get_db
+from api.pagination import keyset_page
 from models.project import Project
 from schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 
@@ -11,13 +12,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ProjectResponse])
 def get_projects(
-    skip: int = Query(0, ge=0, description="跳过的记录数"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="跳过的记录数（偏移分页，建议改用 cursor）"),
     limit: int = Query(100, ge=1, le=1000, description="返回的记录数"),
     status: Optional[str] = Query(None, description="项目状态筛选"),
     region: Optional[str] = Query(None, description="区域筛选"),
+    sort: str = Query("id", pattern="^(id|name)$", description="排序: id, name"),
+    cursor: Optional[str] = Query(None, description="分页游标，取自上一页的 X-Next-Cursor 响应头"),
     db: Session = Depends(get_db)
 ):
-    """获取项目列表"""
+    """获取项目列表（键集分页）"""
     query = db.query(Project)
     
     # 应用筛选条件
@@ -27,8 +31,10 @@ def get_projects(
         query = query.filter(Project.region == region)
     
     # 分页
-    projects = query.offset(skip).limit(limit).all()
-    return projects
+    return keyset_page(
+        query, sort, {"id": Project.id, "name": Project.name}, Project.id,
+        cursor, limit, response, skip
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -0,0 +1,196 @@
+"""
+冲突检测端点并发负载测试
+启动单 worker 的 uvicorn 服务，并发发送批量冲突检测请求，同时持续探测健康检查端点，
+对比两种实现的请求延迟：
+- 阻塞：async 端点内直接调用同步检测器（旧实现），查询期间事件循环被占用
+- 异步：/algorithms/conflicts/check-multiple（AsyncConflictDetector，异步驱动）
+
+健康检查的延迟反映其他请求被大查询拖住的程度。
+
+运行方式（在 backend 目录下，DATABASE_URL 指向可写的测试库，会建表并写入合成数据）：
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.bench_async_conflicts \\
+        [--employees 300] [--assignments 60] [--requests 40] [--concurrency 8] [--batch 100]
+"""
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import httpx
+from fastapi import Depends
+
+from algorithms import ConflictDetector
+from api.deps import get_conflict_detector
+from api.responses import ORJSONResponse
+from core.database import Base, SessionLocal, engine, get_async_sessionmaker
+from main import app
+from models import Assignment, Employee, Project
+from schemas.algorithm import MultipleConflictCheckRequest
+
+BLOCKING_PATH = "/bench/blocking/conflicts/check-multiple"
+ASYNC_PATH = "/api/v1/algorithms/conflicts/check-multiple"
+HEALTH_PATH = "/api/v1/algorithms/health"
+
+
+@app.post(BLOCKING_PATH)
+async def blocking_check_multiple(
+    request: MultipleConflictCheckRequest,
+    detector: ConflictDetector = Depends(get_conflict_detector)
+):
+    """旧实现：async 端点内执行同步查询"""
+    return ORJSONResponse(detector.check_multiple_employees_conflict([
+        assignment.model_dump() for assignment in request.employee_assignments
+    ]))
+
+
+def seed(employees: int, assignments: int, seed: int = 42) -> List[int]:
+    """写入合成数据：每名员工 assignments 个分配（2到10小时），返回员工ID"""
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        project = Project(name="负载测试项目", region="负载测试", status="active")
+        staff = [Employee(name=f"负载测试{i}", department="负载测试", status="active") for i in range(employees)]
+        db.add_all([project] + staff)
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.add_all([
+            Assignment(
+                employee_id=employee.id,
+                project_id=project.id,
+                start_time=(begin := start + timedelta(hours=rng.randrange(0, 90 * 24))),
+                end_time=begin + timedelta(hours=rng.randrange(2, 10)),
+                status="assigned"
+            )
+            for employee in staff for _ in range(assignments)
+        ])
+        db.commit()
+        return [employee.id for employee in staff]
+    finally:
+        db.close()
+
+
+def build_requests(employee_ids: List[int], count: int, batch: int, seed: int = 7) -> List[Dict]:
+    """生成 count 个批量冲突检测请求，每个检查 batch 名员工在30天窗口内的分配"""
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(count):
+        start = datetime(2024, 1, 1) + timedelta(days=rng.randrange(0, 60))
+        bodies.append({"employee_assignments": [
+            {"employee_id": employee_id, "start_time": start.isoformat(),
+             "end_time": (start + timedelta(days=30)).isoformat()}
+            for employee_id in rng.sample(employee_ids, batch)
+        ]})
+    return bodies
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """启动单 worker 的 uvicorn 服务（加载本模块以注册阻塞实现的端点）"""
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.bench_async_conflicts:app",
+        "--port", str(port), "--workers", "1", "--log-level", "warning"
+    ])
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}{HEALTH_PATH}").raise_for_status()
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn 服务启动失败")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def load(
+    base_url: str, path: str, bodies: List[Dict], concurrency: int, probe_interval: float = 0.005
+) -> Dict:
+    """并发发送请求并持续探测健康检查，返回两类请求的延迟（毫秒）和总耗时"""
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        request_latencies, probe_latencies = [], []
+        done = asyncio.Event()
+
+        async def send(body):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(path, json=body)
+                response.raise_for_status()
+                request_latencies.append((time.perf_counter() - started) * 1000)
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get(HEALTH_PATH)
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(probe_interval)
+
+        probing = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(send(body) for body in bodies))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probing
+
+    return {"requests": request_latencies, "probes": probe_latencies, "elapsed": elapsed}
+
+
+def report(name: str, result: Dict) -> None:
+    requests, probes = result["requests"], result["probes"]
+    print(f"{name:6s} 请求 p50 {statistics.median(requests):7.1f} ms  p95 {percentile(requests, 0.95):7.1f} ms  "
+          f"吞吐 {len(requests) / result['elapsed']:5.1f} req/s  |  "
+          f"健康检查 p50 {statistics.median(probes):6.1f} ms  p99 {percentile(probes, 0.99):6.1f} ms  "
+          f"最大 {max(probes):6.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="冲突检测端点并发负载测试")
+    parser.add_argument("--employees", type=int, default=300, help="员工数量")
+    parser.add_argument("--assignments", type=int, default=60, help="每名员工的分配数量")
+    parser.add_argument("--requests", type=int, default=40, help="批量冲突检测请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发请求数")
+    parser.add_argument("--batch", type=int, default=100, help="每个请求检查的员工数")
+    args = parser.parse_args(argv)
+
+    if get_async_sessionmaker() is None:
+        print("未安装异步数据库驱动（asyncpg / aiosqlite），无法对比")
+        return 1
+
+    employee_ids = seed(args.employees, args.assignments)
+    bodies = build_requests(employee_ids, args.requests, min(args.batch, len(employee_ids)))
+    print(f"员工数: {args.employees}  分配数: {args.employees * args.assignments}  "
+          f"请求数: {args.requests}  并发: {args.concurrency}  每请求员工数: {args.batch}")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(port)
+    try:
+        # 预热连接池
+        for path in (BLOCKING_PATH, ASYNC_PATH):
+            asyncio.run(load(base_url, path, bodies[:2], 2))
+        for name, path in (("阻塞", BLOCKING_PATH), ("异步", ASYNC_PATH)):
+            report(name, asyncio.run(load(base_url, path, bodies, args.concurrency)))
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""
+算法计算池负载测试
+启动单 worker 的 uvicorn 服务，并发请求区域时间轴和法定人数时间段（CPU密集），
+同时持续请求员工详情（普通CRUD），对比不同计算池配置（类型:同时计算数上限）下CRUD请求的延迟：
+- inline:64：布局和搜索在请求线程中计算，不限制并发（相当于旧实现）
+- thread:N / process:N：计算交给线程池 / 进程池，最多 N 个计算同时执行，其余排队；
+  线程池中的计算仍持有GIL，只有进程池能减少与CRUD请求的争用
+数据加载不占用配额；数据量小于 ALGORITHM_POOL_MIN_ITEMS 的计算不交给计算池
+
+运行方式（在 backend 目录下，DATABASE_URL 指向可写的测试库，会建表并写入合成数据）：
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.bench_compute_pool \\
+        [--employees 400] [--assignments 80] [--requests 24] [--concurrency 6] [--pools inline:64,thread:2,process:2]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import httpx
+
+from core.database import Base, SessionLocal, engine
+from models import Assignment, Employee, Project
+
+REGION = "计算池测试"
+TIMELINE_PATH = f"/api/v1/algorithms/timeline/region/{REGION}"
+QUORUM_PATH = "/api/v1/algorithms/optimal-time/quorum"
+HEALTH_PATH = "/api/v1/algorithms/health"
+
+
+def seed(employees: int, assignments: int, seed: int = 42) -> List[int]:
+    """写入合成数据：20个项目，每名员工 assignments 个分配（2到10小时），返回员工ID"""
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        projects = [Project(name=f"计算池测试项目{i}", region=REGION, status="active") for i in range(20)]
+        staff = [Employee(name=f"计算池测试{i}", department="计算池测试", status="active") for i in range(employees)]
+        db.add_all(projects + staff)
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.add_all([
+            Assignment(
+                employee_id=employee.id,
+                project_id=rng.choice(projects).id,
+                start_time=(begin := start + timedelta(hours=rng.randrange(0, 60 * 24))),
+                end_time=begin + timedelta(hours=rng.randrange(2, 10)),
+                status="assigned"
+            )
+            for employee in staff for _ in range(assignments)
+        ])
+        db.commit()
+        return [employee.id for employee in staff]
+    finally:
+        db.close()
+
+
+def build_requests(employee_ids: List[int], count: int, seed: int = 7) -> List[Dict]:
+    """交替生成区域时间轴（每个请求不同的时间范围，避开结果缓存）和法定人数时间段请求"""
+    rng = random.Random(seed)
+    requests = []
+    for index in range(count):
+        start = datetime(2024, 1, 1) + timedelta(days=rng.randrange(0, 20), minutes=index)
+        end = start + timedelta(days=30)
+        if index % 2 == 0:
+            requests.append({"method": "GET", "url": TIMELINE_PATH, "params": {
+                "start_date": start.isoformat(), "end_date": end.isoformat(), "time_unit": "day", "grid": "compact"
+            }})
+        else:
+            requests.append({"method": "POST", "url": QUORUM_PATH, "json": {
+                "employee_ids": rng.sample(employee_ids, min(200, len(employee_ids))),
+                "min_available": 3, "duration_hours": 2,
+                "start_date": start.isoformat(), "end_date": end.isoformat()
+            }})
+    return requests
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, pool: str, max_jobs: str) -> subprocess.Popen:
+    """启动单 worker 的 uvicorn 服务，关闭时间轴结果缓存"""
+    env = dict(
+        os.environ, ALGORITHM_POOL=pool, ALGORITHM_POOL_MAX_JOBS=max_jobs,
+        ALGORITHM_POOL_QUEUE_SECONDS="300", TIMELINE_CACHE_SIZE="0"
+    )
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--port", str(port), "--workers", "1", "--log-level", "warning"
+    ], env=env)
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}{HEALTH_PATH}").raise_for_status()
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn 服务启动失败")
+
+
+async def load(
+    base_url: str, requests: List[Dict], employee_ids: List[int], concurrency: int, probe_interval: float = 0.005
+) -> Dict:
+    """并发发送计算请求并持续请求员工详情，返回两类请求的延迟（毫秒）和总耗时"""
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        request_latencies, probe_latencies = [], []
+        done = asyncio.Event()
+
+        async def send(request):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.request(**request)
+                response.raise_for_status()
+                request_latencies.append((time.perf_counter() - started) * 1000)
+
+        async def probe():
+            rng = random.Random(3)
+            while not done.is_set():
+                started = time.perf_counter()
+                (await client.get(f"/api/v1/employees/{rng.choice(employee_ids)}")).raise_for_status()
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(probe_interval)
+
+        probing = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(send(request) for request in requests))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probing
+
+    return {"requests": request_latencies, "probes": probe_latencies, "elapsed": elapsed}
+
+
+def report(name: str, result: Dict) -> None:
+    requests, probes = result["requests"], result["probes"]
+    print(f"{name:10s} 计算 p50 {statistics.median(requests):8.1f} ms  吞吐 {len(requests) / result['elapsed']:5.2f} req/s  |  "
+          f"CRUD p50 {statistics.median(probes):6.1f} ms  p99 {percentile(probes, 0.99):7.1f} ms  "
+          f"最大 {max(probes):7.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="算法计算池负载测试")
+    parser.add_argument("--employees", type=int, default=400, help="员工数量")
+    parser.add_argument("--assignments", type=int, default=80, help="每名员工的分配数量")
+    parser.add_argument("--requests", type=int, default=24, help="计算请求数")
+    parser.add_argument("--concurrency", type=int, default=6, help="并发计算请求数")
+    parser.add_argument(
+        "--pools", default="inline:64,thread:2,process:2", help="对比的计算池配置（类型:同时计算数上限），逗号分隔"
+    )
+    args = parser.parse_args(argv)
+
+    employee_ids = seed(args.employees, args.assignments)
+    requests = build_requests(employee_ids, args.requests)
+    print(f"员工数: {args.employees}  分配数: {args.employees * args.assignments}  "
+          f"计算请求数: {args.requests}  并发: {args.concurrency}")
+
+    for config in args.pools.split(","):
+        pool, max_jobs = config.split(":")
+        port = free_port()
+        server = start_server(port, pool, max_jobs)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(load(base_url, requests[:2], employee_ids, 2))  # 预热
+            report(config, asyncio.run(load(base_url, requests, employee_ids, args.concurrency)))
+        finally:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
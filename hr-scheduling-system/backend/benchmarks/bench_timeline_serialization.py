@@ -0,0 +1,114 @@
+"""
+时间轴响应序列化基准测试
+对比部门时间轴（默认150名员工）三种序列化方式的单次耗时：
+- FastAPI 默认路径：response_model 校验 + jsonable_encoder + json.dumps
+- pydantic：构建响应模型后 model_dump_json
+- orjson：直接序列化算法输出（api.responses.dump_json）
+
+前两种方式会额外输出值为 null 的未设置字段，比较输出时忽略 null。
+
+运行方式（在 backend 目录下，需要 .env 或环境变量中的数据库配置，不会连接数据库）：
+    python -m benchmarks.bench_timeline_serialization [--employees 150] [--assignments 40] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from algorithms.timeline_layout import TimelineLayoutEngine
+from api.responses import dump_json
+from schemas.algorithm import TimelineResponse
+
+
+def generate_department(employees: int, assignments: int, seed: int = 42) -> Dict:
+    """生成合成的部门时间轴：90天、按天网格，每名员工 assignments 个分配（2小时到3天）"""
+    rng = random.Random(seed)
+    engine = TimelineLayoutEngine(None)
+    start, end = datetime(2024, 1, 1), datetime(2024, 4, 1)
+    time_grid = engine._generate_time_grid(start, end, "day")
+
+    timelines = []
+    for employee_id in range(1, employees + 1):
+        employee = SimpleNamespace(id=employee_id, name=f"员工{employee_id}", position="技工", department="施工部")
+        rows = []
+        for index in range(assignments):
+            assignment_start = start + timedelta(minutes=rng.randrange(0, 90 * 24 * 60))
+            project_id = rng.randrange(1, 20)
+            rows.append(SimpleNamespace(
+                id=employee_id * 1000 + index,
+                project_id=project_id,
+                project=SimpleNamespace(name=f"项目{project_id}"),
+                start_time=assignment_start,
+                end_time=assignment_start + timedelta(minutes=rng.randrange(120, 3 * 24 * 60)),
+                status="assigned",
+                notes=None
+            ))
+        rows.sort(key=lambda row: row.start_time)
+        timelines.append(engine._build_employee_timeline(employee, rows, start, end, "day", time_grid))
+
+    return {
+        "department": "施工部",
+        "time_range": {"start": start, "end": end, "unit": "day"},
+        "time_grid": time_grid,
+        "employee_timelines": timelines,
+        "statistics": engine._calculate_department_statistics(timelines)
+    }
+
+
+def drop_none(value):
+    """递归去掉值为 None 的键"""
+    if isinstance(value, dict):
+        return {key: drop_none(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [drop_none(item) for item in value]
+    return value
+
+
+def measure(func, repeat: int) -> float:
+    """返回多次运行中的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="时间轴响应序列化基准测试")
+    parser.add_argument("--employees", type=int, default=150, help="员工数量")
+    parser.add_argument("--assignments", type=int, default=40, help="每名员工的分配数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args(argv)
+
+    timeline = generate_department(args.employees, args.assignments)
+    adapter = TypeAdapter(TimelineResponse)
+
+    encoders = [
+        ("FastAPI默认", lambda: json.dumps(
+            jsonable_encoder(adapter.validate_python(timeline)), ensure_ascii=False
+        ).encode()),
+        ("pydantic", lambda: TimelineResponse(**timeline).model_dump_json().encode()),
+        ("orjson", lambda: dump_json(timeline)),
+    ]
+
+    bodies = [encode() for _, encode in encoders]
+    reference = drop_none(json.loads(bodies[-1]))
+    same = all(drop_none(json.loads(body)) == reference for body in bodies)
+    elapsed = [measure(encode, args.repeat) for _, encode in encoders]
+
+    print(f"员工数: {args.employees}  分配数: {args.employees * args.assignments}  "
+          f"响应大小: {len(bodies[-1]) / 1024:.0f} KB  输出一致: {same}")
+    for (name, _), seconds in zip(encoders, elapsed):
+        print(f"{name:10s} {seconds * 1000:8.1f} ms  (加速 {elapsed[0] / seconds:.1f}x)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
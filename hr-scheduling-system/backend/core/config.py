@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "hr_scheduling"
     DATABASE_USER: str = "postgres"
     DATABASE_PASSWORD: str
+    ASYNC_DATABASE_URL: str = ""  # 异步端点使用的连接URL，为空时由 DATABASE_URL 换用异步驱动得到
     
     # JWT配置
     SECRET_KEY: str
@@ -35,6 +36,19 @@ class Settings(BaseSettings):
     # 日志配置
     LOG_LEVEL: str = "INFO"
     
+    # 算法配置
+    CONFLICT_BACKEND: str = "database"  # database, index（进程内区间索引）
+    AVAILABILITY_BACKEND: str = "database"  # database, calendar（位图日历）
+    AVAILABILITY_SLOT_MINUTES: int = 30  # 位图日历时间槽粒度，半天为720
+    AVAILABILITY_CACHE_WINDOWS: int = 32  # 位图日历最多缓存的时间窗口数
+    TIMELINE_CACHE_SIZE: int = 256  # 时间轴结果缓存的最大条数，0表示不缓存（仍返回ETag）
+    TIMELINE_CACHE_TTL_SECONDS: int = 15  # 时间轴结果缓存的过期时间；失效通知只在进程内，多 worker 部署时其他进程的写入最多滞后这么久
+    ALGORITHM_POOL: str = "process"  # 布局和时间段搜索的计算池: process（绕开GIL）, thread（仍持有GIL，只限制并发）, inline（在请求线程中计算）
+    ALGORITHM_POOL_WORKERS: int = 4  # 计算池的工作线程/进程数
+    ALGORITHM_POOL_MAX_JOBS: int = 2  # 同时提交到计算池的计算数上限，超出的计算排队等待（数据加载不占用）
+    ALGORITHM_POOL_QUEUE_SECONDS: float = 10.0  # 排队等待的最长时间，超时返回503
+    ALGORITHM_POOL_MIN_ITEMS: int = 5000  # 交给计算池的最小数据量（区间数），更小的计算在请求线程中执行
+    
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v):
@@ -49,6 +63,22 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
     
+    @property
+    def async_database_url(self) -> str:
+        """构建异步数据库连接URL（postgresql 使用 asyncpg，sqlite 使用 aiosqlite）"""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        url = self.database_url
+        for prefix, async_prefix in (
+            ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+            ("postgresql://", "postgresql+asyncpg://"),
+            ("postgres://", "postgresql+asyncpg://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if url.startswith(prefix):
+                return async_prefix + url[len(prefix):]
+        return url
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
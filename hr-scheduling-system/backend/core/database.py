@@ -1,7 +1,9 @@
 """
 数据库连接和会话管理
 """
+from typing import AsyncGenerator, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from .config import settings
 
@@ -19,6 +21,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # 创建基础模型类
 Base = declarative_base()
 
+# 异步会话工厂，首次使用时创建（异步驱动 asyncpg / aiosqlite 为可选依赖）
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_unavailable = False
+
 
 def get_db():
     """获取数据库会话"""
@@ -29,6 +35,35 @@ def get_db():
         db.close()
 
 
+def get_async_sessionmaker() -> Optional[async_sessionmaker]:
+    """获取异步会话工厂，未安装对应的异步驱动时返回None"""
+    global _async_session_factory, _async_unavailable
+    if _async_session_factory is None and not _async_unavailable:
+        try:
+            async_engine = create_async_engine(
+                settings.async_database_url,
+                pool_pre_ping=True,
+                pool_recycle=300,
+                echo=settings.DEBUG
+            )
+        except ImportError:
+            _async_unavailable = True
+            return None
+        _async_session_factory = async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取异步数据库会话"""
+    factory = get_async_sessionmaker()
+    if factory is None:
+        raise RuntimeError(f"未安装异步数据库驱动: {settings.async_database_url}")
+    async with factory() as session:
+        yield session
+
+
 def create_tables():
     """创建所有表"""
     Base.metadata.create_all(bind=engine)
@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from algorithms.compute_pool import shutdown_compute_pools
 from core.database import engine, Base
 from core.config import settings
 from api.v1.api import api_router
@@ -16,7 +17,8 @@ async def lifespan(app: FastAPI):
     # 启动时创建数据库表
     Base.metadata.create_all(bind=engine)
     yield
-    # 关闭时的清理工作（如果需要）
+    # 关闭时停止算法计算池的工作线程/进程
+    shutdown_compute_pools()
 
 
 # 创建FastAPI应用实例
@@ -34,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # 注册API路由
@@ -1,7 +1,7 @@
 """
 分配模型 - 系统核心模型
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -11,6 +11,17 @@ from datetime import datetime
 class Assignment(Base):
     """员工项目分配模型"""
     __tablename__ = "assignments"
+    __table_args__ = (
+        # 分配列表键集分页：(筛选列, 排序键, id)；同时按多个条件筛选时，
+        # 使用选择性最高的条件（员工 > 项目 > 状态）对应的索引，其余条件在索引范围内过滤
+        Index("ix_assignments_start_time_id", "start_time", "id"),
+        Index("ix_assignments_employee_id_id", "employee_id", "id"),
+        Index("ix_assignments_employee_id_start_time_id", "employee_id", "start_time", "id"),
+        Index("ix_assignments_project_id_id", "project_id", "id"),
+        Index("ix_assignments_project_id_start_time_id", "project_id", "start_time", "id"),
+        Index("ix_assignments_status_id", "status", "id"),
+        Index("ix_assignments_status_start_time_id", "status", "start_time", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False, index=True)
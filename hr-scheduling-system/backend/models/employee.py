@@ -1,7 +1,7 @@
 """
 员工模型
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -10,6 +10,12 @@ from core.database import Base
 class Employee(Base):
     """员工模型"""
     __tablename__ = "employees"
+    __table_args__ = (
+        # 员工列表键集分页：(筛选列, 排序键, id)
+        Index("ix_employees_name_id", "name", "id"),
+        Index("ix_employees_department_id", "department", "id"),
+        Index("ix_employees_department_name_id", "department", "name", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, index=True)
@@ -1,7 +1,7 @@
 """
 项目模型
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Date
+from sqlalchemy import Column, Integer, String, DateTime, Text, Date, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -10,6 +10,16 @@ from core.database import Base
 class Project(Base):
     """项目模型"""
     __tablename__ = "projects"
+    __table_args__ = (
+        # 项目列表键集分页：(筛选列, 排序键, id)
+        Index("ix_projects_name_id", "name", "id"),
+        Index("ix_projects_status_id", "status", "id"),
+        Index("ix_projects_status_name_id", "status", "name", "id"),
+        Index("ix_projects_region_id", "region", "id"),
+        Index("ix_projects_region_name_id", "region", "name", "id"),
+        Index("ix_projects_region_status_id", "region", "status", "id"),
+        Index("ix_projects_region_status_name_id", "region", "status", "name", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
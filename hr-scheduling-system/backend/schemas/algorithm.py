@@ -2,7 +2,7 @@
 算法相关的Pydantic schemas
 """
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
 
 
@@ -20,6 +20,7 @@ class EmployeeAssignment(BaseModel):
     employee_id: int
     start_time: datetime
     end_time: datetime
+    exclude_assignment_id: Optional[int] = None
 
 
 class MultipleConflictCheckRequest(BaseModel):
@@ -54,6 +55,18 @@ class ConflictCheckResponse(BaseModel):
     total_overlap_hours: float
 
 
+class ConflictAuditItem(BaseModel):
+    """冲突审计结果：同一员工的一对重叠分配"""
+    employee_id: int
+    first_assignment_id: int
+    first_project_id: int
+    second_assignment_id: int
+    second_project_id: int
+    overlap_start: datetime
+    overlap_end: datetime
+    overlap_hours: float
+
+
 class AvailabilityRequest(BaseModel):
     """可用性检查请求"""
     employee_id: int
@@ -73,6 +86,29 @@ class AvailabilityResponse(BaseModel):
     available_slots: List[AvailabilitySlot]
 
 
+class BatchAvailabilityRequest(BaseModel):
+    """批量可用性检查请求，员工范围可通过ID列表、部门或区域指定（同时指定时取交集）"""
+    employee_ids: Optional[List[int]] = None
+    department: Optional[str] = None
+    region: Optional[str] = None
+    start_date: datetime
+    end_date: datetime
+    stream: bool = Field(False, description="以NDJSON流式返回，每行一名员工")
+
+
+class EmployeeAvailability(BaseModel):
+    """单个员工的可用时间段"""
+    employee_id: int
+    available_slots: List[AvailabilitySlot]
+    total_available_hours: float
+
+
+class BatchAvailabilityResponse(BaseModel):
+    """批量可用性响应"""
+    total_employees: int
+    results: List[EmployeeAvailability]
+
+
 class OptimalTimeSlotRequest(BaseModel):
     """最优时间段查找请求"""
     employee_ids: List[int]
@@ -80,6 +116,7 @@ class OptimalTimeSlotRequest(BaseModel):
     start_date: datetime
     end_date: datetime
     working_hours: Tuple[int, int] = (8, 18)
+    max_candidates: int = Field(5, ge=1, le=50, description="返回的候选时间段数量")
 
 
 class OptimalTimeSlot(BaseModel):
@@ -95,6 +132,35 @@ class OptimalTimeSlotResponse(BaseModel):
     """最优时间段查找响应"""
     found: bool
     optimal_slot: Optional[OptimalTimeSlot] = None
+    candidates: List[OptimalTimeSlot] = []
+    message: Optional[str] = None
+
+
+class QuorumTimeSlotRequest(BaseModel):
+    """法定人数时间段查找请求：n名员工中至少k名同时可用"""
+    employee_ids: List[int]
+    min_available: int = Field(..., ge=1, description="至少需要的可用员工数")
+    duration_hours: float
+    start_date: datetime
+    end_date: datetime
+    working_hours: Tuple[int, int] = (8, 18)
+    max_candidates: int = Field(5, ge=1, le=50, description="每类结果返回的数量")
+
+
+class QuorumTimeSlot(BaseModel):
+    """法定人数时间段"""
+    start_time: datetime
+    end_time: datetime
+    duration_hours: float
+    available_employees: List[int]
+    available_count: int
+
+
+class QuorumTimeSlotResponse(BaseModel):
+    """法定人数时间段查找响应"""
+    found: bool
+    earliest: List[QuorumTimeSlot] = []
+    best_covered: List[QuorumTimeSlot] = []
     message: Optional[str] = None
 
 
@@ -128,6 +194,19 @@ class TimelineGrid(BaseModel):
     is_weekend: bool
 
 
+class CompactTimeGrid(BaseModel):
+    """紧凑时间网格，第 i 格从 start + i * step_seconds 开始"""
+    start: datetime
+    end: datetime
+    unit: str
+    step_seconds: int
+    count: int
+    weekend_bitmap: str  # 小端十六进制位图，第 j 字节第 k 位对应第 8j+k 格
+    label_format: Optional[str] = None  # 小时、天标签的 strftime 格式
+    week_label: Optional[str] = None  # 周标签模板，{week} 替换为 iso_weeks 中对应格的ISO周数
+    iso_weeks: Optional[List[int]] = None  # 每格起点的ISO周数（仅周视图）
+
+
 class TimelineStatistics(BaseModel):
     """时间轴统计"""
     total_assignments: int
@@ -136,14 +215,177 @@ class TimelineStatistics(BaseModel):
     peak_concurrent_assignments: Optional[int] = 0
 
 
+# 时间轴统计：各视图的统计项不同，值均为数值
+StatisticsValues = Dict[str, Union[int, float]]
+
+
+class TimelineEmployeeInfo(BaseModel):
+    """时间轴中的员工信息"""
+    id: int
+    name: str
+    position: Optional[str] = None
+    department: Optional[str] = None
+
+
+class TimelineProjectInfo(BaseModel):
+    """时间轴中的项目信息"""
+    id: int
+    name: str
+    status: Optional[str] = None
+    priority: Optional[str] = None
+
+
+class TimelineRange(BaseModel):
+    """时间轴范围"""
+    start: datetime
+    end: datetime
+    unit: str
+
+
+class TimelineItemLayout(BaseModel):
+    """时间轴项目的布局位置（相对于视图范围的百分比）"""
+    start_percentage: float
+    width_percentage: float
+    row: int
+
+
+class LayoutTimelineItem(BaseModel):
+    """布局后的时间轴项目，与算法模块返回的结构一致"""
+    id: int
+    assignment_id: int
+    project_id: int
+    project_name: str
+    start_time: datetime
+    end_time: datetime
+    actual_start: datetime  # 裁剪到视图范围后的时间
+    actual_end: datetime
+    status: str
+    notes: Optional[str] = None
+    layout: TimelineItemLayout
+    duration_hours: float
+    is_partial: bool
+
+
+class TimelineOccupancy(BaseModel):
+    """按时间单元汇总的占用（detail=aggregate），每个数组对应时间网格的各单元"""
+    busy_hours: List[float]
+    project_count: List[int]
+    peak_concurrency: List[int]
+
+
+class TimelineWindow(BaseModel):
+    """虚拟滚动视口信息（分页游标、实际返回的时间范围）"""
+    after_employee_id: Optional[int] = None
+    limit: Optional[int] = None
+    has_more: bool
+    next_after_employee_id: Optional[int] = None
+    view_start: Optional[datetime] = None
+    view_end: Optional[datetime] = None
+    fetch_start: datetime
+    fetch_end: datetime
+
+
+class EmployeeTimelineLayout(BaseModel):
+    """项目、部门时间轴中单个员工的时间轴"""
+    employee: TimelineEmployeeInfo
+    time_range: Optional[TimelineRange] = None
+    time_grid: Optional[Union[List[TimelineGrid], CompactTimeGrid]] = None
+    timeline_items: Optional[List[LayoutTimelineItem]] = None
+    occupancy: Optional[TimelineOccupancy] = None
+    statistics: Optional[StatisticsValues] = None
+
+
 class TimelineResponse(BaseModel):
     """时间轴响应"""
     # 直接匹配算法模块返回的结构
-    employee: Optional[Dict[str, Any]] = None
-    project: Optional[Dict[str, Any]] = None
+    employee: Optional[TimelineEmployeeInfo] = None
+    project: Optional[TimelineProjectInfo] = None
+    department: Optional[str] = None
+    time_range: TimelineRange
+    time_grid: Union[List[TimelineGrid], CompactTimeGrid]
+    timeline_items: Optional[List[LayoutTimelineItem]] = None
+    occupancy: Optional[TimelineOccupancy] = None
+    employee_timelines: Optional[List[EmployeeTimelineLayout]] = None
+    statistics: StatisticsValues
+    window: Optional[TimelineWindow] = None
+
+
+class TimelineColumns(BaseModel):
+    """列式时间轴数据，items 中各数组按下标一一对应"""
+    origin: int  # 视图开始的纪元秒
+    items: Dict[str, List[int]]  # assignment_id, employee, project, status, start, width, row, partial
+    employees: Dict[str, List[Any]]  # 员工表：id, name, position
+    projects: Dict[str, List[Any]]  # 项目字典：id, name
+    statuses: List[str]  # 状态字典
+
+
+class ColumnarTimelineResponse(BaseModel):
+    """列式时间轴响应"""
+    employee: Optional[TimelineEmployeeInfo] = None
+    project: Optional[TimelineProjectInfo] = None
     department: Optional[str] = None
+    time_range: TimelineRange
+    time_grid: Union[List[TimelineGrid], CompactTimeGrid]
+    columns: TimelineColumns
+    statistics: StatisticsValues
+
+
+class ProjectTimeline(BaseModel):
+    """区域时间轴中的单个项目"""
+    project: TimelineProjectInfo
+    employee_timelines: List[EmployeeTimelineLayout]
+    statistics: StatisticsValues
+
+
+class RegionTimelineResponse(BaseModel):
+    """区域时间轴响应"""
+    region: str
+    time_range: TimelineRange
+    time_grid: Union[List[TimelineGrid], CompactTimeGrid]
+    projects: List[ProjectTimeline]
+    statistics: StatisticsValues
+
+
+class EmployeeTimeline(BaseModel):
+    """单个员工的时间轴（流式输出的一行，不含时间网格）"""
+    employee: TimelineEmployeeInfo
+    time_range: TimelineRange
+    timeline_items: List[LayoutTimelineItem]
+    statistics: StatisticsValues
+
+
+class TimelinePatchRequest(TimelineRequest):
+    """增量时间轴请求"""
+    assignment_id: int  # 新增、修改或删除的分配
+    rows: Dict[int, int] = Field(default_factory=dict, description="客户端当前的行号（分配ID -> 行号）")
+    previous_employee_id: Optional[int] = Field(None, description="客户端当前显示该分配的员工，分配换人或删除时用于更新原泳道")
+
+
+class TimelinePatchResponse(BaseModel):
+    """增量时间轴响应"""
+    project_id: int
+    assignment_id: int
     time_range: Dict[str, Any]
-    time_grid: List[TimelineGrid]
-    timeline_items: Optional[List[Dict[str, Any]]] = None
-    employee_timelines: Optional[List[Dict[str, Any]]] = None
-    statistics: Dict[str, Any]
\ No newline at end of file
+    removed: List[int] = []  # 需要从时间轴移除的分配ID
+    moved: List[Dict[str, Any]] = []  # 新增或行号变化的项目（含 employee_id，与原员工不同时从原泳道移出）
+    lanes: Dict[int, int] = {}  # 受影响员工 -> 泳道行数
+    statistics: Dict[str, Any]
+
+
+class StaffingPoint(BaseModel):
+    """人员曲线变化点，在岗人数保持到下一个变化点"""
+    time: datetime
+    headcount: int
+
+
+class StaffingCurveResponse(BaseModel):
+    """在岗人数曲线响应"""
+    scope: str  # project, department, region
+    scope_value: str
+    time_range: Dict[str, Any]
+    total_assignments: int
+    total_employees: int
+    peak_headcount: int
+    peak_time: Optional[datetime] = None
+    peak_concurrent_assignments: int
+    steps: List[StaffingPoint]
\ No newline at end of file
@@ -1,9 +1,9 @@
 """
 任务分配相关的Pydantic schemas
 """
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AssignmentBase(BaseModel):
@@ -47,4 +47,48 @@ class AssignmentWithDetails(AssignmentResponse):
     employee_name: Optional[str] = None
     project_name: Optional[str] = None
     duration_hours: Optional[float] = None
-    duration_days: Optional[int] = None
\ No newline at end of file
+    duration_days: Optional[int] = None
+
+
+class AssignmentBulkItem(AssignmentUpdate):
+    """批量写入的单项：带 id 为更新（只修改给出的字段），不带 id 为创建（必须给出员工、项目和起止时间）"""
+    id: Optional[int] = None
+    created_by: Optional[int] = None
+
+
+class AssignmentBulkRequest(BaseModel):
+    """批量创建/更新任务分配schema"""
+    items: List[AssignmentBulkItem] = Field(..., min_length=1, max_length=1000)
+    mode: str = Field(
+        "all_or_nothing", pattern="^(all_or_nothing|partial)$",
+        description="all_or_nothing: 任一项失败则全部不写入; partial: 写入通过校验的项"
+    )
+
+
+class AssignmentBulkConflict(BaseModel):
+    """批量写入单项的冲突"""
+    assignment_id: Optional[int] = None  # 冲突的已有分配
+    batch_index: Optional[int] = None  # 冲突的批次内项下标
+    project_id: int
+    start_time: datetime
+    end_time: datetime
+    overlap_hours: float
+
+
+class AssignmentBulkItemResult(BaseModel):
+    """批量写入单项的结果"""
+    index: int
+    status: str  # created / updated / failed / skipped（校验通过但整批未写入）
+    assignment_id: Optional[int] = None
+    errors: List[str] = []
+    conflicts: List[AssignmentBulkConflict] = []
+
+
+class AssignmentBulkResponse(BaseModel):
+    """批量创建/更新任务分配响应schema"""
+    mode: str
+    committed: bool
+    created: int
+    updated: int
+    failed: int
+    results: List[AssignmentBulkItemResult]
@@ -0,0 +1,77 @@
+"""
+异步冲突检测单元测试
+"""
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from algorithms.async_conflict_detection import AsyncConflictDetector, ThreadedConflictDetector
+from algorithms.conflict_detection import ConflictDetector
+from models.assignment import Assignment
+from tests.conftest import TEST_DATABASE_URL
+
+
+def _run_async(check):
+    """在异步会话中执行 check(detector)"""
+    pytest.importorskip("aiosqlite")
+
+    async def run():
+        engine = create_async_engine(TEST_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with async_sessionmaker(engine)() as session:
+                return await check(AsyncConflictDetector(session))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _seed(db_session, sample_employee, sample_project, sample_user):
+    for start_hour, end_hour, status in [(8, 12, "assigned"), (13, 15, "in_progress"), (9, 17, "cancelled")]:
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 7, 1, start_hour),
+            end_time=datetime(2024, 7, 1, end_hour),
+            status=status,
+            created_by=sample_user.id
+        ))
+    db_session.commit()
+
+
+def test_async_detector_matches_sync(db_session, sample_employee, sample_project, sample_user):
+    """测试异步检测器的冲突、批量冲突和可用性结果与同步检测器一致"""
+    _seed(db_session, sample_employee, sample_project, sample_user)
+    employee_id = sample_employee.id
+    start, end = datetime(2024, 7, 1, 10), datetime(2024, 7, 1, 14)
+    requests = [
+        {"employee_id": employee_id, "start_time": start, "end_time": end},
+        {"employee_id": employee_id, "start_time": datetime(2024, 7, 1, 16), "end_time": datetime(2024, 7, 1, 18)}
+    ]
+    day_start, day_end = datetime(2024, 7, 1), datetime(2024, 7, 2)
+
+    async def check(detector):
+        return (
+            await detector.check_employee_conflict(employee_id, start, end),
+            await detector.check_multiple_employees_conflict(requests),
+            await detector.get_employee_availability(employee_id, day_start, day_end)
+        )
+
+    single, multiple, availability = _run_async(check)
+
+    detector = ConflictDetector(db_session)
+    assert single == detector.check_employee_conflict(employee_id, start, end)
+    assert single["conflict_count"] == 2
+    assert multiple == detector.check_multiple_employees_conflict(requests)
+    assert availability == detector.get_employee_availability(employee_id, day_start, day_end)
+
+
+def test_threaded_detector_matches_sync(db_session, sample_employee, sample_project, sample_user):
+    """测试线程池检测器（无异步驱动时的退回方案）结果与同步检测器一致"""
+    _seed(db_session, sample_employee, sample_project, sample_user)
+    detector = ConflictDetector(db_session)
+    start, end = datetime(2024, 7, 1, 10), datetime(2024, 7, 1, 14)
+
+    result = asyncio.run(ThreadedConflictDetector(detector).check_employee_conflict(sample_employee.id, start, end))
+
+    assert result == detector.check_employee_conflict(sample_employee.id, start, end)
@@ -0,0 +1,150 @@
+"""
+可用性位图日历单元测试
+"""
+import pytest
+from datetime import datetime
+from algorithms.availability_calendar import AvailabilityCalendar, iter_bit_runs
+from algorithms.conflict_detection import ConflictDetector
+from algorithms import change_events
+from sqlalchemy import event
+from models.assignment import Assignment
+from models.employee import Employee
+
+
+def test_iter_bit_runs():
+    """测试位图连续区间迭代"""
+    assert list(iter_bit_runs(0)) == []
+    assert list(iter_bit_runs(0b1)) == [(0, 1)]
+    assert list(iter_bit_runs(0b0111_0011_0000)) == [(4, 6), (8, 11)]
+
+
+class TestAvailabilityCalendar:
+    """位图日历测试类"""
+
+    @pytest.fixture
+    def calendar(self):
+        calendar = AvailabilityCalendar(slot_minutes=30)
+        change_events.subscribe(calendar.handle_change)
+        yield calendar
+        change_events.unsubscribe(calendar.handle_change)
+
+    def _assign(self, db_session, employee, project, user, start, end):
+        assignment = Assignment(
+            employee_id=employee.id,
+            project_id=project.id,
+            start_time=start,
+            end_time=end,
+            status="assigned",
+            created_by=user.id
+        )
+        db_session.add(assignment)
+        return assignment
+
+    def test_matches_database_availability(self, db_session, calendar, sample_employee, sample_project, sample_user):
+        """测试对齐到时间槽的分配，位图结果与逐条计算一致"""
+        self._assign(db_session, sample_employee, sample_project, sample_user,
+                     datetime(2024, 1, 15, 8, 0), datetime(2024, 1, 15, 12, 0))
+        self._assign(db_session, sample_employee, sample_project, sample_user,
+                     datetime(2024, 1, 15, 14, 0), datetime(2024, 1, 15, 17, 30))
+        db_session.commit()
+
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 15, 23, 59)
+        expected = ConflictDetector(db_session).get_employee_availability(sample_employee.id, start, end)
+        actual = ConflictDetector(db_session, calendar=calendar).get_employee_availability(
+            sample_employee.id, start, end
+        )
+
+        assert actual == expected
+
+    def test_partial_slot_marked_busy(self, db_session, calendar, sample_employee, sample_project, sample_user):
+        """测试部分占用的时间槽整体视为占用"""
+        self._assign(db_session, sample_employee, sample_project, sample_user,
+                     datetime(2024, 1, 15, 8, 10), datetime(2024, 1, 15, 8, 40))
+        db_session.commit()
+
+        slots = calendar.free_slots(
+            db_session, [sample_employee.id], datetime(2024, 1, 15, 8, 0), datetime(2024, 1, 15, 10, 0)
+        )[sample_employee.id]
+
+        assert [(s["start_time"], s["end_time"]) for s in slots] == [
+            (datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 0))
+        ]
+
+    def test_common_free_and_optimal_slot(self, db_session, calendar, sample_employee, sample_project, sample_user):
+        """测试共同空闲（按位运算）以及最优时间段查找"""
+        other = Employee(name="王五", department="施工部", status="active")
+        db_session.add(other)
+        db_session.flush()
+
+        self._assign(db_session, sample_employee, sample_project, sample_user,
+                     datetime(2024, 1, 15, 8, 0), datetime(2024, 1, 15, 12, 0))
+        self._assign(db_session, other, sample_project, sample_user,
+                     datetime(2024, 1, 15, 13, 0), datetime(2024, 1, 15, 16, 0))
+        db_session.commit()
+
+        employee_ids = [sample_employee.id, other.id]
+        common = calendar.common_free_slots(
+            db_session, employee_ids, datetime(2024, 1, 15, 8, 0), datetime(2024, 1, 15, 18, 0)
+        )
+        assert [(s["start_time"], s["end_time"]) for s in common] == [
+            (datetime(2024, 1, 15, 12, 0), datetime(2024, 1, 15, 13, 0)),
+            (datetime(2024, 1, 15, 16, 0), datetime(2024, 1, 15, 18, 0)),
+        ]
+
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 17, 0, 0)
+        expected = ConflictDetector(db_session).find_candidate_time_slots(employee_ids, 2, start, end)
+        actual = ConflictDetector(db_session, calendar=calendar).find_candidate_time_slots(
+            employee_ids, 2, start, end
+        )
+        assert actual == expected
+
+    def test_updated_on_write(self, db_session, engine, calendar, sample_employee, sample_project, sample_user):
+        """测试分配新增、改期、换人、取消后位图增量更新，不重新查询数据库"""
+        other = Employee(name="赵六", department="施工部", status="active")
+        db_session.add(other)
+        db_session.commit()
+        employee_ids = [sample_employee.id, other.id]
+        start, end = datetime(2024, 1, 15, 8, 0), datetime(2024, 1, 15, 18, 0)
+
+        def busy():
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                free = calendar.free_slots(db_session, employee_ids, start, end)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            assert statements == []
+            return [
+                [(s["start_time"].hour, s["end_time"].hour) for s in free[employee_id]]
+                for employee_id in employee_ids
+            ]
+
+        calendar.free_slots(db_session, employee_ids, start, end)
+        assert busy() == [[(8, 18)], [(8, 18)]]
+
+        assignment = self._assign(db_session, sample_employee, sample_project, sample_user,
+                                  datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 12, 0))
+        self._assign(db_session, sample_employee, sample_project, sample_user,
+                     datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0))
+        db_session.commit()
+        assert busy() == [[(8, 9), (12, 18)], [(8, 18)]]
+
+        # 改期后原时段中只有被其他分配占用的部分仍为占用
+        assignment.start_time, assignment.end_time = datetime(2024, 1, 15, 14, 0), datetime(2024, 1, 15, 16, 0)
+        db_session.commit()
+        assert busy() == [[(8, 10), (11, 14), (16, 18)], [(8, 18)]]
+
+        assignment.employee_id = other.id
+        db_session.commit()
+        assert busy() == [[(8, 10), (11, 18)], [(8, 14), (16, 18)]]
+
+        assignment.status = "cancelled"
+        db_session.commit()
+        assert busy() == [[(8, 10), (11, 18)], [(8, 18)]]
+
+        db_session.rollback()
+        assert calendar.free_slots(db_session, employee_ids, start, end) == {
+            employee_id: ConflictDetector(db_session).get_employee_availability(employee_id, start, end)
+            for employee_id in employee_ids
+        }
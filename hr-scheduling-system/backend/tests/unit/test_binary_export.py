@@ -0,0 +1,88 @@
+"""
+二进制导出单元测试
+"""
+import pytest
+from datetime import datetime
+from algorithms.binary_export import (
+    iter_assignment_batches, iter_assignments_arrow, iter_assignments_msgpack, encode_timeline_arrow
+)
+from algorithms.timeline_layout import TimelineLayoutEngine
+from models.assignment import Assignment
+
+
+@pytest.fixture
+def assignments(db_session, sample_employee, sample_project, sample_user):
+    """创建三条分配"""
+    created = [
+        Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 3, day, 8, 0),
+            end_time=datetime(2024, 3, day, 17, 30),
+            status="assigned",
+            created_by=sample_user.id
+        )
+        for day in (4, 5, 6)
+    ]
+    db_session.add_all(created)
+    db_session.commit()
+    return created
+
+
+def test_iter_assignment_batches(db_session, assignments, sample_project):
+    """测试按列分批读取"""
+    batches = list(iter_assignment_batches(db_session, batch_size=2, project_id=sample_project.id))
+
+    assert [len(batch["id"]) for batch in batches] == [2, 1]
+    assert [int(i) for batch in batches for i in batch["id"]] == [a.id for a in assignments]
+    assert list(batches[0]["duration_hours"]) == [9.5, 9.5]
+    assert batches[0]["project_name"][0] == sample_project.name
+
+
+def test_assignments_arrow_round_trip(db_session, assignments, sample_project):
+    """测试 Arrow IPC 流可被读回"""
+    pa = pytest.importorskip("pyarrow")
+    body = b"".join(iter_assignments_arrow(
+        iter_assignment_batches(db_session, batch_size=2, project_id=sample_project.id)
+    ))
+    table = pa.ipc.open_stream(body).read_all()
+
+    assert table.num_rows == 3
+    assert table.column("id").to_pylist() == [a.id for a in assignments]
+    assert table.column("start_time").to_pylist()[0] == datetime(2024, 3, 4, 8, 0)
+
+
+def test_assignments_msgpack_round_trip(db_session, assignments, sample_project):
+    """测试 MessagePack 按批解包"""
+    msgpack = pytest.importorskip("msgpack")
+    unpacker = msgpack.Unpacker()
+    for chunk in iter_assignments_msgpack(
+        iter_assignment_batches(db_session, batch_size=2, project_id=sample_project.id)
+    ):
+        unpacker.feed(chunk)
+    batches = list(unpacker)
+
+    assert [len(batch["id"]) for batch in batches] == [2, 1]
+    assert batches[1]["status"] == ["assigned"]
+
+
+def test_timeline_arrow(db_session, assignments, sample_project):
+    """测试列式时间轴编码为 Arrow，字典列还原为名称"""
+    pa = pytest.importorskip("pyarrow")
+    timeline = TimelineLayoutEngine(db_session).generate_columnar_timeline(
+        "project", sample_project.id, datetime(2024, 3, 1), datetime(2024, 3, 8)
+    )
+    table = pa.ipc.open_stream(encode_timeline_arrow(timeline)).read_all()
+
+    assert table.column("assignment_id").to_pylist() == [a.id for a in assignments]
+    assert table.column("project_name").to_pylist() == [sample_project.name] * 3
+    assert table.column("actual_end").to_pylist()[2] == datetime(2024, 3, 6, 17, 30)
+    assert b"statistics" in table.schema.metadata
+
+    # 没有分配的时间范围，字典列的类型不变
+    empty = TimelineLayoutEngine(db_session).generate_columnar_timeline(
+        "project", sample_project.id, datetime(2024, 4, 1), datetime(2024, 4, 8)
+    )
+    empty_table = pa.ipc.open_stream(encode_timeline_arrow(empty)).read_all()
+    assert empty_table.num_rows == 0
+    assert empty_table.schema.remove_metadata() == table.schema.remove_metadata()
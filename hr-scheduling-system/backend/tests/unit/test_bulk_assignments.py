@@ -0,0 +1,120 @@
+"""
+批量创建/更新任务分配单元测试
+"""
+import json
+from datetime import datetime
+from sqlalchemy import event
+from algorithms.conflict_detection import ConflictDetector
+from api.v1.endpoints.assignments import bulk_write_assignments
+from models.assignment import Assignment
+from schemas.assignment import AssignmentBulkRequest
+
+
+def _bulk(db_session, items, mode="all_or_nothing"):
+    request = AssignmentBulkRequest(items=items, mode=mode)
+    response = bulk_write_assignments(request, db_session, ConflictDetector(db_session))
+    return response.status_code, json.loads(response.body)
+
+
+def _items(sample_employee, sample_project, existing):
+    return [
+        # 与批次中第0项冲突
+        {"employee_id": sample_employee.id, "project_id": sample_project.id,
+         "start_time": datetime(2024, 6, 2, 8), "end_time": datetime(2024, 6, 2, 12)},
+        {"employee_id": sample_employee.id, "project_id": sample_project.id,
+         "start_time": datetime(2024, 6, 2, 10), "end_time": datetime(2024, 6, 2, 14)},
+        # 与数据库中已有分配冲突
+        {"employee_id": sample_employee.id, "project_id": sample_project.id,
+         "start_time": datetime(2024, 6, 1, 10), "end_time": datetime(2024, 6, 1, 11)},
+        {"employee_id": -1, "project_id": sample_project.id,
+         "start_time": datetime(2024, 6, 3, 8), "end_time": datetime(2024, 6, 3, 9)},
+        {"id": existing.id, "notes": "批量更新"},
+    ]
+
+
+def _existing(db_session, sample_employee, sample_project, sample_user):
+    existing = Assignment(
+        employee_id=sample_employee.id,
+        project_id=sample_project.id,
+        start_time=datetime(2024, 6, 1, 9),
+        end_time=datetime(2024, 6, 1, 12),
+        status="assigned",
+        created_by=sample_user.id
+    )
+    db_session.add(existing)
+    db_session.commit()
+    return existing
+
+
+def test_bulk_all_or_nothing_reports_per_item(db_session, sample_employee, sample_project, sample_user):
+    """测试整批模式下任一项失败则不写入，并逐项报告冲突和错误"""
+    existing = _existing(db_session, sample_employee, sample_project, sample_user)
+    before = db_session.query(Assignment).filter(Assignment.employee_id == sample_employee.id).count()
+
+    status_code, body = _bulk(db_session, _items(sample_employee, sample_project, existing))
+
+    assert status_code == 409
+    assert body["committed"] is False
+    assert [r["status"] for r in body["results"]] == ["skipped", "failed", "failed", "failed", "skipped"]
+    assert body["results"][1]["conflicts"][0]["batch_index"] == 0
+    assert body["results"][2]["conflicts"][0]["assignment_id"] == existing.id
+    assert body["results"][3]["errors"] == ["员工不存在"]
+    db_session.expire_all()
+    assert db_session.query(Assignment).filter(Assignment.employee_id == sample_employee.id).count() == before
+    assert existing.notes is None
+
+
+def test_bulk_partial_writes_valid_items(db_session, engine, sample_employee, sample_project, sample_user):
+    """测试部分写入模式只写入通过校验的项，且查询次数不随批量大小增长"""
+    existing = _existing(db_session, sample_employee, sample_project, sample_user)
+    items = _items(sample_employee, sample_project, existing)
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        status_code, body = _bulk(db_session, items, mode="partial")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert status_code == 200
+    assert (body["created"], body["updated"], body["failed"]) == (1, 1, 3)
+    created_id = body["results"][0]["assignment_id"]
+    assert db_session.get(Assignment, created_id).start_time == datetime(2024, 6, 2, 8)
+    db_session.refresh(existing)
+    assert existing.notes == "批量更新"
+    # 待更新分配、员工、项目、冲突候选各一次查询，外加插入和更新
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 4
+
+
+def test_bulk_update_moves_out_of_own_slot(db_session, sample_employee, sample_project, sample_user):
+    """测试被同批更新移走的分配不再与新建项冲突"""
+    existing = _existing(db_session, sample_employee, sample_project, sample_user)
+
+    status_code, body = _bulk(db_session, [
+        {"id": existing.id, "start_time": datetime(2024, 6, 5, 9), "end_time": datetime(2024, 6, 5, 12)},
+        {"employee_id": sample_employee.id, "project_id": sample_project.id,
+         "start_time": datetime(2024, 6, 1, 9), "end_time": datetime(2024, 6, 1, 12)},
+    ])
+
+    assert status_code == 200
+    assert [r["status"] for r in body["results"]] == ["updated", "created"]
+
+
+def test_bulk_duplicate_update_ids(db_session, sample_employee, sample_project, sample_user):
+    """测试同一分配在批次中重复更新时，重复项单独报错，不与自身的原时间段冲突"""
+    existing = _existing(db_session, sample_employee, sample_project, sample_user)
+
+    status_code, body = _bulk(db_session, [
+        {"id": existing.id, "notes": "a"},
+        {"id": existing.id, "notes": "b"},
+    ], mode="partial")
+
+    assert status_code == 200
+    assert [r["status"] for r in body["results"]] == ["updated", "failed"]
+    assert body["results"][0]["conflicts"] == []
+    assert body["results"][1]["errors"] == ["重复的任务分配ID"]
+    db_session.refresh(existing)
+    assert existing.notes == "a"
@@ -0,0 +1,47 @@
+"""
+列式时间轴单元测试
+"""
+from datetime import datetime, timedelta
+from algorithms.columnar import dictionary_encode
+from algorithms.timeline_layout import TimelineLayoutEngine
+from models.assignment import Assignment
+
+
+def test_dictionary_encode():
+    """测试字典编码按首次出现顺序建表"""
+    codes, table = dictionary_encode(["b", "a", "b", "c", "a"])
+
+    assert codes == [0, 1, 0, 2, 1]
+    assert table == ["b", "a", "c"]
+
+
+def test_columnar_matches_item_timeline(db_session, sample_employee, sample_project, sample_user):
+    """测试列式时间轴与逐项目时间轴的位置、宽度和行号一致"""
+    for start_hour, end_hour in [(6, 12), (9, 11), (10, 14), (20, 30)]:
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 2, 1) + timedelta(hours=start_hour),
+            end_time=datetime(2024, 2, 1) + timedelta(hours=end_hour),
+            status="assigned",
+            created_by=sample_user.id
+        ))
+    db_session.commit()
+
+    engine = TimelineLayoutEngine(db_session)
+    start, end = datetime(2024, 2, 1, 8, 0), datetime(2024, 2, 2, 0, 0)
+    expected = engine.generate_project_timeline(sample_project.id, start, end, "hour")
+    columnar = engine.generate_columnar_timeline("project", sample_project.id, start, end, "hour")
+
+    items = expected["employee_timelines"][0]["timeline_items"]
+    columns = columnar["columns"]
+    assert columns["items"]["assignment_id"] == [item["assignment_id"] for item in items]
+    assert columns["items"]["row"] == [item["layout"]["row"] for item in items]
+    assert columns["items"]["start"] == [int((item["actual_start"] - start).total_seconds()) for item in items]
+    assert columns["items"]["width"] == [int(item["duration_hours"] * 3600) for item in items]
+    assert columns["items"]["partial"] == [int(item["is_partial"]) for item in items]
+    assert columns["items"]["project"] == [0] * len(items)
+    assert columns["projects"] == {"id": [sample_project.id], "name": [sample_project.name]}
+    assert columns["employees"]["id"] == [sample_employee.id]
+    assert columnar["statistics"]["total_assignments"] == expected["statistics"]["total_assignments"]
+    assert columnar["statistics"]["total_hours"] == expected["statistics"]["total_hours"]
@@ -0,0 +1,133 @@
+"""
+算法计算池单元测试
+"""
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+from algorithms.compute_pool import ComputeCancelled, ComputePool, ComputePoolBusy
+from algorithms.slot_search import HOUR, clip_to_working_hours, quorum_time_slots, rank_common_slots
+from algorithms.timeline_layout import layout_rows
+
+
+def _intervals():
+    keys = np.array([1, 1, 1, 2, 2, 3], dtype=np.int64)
+    starts = np.array([0, 9, 30, 8, 20, 10], dtype=np.int64) * HOUR
+    ends = np.array([5, 20, 40, 16, 34, 60], dtype=np.int64) * HOUR
+    return keys, starts, ends
+
+
+def test_clip_to_working_hours_splits_days():
+    """测试跨天的空闲区间按每天的工作时间拆分，相接的片段合并"""
+    keys, starts, ends = clip_to_working_hours(
+        np.array([1, 1], dtype=np.int64),
+        np.array([6, 18], dtype=np.int64) * HOUR,
+        np.array([12, 60], dtype=np.int64) * HOUR,
+        8, 18
+    )
+
+    assert keys.tolist() == [1, 1, 1]
+    assert (starts // HOUR).tolist() == [8, 32, 56]
+    assert (ends // HOUR).tolist() == [12, 42, 60]
+
+
+def test_process_pool_matches_inline():
+    """测试布局和时间段搜索在进程池中的结果与当前线程计算一致"""
+    keys, starts, ends = _intervals()
+    pool = ComputePool("process", max_workers=2)
+    try:
+        runner = pool.runner()
+        assert layout_rows(keys, starts, ends, runner, chunk_items=1).tolist() == \
+            layout_rows(keys, starts, ends).tolist()
+        args = (keys, starts, ends, 0, 24, 2 * HOUR, 2, 3)
+        assert runner(quorum_time_slots, *args) == quorum_time_slots(*args)
+        args = (keys, starts, ends, 3, 0, 24, HOUR, 3, 0, 72 * HOUR)
+        assert runner(rank_common_slots, *args) == rank_common_slots(*args)
+    finally:
+        pool.shutdown()
+
+
+def test_offload_queues_then_rejects():
+    """测试达到并发上限的计算排队等待，等待超时返回繁忙；数据加载和小计算不占用配额"""
+    pool = ComputePool("thread", max_workers=1, max_jobs=1, queue_timeout=0.2, min_items=3)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(pool.offload(lambda runner: runner(lambda items: release.wait(5), [0, 0, 0])))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ComputePoolBusy):
+            await pool.offload(lambda runner: runner(sum, [1, 2, 3]))
+
+        # 请求线程中的处理和数据量小于 min_items 的计算不等待配额
+        assert await pool.offload(lambda runner: "loaded") == "loaded"
+        assert await pool.offload(lambda runner: runner(sum, [1, 2])) == 3
+
+        queued = asyncio.ensure_future(pool.offload(lambda runner: runner(sum, [1, 2, 3])))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await first, await queued
+
+    try:
+        assert asyncio.run(run()) == (True, 6)
+    finally:
+        pool.shutdown()
+
+
+def test_offload_cancels_on_disconnect():
+    """测试客户端断开后不再执行尚未开始的计算，并释放配额"""
+    pool = ComputePool("thread", max_workers=1, max_jobs=1)
+    executed = []
+
+    def work(runner):
+        return runner.map(lambda index: executed.append(index) or time.sleep(0.05), [(i,) for i in range(40)])
+
+    async def disconnected():
+        return bool(executed)
+
+    async def run():
+        with pytest.raises(ComputeCancelled):
+            await pool.offload(work, disconnected, poll_interval=0.01)
+        # 请求线程结束后配额释放
+        return await pool.offload(lambda runner: "next")
+
+    try:
+        assert asyncio.run(run()) == "next"
+        assert len(executed) < 40
+    finally:
+        pool.shutdown()
+
+
+def test_offload_waits_for_request_thread():
+    """测试客户端断开或请求被取消时，等请求线程中的处理结束后才返回"""
+    pool = ComputePool("thread", max_workers=1, max_jobs=1)
+    started, finished = threading.Event(), threading.Event()
+
+    def work(runner):
+        started.set()
+        time.sleep(0.2)  # 请求线程中加载数据、组装结果，不经过 runner
+        finished.set()
+        return runner(sum, [1, 2])
+
+    async def disconnected():
+        return started.is_set()
+
+    async def run():
+        with pytest.raises(ComputeCancelled):
+            await pool.offload(work, disconnected, poll_interval=0.01)
+        assert finished.is_set()
+
+        started.clear()
+        finished.clear()
+        task = asyncio.ensure_future(pool.offload(work))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert finished.is_set()
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,42 @@
+"""
+冲突审计单元测试
+"""
+from datetime import datetime
+from algorithms.conflict_audit import iter_overlapping_pairs
+from models.assignment import Assignment
+
+
+class TestConflictAudit:
+    """冲突审计测试类"""
+
+    def test_finds_all_overlapping_pairs(self, db_session, sample_employee, sample_project, sample_user):
+        """测试找出同一员工所有重叠的分配对"""
+        def assign(start_hour, end_hour, status="assigned"):
+            assignment = Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, start_hour, 0),
+                end_time=datetime(2024, 1, 15, end_hour, 0),
+                status=status,
+                created_by=sample_user.id
+            )
+            db_session.add(assignment)
+            return assignment
+
+        long_one = assign(8, 18)
+        morning = assign(9, 12)
+        noon = assign(11, 14)
+        evening = assign(18, 20)                # 与 8-18 首尾相接，不算重叠
+        assign(10, 11, status="completed")      # 非活跃分配不参与审计
+        db_session.flush()
+
+        pairs = list(iter_overlapping_pairs(db_session, employee_id=sample_employee.id))
+
+        found = {(p["first_assignment_id"], p["second_assignment_id"]): p["overlap_hours"] for p in pairs}
+        assert found == {
+            (long_one.id, morning.id): 3,
+            (long_one.id, noon.id): 3,
+            (morning.id, noon.id): 1,
+        }
+        assert all(p["employee_id"] == sample_employee.id for p in pairs)
+        assert evening.id not in {p["second_assignment_id"] for p in pairs}
@@ -240,4 +240,190 @@ class TestConflictDetector:
         assert result["employees_with_conflicts"] == 1
         assert result["conflict_rate"] == 1.0
         assert sample_employee.id in result["details"]
-        assert result["details"][sample_employee.id]["has_conflict"] is True
\ No newline at end of file
+        assert result["details"][sample_employee.id]["has_conflict"] is True
+    
+    def test_batch_conflict_check_matches_single_checks(self, db_session, sample_employee, sample_project, sample_user):
+        """测试批量冲突检测与逐个检测结果一致"""
+        assignment1 = Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="assigned",
+            created_by=sample_user.id
+        )
+        assignment2 = Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 13, 0),
+            end_time=datetime(2024, 1, 15, 17, 0),
+            status="in_progress",
+            created_by=sample_user.id
+        )
+        db_session.add_all([assignment1, assignment2])
+        db_session.flush()
+        
+        detector = ConflictDetector(db_session)
+        windows = [
+            (datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 14, 0)),  # 与两个分配都冲突
+            (datetime(2024, 1, 15, 6, 0), datetime(2024, 1, 15, 9, 0)),    # 与第一个分配冲突
+            (datetime(2024, 1, 15, 17, 0), datetime(2024, 1, 15, 19, 0)),  # 不冲突
+        ]
+        
+        result = detector.check_multiple_employees_conflict([
+            {"employee_id": sample_employee.id, "start_time": start, "end_time": end}
+            for start, end in windows
+        ] + [{
+            "employee_id": sample_employee.id,
+            "start_time": datetime(2024, 1, 15, 9, 0),
+            "end_time": datetime(2024, 1, 15, 10, 0),
+            "exclude_assignment_id": assignment1.id
+        }])
+        
+        expected_conflicts = []
+        for start, end in windows:
+            expected_conflicts.extend(
+                detector.check_employee_conflict(sample_employee.id, start, end)["conflicts"]
+            )
+        
+        details = result["details"][sample_employee.id]
+        assert details["conflicts"] == expected_conflicts
+        assert details["conflict_count"] == 3
+        assert details["total_overlap_hours"] == 3  # 1 + 1 + 1
+    
+    def test_find_optimal_time_slot(self, db_session, sample_employee, sample_project, sample_user):
+        """测试寻找多个员工的共同可用时间段"""
+        from models.employee import Employee
+        
+        other = Employee(name="李四", department="施工部", status="active")
+        db_session.add(other)
+        db_session.flush()
+        
+        # 员工1：1月15日 8-12点忙；员工2：1月15日 13-16点忙
+        db_session.add_all([
+            Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, 8, 0),
+                end_time=datetime(2024, 1, 15, 12, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ),
+            Assignment(
+                employee_id=other.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, 13, 0),
+                end_time=datetime(2024, 1, 15, 16, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ),
+        ])
+        db_session.flush()
+        
+        detector = ConflictDetector(db_session)
+        employee_ids = [sample_employee.id, other.id]
+        
+        # 1月15日工作时间内只有 12-13点、16-18点共同空闲，3小时任务只能排到第二天
+        slot = detector.find_optimal_time_slot(
+            employee_ids, 3, datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 17, 0, 0)
+        )
+        assert slot is not None
+        assert slot["start_time"] == datetime(2024, 1, 16, 8, 0)
+        assert slot["end_time"] == datetime(2024, 1, 16, 11, 0)
+        assert slot["available_employees"] == employee_ids
+        assert 0 < slot["confidence_score"] <= 1
+        
+        # 2小时任务可以排在 16-18点
+        candidates = detector.find_candidate_time_slots(
+            employee_ids, 2, datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 17, 0, 0),
+            max_candidates=5
+        )
+        starts = [c["start_time"] for c in candidates]
+        assert datetime(2024, 1, 15, 16, 0) in starts
+        assert datetime(2024, 1, 16, 8, 0) in starts
+        assert datetime(2024, 1, 15, 12, 0) not in starts  # 只有1小时
+        scores = [c["confidence_score"] for c in candidates]
+        assert scores == sorted(scores, reverse=True)
+        
+        # 超过工作时长的任务找不到时间段
+        assert detector.find_optimal_time_slot(
+            employee_ids, 11, datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 17, 0, 0)
+        ) is None
+    
+    def test_find_quorum_time_slots(self, db_session, sample_project, sample_user):
+        """测试寻找至少k名员工同时可用的时间段"""
+        from models.employee import Employee
+        
+        employees = [Employee(name=f"工人{i}", department="施工部", status="active") for i in range(3)]
+        db_session.add_all(employees)
+        db_session.flush()
+        employee_ids = [e.id for e in employees]
+        
+        # 1月15日：工人0 8-12点忙，工人1 8-14点忙，工人2 全天空闲
+        db_session.add_all([
+            Assignment(
+                employee_id=employees[0].id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, 8, 0),
+                end_time=datetime(2024, 1, 15, 12, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ),
+            Assignment(
+                employee_id=employees[1].id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, 8, 0),
+                end_time=datetime(2024, 1, 15, 14, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ),
+        ])
+        db_session.flush()
+        
+        detector = ConflictDetector(db_session)
+        result = detector.find_quorum_time_slots(
+            employee_ids, 2, 2, datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        )
+        
+        # 12点起工人0、工人2可用；14点起三人都可用
+        earliest = result["earliest"][0]
+        assert earliest["start_time"] == datetime(2024, 1, 15, 12, 0)
+        assert earliest["end_time"] == datetime(2024, 1, 15, 14, 0)
+        assert earliest["available_employees"] == sorted([employees[0].id, employees[2].id])
+        
+        best = result["best_covered"][0]
+        assert best["start_time"] == datetime(2024, 1, 15, 14, 0)
+        assert best["available_count"] == 3
+        
+        # 需要3人、持续5小时：14-18点只有4小时，找不到
+        result = detector.find_quorum_time_slots(
+            employee_ids, 3, 5, datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        )
+        assert result["earliest"] == []
+    
+    def test_iter_employees_availability(self, db_session, sample_employee, sample_project, sample_user):
+        """测试批量可用性与逐个查询结果一致，无分配的员工全程可用"""
+        from models.employee import Employee
+        
+        idle = Employee(name="赵六", department="施工部", status="active")
+        db_session.add(idle)
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="assigned",
+            created_by=sample_user.id
+        ))
+        db_session.flush()
+        
+        detector = ConflictDetector(db_session)
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        results = list(detector.iter_employees_availability([idle.id, sample_employee.id], start, end))
+        
+        assert [employee_id for employee_id, _ in results] == sorted([idle.id, sample_employee.id])
+        availability = dict(results)
+        assert availability[sample_employee.id] == detector.get_employee_availability(
+            sample_employee.id, start, end
+        )
+        assert availability[idle.id] == [{"start_time": start, "end_time": end, "duration_hours": 24}]
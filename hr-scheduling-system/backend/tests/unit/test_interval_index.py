@@ -0,0 +1,138 @@
+"""
+员工分配区间索引单元测试
+"""
+import random
+from datetime import datetime, timedelta
+from algorithms.conflict_detection import ConflictDetector
+from algorithms.interval_index import (
+    AssignmentIntervalIndex, EmployeeIntervals, IntervalEntry, assignment_index
+)
+from models.assignment import Assignment
+
+
+def _entry(entry_id, start_hour, end_hour):
+    return IntervalEntry(
+        entry_id, 1, "项目", datetime(2024, 1, 15, start_hour), datetime(2024, 1, 15, end_hour), "assigned"
+    )
+
+
+class TestEmployeeIntervals:
+    """单员工区间集合测试类"""
+
+    def test_overlapping_query(self):
+        """测试重叠查询"""
+        intervals = EmployeeIntervals([_entry(1, 8, 10), _entry(2, 12, 14), _entry(3, 15, 17)])
+
+        result = intervals.overlapping(datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 13))
+        assert [e.id for e in result] == [1, 2]
+
+        # 首尾相接不算重叠
+        result = intervals.overlapping(datetime(2024, 1, 15, 10), datetime(2024, 1, 15, 12))
+        assert result == []
+
+    def test_nested_intervals(self):
+        """测试嵌套区间（重复分配）仍能被查到"""
+        intervals = EmployeeIntervals([_entry(1, 6, 20), _entry(2, 8, 9), _entry(3, 10, 11)])
+
+        result = intervals.overlapping(datetime(2024, 1, 15, 12), datetime(2024, 1, 15, 13))
+        assert [e.id for e in result] == [1]
+
+    def test_matches_brute_force(self):
+        """测试含长区间、嵌套和首尾相接的随机区间与逐个比较的结果一致"""
+        rng = random.Random(5)
+        entries = [_entry(0, 0, 23)]
+        for entry_id in range(1, 60):
+            start_hour = rng.randrange(0, 23)
+            entries.append(_entry(entry_id, start_hour, rng.randrange(start_hour + 1, 24)))
+        intervals = EmployeeIntervals(entries)
+
+        for start_hour in range(24):
+            for end_hour in range(start_hour + 1, 25):
+                start = datetime(2024, 1, 15) + timedelta(hours=start_hour)
+                end = datetime(2024, 1, 15) + timedelta(hours=end_hour)
+                expected = sorted(
+                    (e for e in entries if e.start_time < end and e.end_time > start),
+                    key=lambda e: (e.start_time, e.id)
+                )
+                assert intervals.overlapping(start, end) == expected
+
+    def test_exclude_assignment(self):
+        """测试排除指定分配"""
+        intervals = EmployeeIntervals([_entry(1, 8, 10), _entry(2, 9, 12)])
+
+        result = intervals.overlapping(
+            datetime(2024, 1, 15, 8), datetime(2024, 1, 15, 12), exclude_assignment_id=1
+        )
+        assert [e.id for e in result] == [2]
+
+
+class TestAssignmentIntervalIndex:
+    """分配区间索引测试类"""
+
+    def test_detector_with_index(self, db_session, sample_employee, sample_project, sample_user):
+        """测试使用索引后端的冲突检测结果与数据库后端一致"""
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="assigned",
+            created_by=sample_user.id
+        ))
+        db_session.commit()
+
+        index = AssignmentIntervalIndex()
+        indexed = ConflictDetector(db_session, interval_index=index).check_employee_conflict(
+            sample_employee.id, datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 14, 0)
+        )
+        direct = ConflictDetector(db_session).check_employee_conflict(
+            sample_employee.id, datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 14, 0)
+        )
+
+        assert indexed == direct
+        assert indexed["conflicts"][0]["project_name"] == sample_project.name
+        assert sample_employee.id in index
+
+    def test_inactive_assignments_ignored(self, db_session, sample_employee, sample_project, sample_user):
+        """测试已完成的分配不进入索引"""
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="completed",
+            created_by=sample_user.id
+        ))
+        db_session.commit()
+
+        index = AssignmentIntervalIndex()
+        result = index.query(
+            db_session, sample_employee.id, datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 0)
+        )
+        assert result == []
+
+    def test_invalidated_on_write(self, db_session, sample_employee, sample_project, sample_user):
+        """测试分配写入后索引失效并重新加载"""
+        window = (datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0))
+        assert assignment_index.query(db_session, sample_employee.id, *window) == []
+        assert sample_employee.id in assignment_index
+
+        assignment = Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="assigned",
+            created_by=sample_user.id
+        )
+        db_session.add(assignment)
+        db_session.commit()
+
+        assert sample_employee.id not in assignment_index
+        result = assignment_index.query(db_session, sample_employee.id, *window)
+        assert [e.id for e in result] == [assignment.id]
+
+        assignment.status = "cancelled"
+        db_session.commit()
+
+        assert assignment_index.query(db_session, sample_employee.id, *window) == []
@@ -0,0 +1,63 @@
+"""
+时间桶占用聚合单元测试
+"""
+import random
+import numpy as np
+from algorithms.occupancy import bucket_occupancy, uniform_bucket_edges
+
+HOUR = 3600
+
+
+def test_uniform_bucket_edges_truncates_last_bucket():
+    """测试最后一个桶截断到结束时间"""
+    assert uniform_bucket_edges(0, 25, 10).tolist() == [0, 10, 20, 25]
+    assert uniform_bucket_edges(0, 0, 10).tolist() == [0]
+
+
+def test_bucket_occupancy():
+    """测试占用时长、项目数和峰值并发"""
+    edges = uniform_bucket_edges(0, 24 * HOUR, 12 * HOUR)
+    result = bucket_occupancy(
+        edges,
+        np.array([8, 9, 11, 14, 30]) * HOUR,
+        np.array([13, 10, 12, 16, 40]) * HOUR,
+        np.array([0, 0, 0, 0, 1]),
+        3,
+        np.array([7, 7, 8, 9, 7])
+    )
+
+    # 员工0：上午 8-12(4h) + 9-10(1h) + 11-12(1h)，下午 12-13(1h) + 14-16(2h)
+    assert result.busy_hours[0].tolist() == [6, 3]
+    assert result.project_count[0].tolist() == [2, 2]
+    # 上午 8-13 与 9-10、11-12 分别重叠；下午 12点时 8-13 仍在进行
+    assert result.peak_concurrency[0].tolist() == [2, 1]
+    # 范围外的区间和没有分配的员工为0
+    assert result.busy_hours[1:].sum() == 0
+    assert result.peak_concurrency[2].tolist() == [0, 0]
+
+
+def test_bucket_occupancy_matches_brute_force():
+    """测试与逐桶暴力计算一致（含首尾相接、超出范围的区间）"""
+    rng = random.Random(7)
+    edges = uniform_bucket_edges(0, 55, 7)
+    starts = np.array([rng.randint(-10, 60) for _ in range(40)], dtype=np.float64)
+    ends = starts + np.array([rng.randint(1, 25) for _ in range(40)])
+    groups = np.array([rng.randrange(3) for _ in range(40)])
+    projects = np.array([rng.randint(1, 4) for _ in range(40)])
+
+    result = bucket_occupancy(edges, starts, ends, groups, 3, projects)
+
+    for group in range(3):
+        for bucket in range(len(edges) - 1):
+            lo, hi = edges[bucket], edges[bucket + 1]
+            members = [
+                i for i in range(40)
+                if groups[i] == group and min(ends[i], hi) > max(starts[i], lo)
+            ]
+            busy = sum(min(ends[i], hi) - max(starts[i], lo) for i in members) / HOUR
+            moments = [lo] + [starts[i] for i in members if starts[i] >= lo]
+            peak = max((sum(1 for i in members if starts[i] <= t < ends[i]) for t in moments), default=0)
+
+            assert np.isclose(result.busy_hours[group, bucket], busy)
+            assert result.project_count[group, bucket] == len({projects[i] for i in members})
+            assert result.peak_concurrency[group, bucket] == peak
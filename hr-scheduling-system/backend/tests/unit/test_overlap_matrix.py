@@ -0,0 +1,73 @@
+"""
+向量化时间重叠计算单元测试
+"""
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from algorithms.overlap_matrix import overlap_matrix, sparse_overlaps, to_epoch_seconds
+
+
+def _hours(*values):
+    base = datetime(2024, 1, 15)
+    return to_epoch_seconds([base + timedelta(hours=v) for v in values])
+
+
+def test_to_epoch_seconds_naive_as_utc():
+    """测试不带时区的时间按UTC处理"""
+    naive = datetime(2024, 1, 15, 8, 0)
+    aware = naive.replace(tzinfo=timezone.utc)
+    assert to_epoch_seconds([naive])[0] == to_epoch_seconds([aware])[0]
+
+
+def test_overlap_matrix():
+    """测试完整重叠矩阵"""
+    hours, percentage = overlap_matrix(
+        _hours(9, 10), _hours(16, 14),   # 候选：9-16点、10-14点
+        _hours(8, 12), _hours(12, 17)    # 已有：8-12点、12-17点
+    )
+
+    assert hours.tolist() == [[3, 4], [2, 2]]
+    assert percentage[1].tolist() == [50, 50]
+
+
+def test_sparse_overlaps_with_keys():
+    """测试按键分块的稀疏重叠矩阵只比较同键区间"""
+    rows, cols, hours, percentage = sparse_overlaps(
+        _hours(9, 9, 20), _hours(11, 11, 21),
+        _hours(8, 8, 10), _hours(12, 12, 11),
+        np.array([2, 1, 1]), np.array([1, 2, 2])
+    )
+
+    assert list(zip(rows.tolist(), cols.tolist())) == [(0, 1), (0, 2), (1, 0)]
+    assert hours.tolist() == [2, 1, 2]
+    assert percentage.tolist() == [100, 50, 100]
+
+
+def test_sparse_overlaps_empty():
+    """测试没有重叠时返回空数组"""
+    rows, cols, hours, percentage = sparse_overlaps(
+        _hours(1), _hours(2), _hours(3), _hours(4)
+    )
+    assert len(rows) == len(cols) == len(hours) == len(percentage) == 0
+
+
+def test_sparse_overlaps_matches_full_matrix():
+    """测试扫描结果与完整重叠矩阵一致（含长区间、首尾相接和空区间）"""
+    rng = np.random.default_rng(3)
+    candidate_starts = rng.integers(0, 48, 80).astype(np.float64) * 3600
+    candidate_ends = candidate_starts + rng.integers(0, 10, 80) * 3600
+    existing_starts = rng.integers(0, 48, 120).astype(np.float64) * 3600
+    existing_ends = existing_starts + rng.integers(0, 10, 120) * 3600
+    existing_starts[0], existing_ends[0] = 0, 60 * 3600
+    candidate_keys, existing_keys = rng.integers(0, 4, 80), rng.integers(0, 4, 120)
+
+    rows, cols, hours, percentage = sparse_overlaps(
+        candidate_starts, candidate_ends, existing_starts, existing_ends, candidate_keys, existing_keys
+    )
+
+    full_hours, full_percentage = overlap_matrix(candidate_starts, candidate_ends, existing_starts, existing_ends)
+    full_hours[candidate_keys[:, None] != existing_keys[None, :]] = 0
+    expected_rows, expected_cols = np.nonzero(full_hours)
+    assert rows.tolist() == expected_rows.tolist()
+    assert cols.tolist() == expected_cols.tolist()
+    assert np.allclose(hours, full_hours[rows, cols])
+    assert np.allclose(percentage, full_percentage[rows, cols])
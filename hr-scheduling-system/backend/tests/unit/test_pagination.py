@@ -0,0 +1,71 @@
+"""
+键集分页单元测试
+"""
+import base64
+import json
+import pytest
+from datetime import datetime
+from fastapi import HTTPException, Response
+from api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_page
+from models.assignment import Assignment
+
+
+def test_cursor_round_trip():
+    """测试游标编码、解码及排序方式校验"""
+    cursor = encode_cursor("start_time", datetime(2024, 1, 15, 8, 0), 42)
+
+    assert decode_cursor(cursor, "start_time") == ("2024-01-15T08:00:00", 42)
+    with pytest.raises(HTTPException) as mismatch:
+        decode_cursor(cursor, "id")
+    assert mismatch.value.status_code == 400
+    with pytest.raises(HTTPException) as invalid:
+        decode_cursor("not-a-cursor", "id")
+    assert invalid.value.status_code == 400
+
+
+def test_tampered_cursor_sort_value(db_session):
+    """测试排序键值类型不符的游标返回400"""
+    query = db_session.query(Assignment)
+    sort_columns = {"id": Assignment.id, "start_time": Assignment.start_time}
+    for sort_value in ("garbage", 1, ["2024-01-15T08:00:00"]):
+        payload = json.dumps(["start_time", sort_value, 1]).encode()
+        cursor = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+        with pytest.raises(HTTPException) as invalid:
+            keyset_page(query, "start_time", sort_columns, Assignment.id, cursor, 10, Response())
+        assert invalid.value.status_code == 400
+
+
+def test_keyset_pages_with_ties_and_inserts(db_session, sample_employee, sample_project, sample_user):
+    """测试排序键相同的行按 id 分页，翻页期间插入的行不导致重复或遗漏"""
+    def assign(hour):
+        return Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 5, 1, hour, 0),
+            end_time=datetime(2024, 5, 1, hour + 1, 0),
+            status="assigned",
+            created_by=sample_user.id
+        )
+    db_session.add_all([assign(hour) for hour in (8, 8, 8, 9, 10)])
+    db_session.commit()
+
+    query = db_session.query(Assignment).filter(Assignment.employee_id == sample_employee.id)
+    sort_columns = {"id": Assignment.id, "start_time": Assignment.start_time}
+    seen, cursor = [], None
+    while True:
+        response = Response()
+        page = keyset_page(query, "start_time", sort_columns, Assignment.id, cursor, 2, response)
+        seen += page
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        if len(seen) == 2:
+            # 插入到已读取范围之前的行不会影响后续页
+            db_session.add(assign(7))
+            db_session.commit()
+
+    expected = query.filter(Assignment.start_time >= datetime(2024, 5, 1, 8, 0)).order_by(
+        Assignment.start_time, Assignment.id
+    ).all()
+    assert [a.id for a in seen] == [a.id for a in expected]
+    assert len(seen) == 5
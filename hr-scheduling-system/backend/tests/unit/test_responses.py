@@ -0,0 +1,76 @@
+"""
+快速JSON序列化单元测试
+算法端点按类型化响应模型校验并序列化算法输出，这里校验输出与模型一致
+"""
+import json
+import pytest
+from datetime import datetime
+from pydantic import TypeAdapter, ValidationError
+from algorithms.timeline_layout import TimelineLayoutEngine, TimelineViewport
+from api.responses import ORJSONResponse, dump_json, model_encoder
+from models.assignment import Assignment
+from schemas.algorithm import EmployeeTimeline, RegionTimelineResponse, TimelineRange, TimelineResponse
+
+
+@pytest.fixture
+def timeline_data(db_session, sample_employee, sample_project, sample_user):
+    """创建有重叠和跨越视图边界的分配"""
+    department = f"序列化测试_{sample_employee.id}"
+    region = f"序列化区域_{sample_project.id}"
+    sample_employee.department, sample_employee.status = department, "active"
+    sample_project.region = region
+    for start_hour, end_hour in [(6, 12), (9, 11), (10, 14)]:
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 4, 1, start_hour, 0),
+            end_time=datetime(2024, 4, 1, end_hour, 0),
+            status="assigned",
+            notes="夜间施工" if start_hour == 9 else None,
+            created_by=sample_user.id
+        ))
+    db_session.commit()
+    return sample_employee, sample_project, department, region
+
+
+def test_timeline_outputs_match_typed_models(db_session, timeline_data):
+    """测试各时间轴视图的输出符合类型化模型，且模型序列化与直接 orjson 输出一致"""
+    employee, project, department, region = timeline_data
+    engine = TimelineLayoutEngine(db_session)
+    start, end = datetime(2024, 4, 1, 8, 0), datetime(2024, 4, 2, 0, 0)
+    viewport = TimelineViewport(view_start=datetime(2024, 4, 1, 9, 0), view_end=datetime(2024, 4, 1, 10, 0))
+
+    outputs = [
+        (TimelineResponse, engine.generate_employee_timeline(employee.id, start, end, "hour")),
+        (TimelineResponse, engine.generate_employee_timeline(employee.id, start, end, "hour", "compact", viewport)),
+        (TimelineResponse, engine.generate_project_timeline(project.id, start, end, "hour")),
+        (TimelineResponse, engine.generate_department_overview(department, start, end, "hour")),
+        (TimelineResponse, engine.generate_occupancy("department", department, start, end, "hour")),
+        (TimelineResponse, engine.generate_occupancy("employee", employee.id, start, end, "hour")),
+        (RegionTimelineResponse, engine.generate_region_overview(region, start, end, "hour")),
+    ]
+    for model, output in outputs:
+        TypeAdapter(model).validate_python(output, strict=True)
+        assert json.loads(model_encoder(model)(output)) == json.loads(dump_json(output))
+
+    for timeline in engine.iter_employee_timelines(start, end, "hour", department=department):
+        EmployeeTimeline.model_validate(timeline, strict=True)
+
+
+def test_dump_json_int_keys_and_models():
+    """测试整数键转为字符串、pydantic 模型转为字典"""
+    time_range = TimelineRange(start=datetime(2024, 1, 1), end=datetime(2024, 1, 2), unit="day")
+    body = json.loads(dump_json({1: {"time": datetime(2024, 1, 1, 8, 30)}, "time_range": time_range}))
+
+    assert body["1"] == {"time": "2024-01-01T08:30:00"}
+    assert body["time_range"] == {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00", "unit": "day"}
+
+
+def test_model_encoder_validates_response():
+    """测试响应按模型校验：结构不符时报错，通过时输出模型序列化结果"""
+    encode = model_encoder(TimelineRange)
+    response = ORJSONResponse({"start": datetime(2024, 1, 1), "end": datetime(2024, 1, 2), "unit": "day"}, encode)
+
+    assert json.loads(response.body) == {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00", "unit": "day"}
+    with pytest.raises(ValidationError):
+        encode({"start": datetime(2024, 1, 1), "unit": "day"})
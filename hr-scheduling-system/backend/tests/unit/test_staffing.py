@@ -0,0 +1,70 @@
+"""
+扫描线人员统计单元测试
+"""
+from datetime import datetime
+from algorithms.staffing import merge_by_key, peak_of, staffing_curve, step_function
+from algorithms.timeline_layout import TimelineLayoutEngine
+from models.assignment import Assignment
+
+
+def _t(hour):
+    return datetime(2024, 1, 15, hour, 0)
+
+
+def test_step_function():
+    """测试阶梯函数：首尾相接不算重叠，同一时刻只输出一个点"""
+    steps = step_function([_t(8), _t(9), _t(12), _t(12)], [_t(12), _t(10), _t(14), _t(13)])
+
+    assert steps == [(_t(8), 1), (_t(9), 2), (_t(10), 1), (_t(12), 2), (_t(13), 1), (_t(14), 0)]
+    assert peak_of(steps) == (2, _t(9))
+    assert step_function([], []) == []
+
+
+def test_merge_by_key():
+    """测试同一员工的重叠分配合并为一段"""
+    starts, ends = merge_by_key([1, 1, 2, 1], [_t(8), _t(10), _t(9), _t(15)], [_t(12), _t(13), _t(11), _t(16)])
+
+    assert list(zip(starts, ends)) == [(_t(8), _t(13)), (_t(15), _t(16)), (_t(9), _t(11))]
+
+
+def test_staffing_curve_counts_people_not_assignments():
+    """测试在岗人数按人计数，峰值并发按分配计数，区间裁剪到统计范围"""
+    curve = staffing_curve(
+        [1, 1, 2],
+        [_t(6), _t(9), _t(10)],
+        [_t(12), _t(11), _t(20)],
+        _t(8), _t(18)
+    )
+
+    assert curve["steps"] == [
+        {"time": _t(8), "headcount": 1},
+        {"time": _t(10), "headcount": 2},
+        {"time": _t(12), "headcount": 1},
+        {"time": _t(18), "headcount": 0},
+    ]
+    assert curve["peak_headcount"] == 2
+    assert curve["peak_time"] == _t(10)
+    assert curve["peak_concurrent_assignments"] == 3
+
+
+def test_project_staffing_curve(db_session, sample_employee, sample_project, sample_user):
+    """测试项目人员曲线不计入已取消的分配"""
+    for start_hour, end_hour, status in ((8, 12, "assigned"), (10, 14, "completed"), (9, 17, "cancelled")):
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=_t(start_hour),
+            end_time=_t(end_hour),
+            status=status,
+            created_by=sample_user.id
+        ))
+    db_session.commit()
+
+    curve = TimelineLayoutEngine(db_session).generate_staffing_curve(
+        "project", sample_project.id, _t(0), _t(23)
+    )
+
+    assert curve["total_assignments"] == 2
+    assert curve["peak_headcount"] == 1
+    assert curve["peak_concurrent_assignments"] == 2
+    assert [(p["time"], p["headcount"]) for p in curve["steps"]] == [(_t(0), 0), (_t(8), 1), (_t(14), 0)]
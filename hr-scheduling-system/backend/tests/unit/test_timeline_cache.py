@@ -0,0 +1,83 @@
+"""
+时间轴结果缓存单元测试
+"""
+import pytest
+from datetime import datetime
+from algorithms import change_events
+from algorithms.timeline_cache import TimelineCache, etag_matches, make_etag, timeline_dependencies
+from algorithms.timeline_layout import TimelineLayoutEngine
+from models.assignment import Assignment
+
+
+def test_etag_matches():
+    """测试 If-None-Match 匹配"""
+    etag = make_etag(b"{}")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+class TestTimelineCache:
+    """时间轴缓存测试类"""
+
+    @pytest.fixture
+    def cache(self):
+        cache = TimelineCache(max_entries=2, ttl_seconds=300)
+        change_events.subscribe(cache.handle_change)
+        yield cache
+        change_events.unsubscribe(cache.handle_change)
+
+    def test_invalidated_by_assignment_write(self, db_session, cache, sample_employee, sample_project, sample_user):
+        """测试分配写入后依赖该员工的项目视图失效，无关视图保留"""
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        engine = TimelineLayoutEngine(db_session)
+
+        key = ("project", sample_project.id, start, end, "hour")
+        computed_at = cache.clock()
+        timeline = engine.generate_project_timeline(sample_project.id, start, end, "hour")
+        cache.put(key, b"empty", timeline_dependencies("project", sample_project.id, timeline), computed_at)
+        cache.put(("project", 999, start, end, "hour"), b"other", [("project", 999)], cache.clock())
+        assert cache.get(key).etag == make_etag(b"empty")
+
+        db_session.add(Assignment(
+            employee_id=sample_employee.id,
+            project_id=sample_project.id,
+            start_time=datetime(2024, 1, 15, 8, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            status="assigned",
+            created_by=sample_user.id
+        ))
+        db_session.commit()
+
+        assert cache.get(key) is None
+        assert cache.get(("project", 999, start, end, "hour")).body == b"other"
+
+    def test_write_during_computation_not_cached(self, cache):
+        """测试计算期间依赖被写入时结果不进入缓存"""
+        computed_at = cache.clock()
+        cache.bump([("employee", 1)])
+        entry = cache.put("key", b"stale", [("employee", 1)], computed_at)
+
+        assert entry.body == b"stale"
+        assert cache.get("key") is None
+
+    def test_employee_record_change_invalidates_department(self, cache):
+        """测试员工记录变化（可能调岗）使部门视图失效"""
+        cache.put("department", b"{}", timeline_dependencies("department", "施工部", {}), cache.clock())
+
+        cache.handle_change(change_events.ScheduleChange(frozenset(), frozenset(), frozenset({42})))
+
+        assert cache.get("department") is None
+
+    def test_lru_eviction(self, cache):
+        """测试超出容量后淘汰最久未使用的项"""
+        cache.put("a", b"a", [], cache.clock())
+        cache.put("b", b"b", [], cache.clock())
+        cache.get("a")
+        cache.put("c", b"c", [], cache.clock())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
@@ -3,8 +3,60 @@
 """
 import pytest
 from datetime import datetime, timedelta
-from algorithms.timeline_layout import TimelineLayoutEngine
+from algorithms import timeline_layout
+from algorithms.compute_pool import ComputePool
+from algorithms.timeline_layout import (
+    TimelineLayoutEngine, TimelineViewport, assign_stable_rows, compact_time_grid, format_time_label,
+    full_time_grid
+)
+from sqlalchemy import event
 from models.assignment import Assignment
+from models.employee import Employee
+from models.project import Project
+
+
+def test_assign_stable_rows():
+    """测试增量分行保留已有行号，冲突的行号重新分配"""
+    starts = [datetime(2024, 1, 15, h) for h in (8, 10, 13, 9)]
+    ends = [datetime(2024, 1, 15, h) for h in (12, 14, 15, 11)]
+    
+    # 第2项保留在第2行（完整重排会移到第1行），新项目放入不重叠的最小行号
+    assert assign_stable_rows(starts[:3], ends[:3], [0, 2, None]) == [0, 2, 0]
+    # 第4项与第1项同在第0行且更晚开始，重新放置
+    assert assign_stable_rows(starts, ends, [0, 2, 1, 0]) == [0, 2, 1, 1]
+
+
+def test_week_label_not_padded():
+    """测试周标签为不补零的ISO周数"""
+    assert format_time_label(datetime(2024, 1, 3), "week") == "第1周"
+    assert format_time_label(datetime(2020, 12, 31), "week") == "第53周"
+
+
+@pytest.mark.parametrize("time_unit, start, end", [
+    ("hour", datetime(2024, 1, 5, 20, 30), datetime(2024, 1, 8, 3, 0)),
+    ("day", datetime(2024, 1, 1, 12, 0), datetime(2024, 2, 1, 0, 0)),
+    ("week", datetime(2024, 1, 3, 0, 0), datetime(2024, 3, 1, 0, 0)),
+    ("week", datetime(2020, 12, 16, 0, 0), datetime(2021, 2, 1, 0, 0)),  # 跨年，2020年有53周
+])
+def test_compact_time_grid_expands_to_full_grid(time_unit, start, end):
+    """测试客户端按紧凑编码展开得到的网格与逐格生成的一致"""
+    full = full_time_grid(start, end, time_unit)
+    compact = compact_time_grid(start, end, time_unit)
+    
+    assert compact["count"] == len(full)
+    weekend_bits = int.from_bytes(bytes.fromhex(compact["weekend_bitmap"]), "little")
+    step = timedelta(seconds=compact["step_seconds"])
+    for i, cell in enumerate(full):
+        assert cell["start"] == compact["start"] + step * i
+        assert cell["end"] == min(compact["start"] + step * (i + 1), compact["end"])
+        assert cell["is_weekend"] == bool(weekend_bits >> i & 1)
+        if compact["week_label"]:
+            assert cell["label"] == compact["week_label"].format(week=compact["iso_weeks"][i])
+        else:
+            assert cell["label"] == cell["start"].strftime(compact["label_format"])
+    
+    # 完整网格按 (start, end, unit) 缓存
+    assert full_time_grid(start, end, time_unit) is full
 
 
 class TestTimelineLayoutEngine:
@@ -247,4 +299,320 @@ class TestTimelineLayoutEngine:
         # 6点开始，在12小时视图中应该是50%位置
         assert layout["start_percentage"] == 50.0
         # 6小时持续时间，在12小时视图中应该是50%宽度
-        assert layout["width_percentage"] == 50.0
\ No newline at end of file
+        assert layout["width_percentage"] == 50.0
+    
+    def test_resolve_overlaps_lowest_free_row(self, db_session):
+        """测试重叠解析总是放入最小的空闲行，先派工的项目在更靠上的行"""
+        engine = TimelineLayoutEngine(db_session)
+        
+        def item(item_id, start_hour, end_hour):
+            return {
+                "id": item_id,
+                "actual_start": datetime(2024, 1, 15, start_hour, 0),
+                "actual_end": datetime(2024, 1, 15, end_hour, 0),
+                "layout": {"row": 0}
+            }
+        
+        items = engine._resolve_overlaps([
+            item(4, 4, 6), item(1, 0, 4), item(3, 3, 5), item(2, 1, 3), item(5, 2, 7)
+        ])
+        
+        assert [i["id"] for i in items] == [1, 2, 5, 3, 4]
+        # 1: 0-4 第0行；2: 1-3 第1行；5: 2-7 第2行；3: 3-5 复用第1行；4: 4-6 复用第0行
+        assert [i["layout"]["row"] for i in items] == [0, 1, 2, 1, 0]
+    
+    def test_department_overview_fixed_queries(self, engine, db_session, sample_employee, sample_project, sample_user):
+        """测试部门概览的查询次数与员工数无关，且结果与逐个员工生成一致"""
+        department = f"概览测试_{sample_employee.id}"
+        sample_employee.department, sample_employee.status = department, "active"
+        others = [Employee(name=f"员工{i}", department=department, status="active") for i in range(3)]
+        db_session.add_all(others)
+        db_session.flush()
+        for index, employee in enumerate([sample_employee] + others):
+            db_session.add(Assignment(
+                employee_id=employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, 8 + index, 0),
+                end_time=datetime(2024, 1, 15, 12 + index, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ))
+        db_session.commit()
+        db_session.expire_all()
+        
+        layout_engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 15, 23, 59)
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            overview = layout_engine.generate_department_overview(department, start, end, "hour")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert len(statements) == 2
+        assert len(overview["employee_timelines"]) == 4
+        for timeline in overview["employee_timelines"]:
+            expected = layout_engine.generate_employee_timeline(timeline["employee"]["id"], start, end, "hour")
+            assert timeline == expected
+    
+    def test_region_overview_parallel_layout(
+        self, engine, db_session, sample_employee, sample_project, sample_user, monkeypatch
+    ):
+        """测试区域时间轴固定两次查询，计算池分块布局与当前线程布局结果一致"""
+        region = f"区域测试_{sample_project.id}"
+        sample_project.region = region
+        others = [Project(name=f"区域项目{i}_{sample_project.id}", region=region, status="active") for i in range(2)]
+        db_session.add_all(others)
+        db_session.flush()
+        for index, project in enumerate([sample_project] + others):
+            for offset in range(2):
+                db_session.add(Assignment(
+                    employee_id=sample_employee.id,
+                    project_id=project.id,
+                    start_time=datetime(2024, 1, 15, 8 + index + offset, 0),
+                    end_time=datetime(2024, 1, 15, 12 + index, 0),
+                    status="assigned",
+                    created_by=sample_user.id
+                ))
+        db_session.commit()
+        db_session.expire_all()
+        
+        layout_engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 15, 23, 59)
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            serial = layout_engine.generate_region_overview(region, start, end, "hour")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        # 每个 (项目, 员工) 一块，在两个工作线程中计算
+        monkeypatch.setattr(timeline_layout, "LAYOUT_CHUNK_ITEMS", 1)
+        pool = ComputePool("thread", max_workers=2)
+        try:
+            parallel = TimelineLayoutEngine(db_session, pool.runner()).generate_region_overview(
+                region, start, end, "hour"
+            )
+        finally:
+            pool.shutdown()
+        
+        assert len(statements) == 2
+        assert parallel == serial
+        assert [timeline["project"]["id"] for timeline in serial["projects"]] == \
+            sorted(project.id for project in [sample_project] + others)
+        assert serial["statistics"]["total_projects"] == 3
+        assert serial["statistics"]["total_assignments"] == 6
+        assert serial["statistics"]["total_employees"] == 1
+        assert serial["statistics"]["peak_concurrent_assignments"] == 6
+    
+    def test_project_timeline_patch(self, db_session, sample_employee, sample_project, sample_user):
+        """测试拖动一个分配后只返回该分配，其他项目保持原行号"""
+        def assign(start_hour, end_hour):
+            return Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, start_hour, 0),
+                end_time=datetime(2024, 1, 15, end_hour, 0),
+                status="assigned",
+                created_by=sample_user.id
+            )
+        first, second, third = assign(8, 12), assign(9, 11), assign(10, 14)
+        db_session.add_all([first, second, third])
+        db_session.commit()
+        
+        engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        timeline = engine.generate_project_timeline(sample_project.id, start, end, "hour")
+        rows = {
+            item["id"]: item["layout"]["row"]
+            for item in timeline["employee_timelines"][0]["timeline_items"]
+        }
+        assert rows == {first.id: 0, second.id: 1, third.id: 2}
+        
+        second.start_time, second.end_time = datetime(2024, 1, 15, 13, 0), datetime(2024, 1, 15, 15, 0)
+        db_session.commit()
+        
+        patch = engine.generate_project_timeline_patch(
+            sample_project.id, start, end, "hour", second.id, rows
+        )
+        assert patch["removed"] == []
+        assert [(item["id"], item["layout"]["row"]) for item in patch["moved"]] == [(second.id, 0)]
+        assert patch["lanes"] == {sample_employee.id: 3}
+        assert patch["statistics"]["total_assignments"] == 3
+        
+        db_session.delete(first)
+        db_session.commit()
+        
+        patch = engine.generate_project_timeline_patch(
+            sample_project.id, start, end, "hour", first.id, {**rows, second.id: 0}
+        )
+        assert patch["removed"] == [first.id]
+        assert patch["moved"] == []
+        assert patch["statistics"]["total_hours"] == 6
+        
+        # 换人：新员工的泳道放入该分配，原员工的泳道更新行数
+        other = Employee(name="换入员工", department="测试部门", status="active")
+        db_session.add(other)
+        db_session.commit()
+        third.employee_id = other.id
+        db_session.commit()
+        
+        patch = engine.generate_project_timeline_patch(
+            sample_project.id, start, end, "hour", third.id, {second.id: 0, third.id: 2},
+            previous_employee_id=sample_employee.id
+        )
+        assert patch["removed"] == []
+        assert [(item["id"], item["employee_id"], item["layout"]["row"]) for item in patch["moved"]] == \
+            [(third.id, other.id, 0)]
+        assert patch["lanes"] == {other.id: 1, sample_employee.id: 1}
+    
+    def test_iter_employee_timelines_single_query(self, engine, db_session, sample_employee, sample_project, sample_user):
+        """测试流式员工时间轴只用一条查询，结果与部门概览一致（含没有分配的员工）"""
+        department = f"流式测试_{sample_employee.id}"
+        sample_employee.department, sample_employee.status = department, "active"
+        idle = Employee(name="空闲员工", department=department, status="active")
+        db_session.add(idle)
+        db_session.add_all([
+            Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 15, start_hour, 0),
+                end_time=datetime(2024, 1, 15, start_hour + 4, 0),
+                status="assigned",
+                created_by=sample_user.id
+            )
+            for start_hour in (8, 10)
+        ])
+        db_session.commit()
+        db_session.expire_all()
+        
+        layout_engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 16, 0, 0)
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            streamed = list(layout_engine.iter_employee_timelines(start, end, "hour", department=department, batch_size=1))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert len(statements) == 1
+        overview = layout_engine.generate_department_overview(department, start, end, "hour")
+        for timeline in overview["employee_timelines"]:
+            timeline["time_grid"] = None
+        assert streamed == overview["employee_timelines"]
+        assert [len(t["timeline_items"]) for t in streamed] == [2, 0]
+    
+    def test_project_timeline_viewport(self, db_session, sample_employee, sample_project, sample_user):
+        """测试按员工游标分页、按可见窗口裁剪，行号与完整时间轴一致"""
+        others = [Employee(name=f"员工{i}", department="视口测试", status="active") for i in range(2)]
+        db_session.add_all(others)
+        db_session.flush()
+        for employee in [sample_employee] + others:
+            for day, start_hour, end_hour in ((1, 8, 12), (15, 8, 17), (15, 10, 14), (28, 8, 12)):
+                db_session.add(Assignment(
+                    employee_id=employee.id,
+                    project_id=sample_project.id,
+                    start_time=datetime(2024, 1, day, start_hour, 0),
+                    end_time=datetime(2024, 1, day, end_hour, 0),
+                    status="assigned",
+                    created_by=sample_user.id
+                ))
+        db_session.commit()
+        
+        engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 1, 0, 0), datetime(2024, 2, 1, 0, 0)
+        full = engine.generate_project_timeline(sample_project.id, start, end, "day")
+        rows = {
+            item["id"]: item["layout"]["row"]
+            for timeline in full["employee_timelines"] for item in timeline["timeline_items"]
+        }
+        
+        pages, after = [], None
+        while True:
+            viewport = TimelineViewport(
+                after_employee_id=after, limit=2,
+                view_start=datetime(2024, 1, 14, 0, 0), view_end=datetime(2024, 1, 17, 0, 0), prefetch=1
+            )
+            page = engine.generate_project_timeline(sample_project.id, start, end, "day", viewport=viewport)
+            pages.append(page)
+            if not page["window"]["has_more"]:
+                break
+            after = page["window"]["next_after_employee_id"]
+        
+        assert len(pages) == 2
+        assert [t["employee"]["id"] for page in pages for t in page["employee_timelines"]] == \
+            [t["employee"]["id"] for t in full["employee_timelines"]]
+        first_page = pages[0]
+        assert first_page["window"]["fetch_start"] == datetime(2024, 1, 11, 0, 0)
+        assert first_page["window"]["fetch_end"] == datetime(2024, 1, 20, 0, 0)
+        assert len(first_page["time_grid"]) == 9
+        for page in pages:
+            for timeline in page["employee_timelines"]:
+                # 1日和28日的分配在预取范围外；重叠的两项保持完整时间轴中的行号
+                assert [item["actual_start"].day for item in timeline["timeline_items"]] == [15, 15]
+                assert all(rows[item["id"]] == item["layout"]["row"] for item in timeline["timeline_items"])
+    
+    def test_generate_occupancy_aggregates_buckets(self, db_session, sample_employee, sample_project, sample_user):
+        """测试汇总模式按时间单元返回占用，不返回逐条分配"""
+        for day, start_hour, end_hour in ((1, 8, 12), (2, 8, 17), (2, 10, 14), (9, 8, 12)):
+            db_session.add(Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, day, start_hour, 0),
+                end_time=datetime(2024, 1, day, end_hour, 0),
+                status="assigned",
+                created_by=sample_user.id
+            ))
+        db_session.commit()
+        
+        engine = TimelineLayoutEngine(db_session)
+        timeline = engine.generate_occupancy(
+            "project", sample_project.id, datetime(2024, 1, 1), datetime(2024, 1, 15), "week"
+        )
+        
+        assert "timeline_items" not in timeline["employee_timelines"][0]
+        occupancy = timeline["employee_timelines"][0]["occupancy"]
+        assert occupancy == {
+            "busy_hours": [17.0, 4.0],
+            "project_count": [1, 1],
+            "peak_concurrency": [2, 1]
+        }
+        assert len(timeline["time_grid"]) == 2
+        assert timeline["statistics"]["total_assignments"] == 4
+        assert timeline["statistics"]["peak_concurrent_assignments"] == 2
+    
+    def test_peak_statistics_exclude_cancelled(self, db_session, sample_employee, sample_project, sample_user):
+        """测试各视图的峰值统计与人员曲线一致，都不计入已取消的分配"""
+        for start_hour, end_hour, status in ((8, 12, "assigned"), (9, 13, "cancelled"), (10, 14, "in_progress")):
+            db_session.add(Assignment(
+                employee_id=sample_employee.id,
+                project_id=sample_project.id,
+                start_time=datetime(2024, 1, 3, start_hour, 0),
+                end_time=datetime(2024, 1, 3, end_hour, 0),
+                status=status,
+                created_by=sample_user.id
+            ))
+        db_session.commit()
+        
+        engine = TimelineLayoutEngine(db_session)
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 8)
+        timeline = engine.generate_project_timeline(sample_project.id, start, end)
+        occupancy = engine.generate_occupancy("project", sample_project.id, start, end, "day")
+        columnar = engine.generate_columnar_timeline("project", sample_project.id, start, end)
+        curve = engine.generate_staffing_curve("project", sample_project.id, start, end)
+        
+        assert curve["peak_concurrent_assignments"] == 2
+        employee_timeline = engine.generate_employee_timeline(sample_employee.id, start, end)
+        assert employee_timeline["statistics"]["peak_concurrent_assignments"] == 2
+        for statistics in (timeline["statistics"], occupancy["statistics"], columnar["statistics"]):
+            assert statistics["peak_concurrent_assignments"] == 2
+            assert statistics["peak_headcount"] == 1
+        assert max(occupancy["employee_timelines"][0]["occupancy"]["peak_concurrency"]) == 2
+        # 已取消的分配仍然显示
+        assert timeline["statistics"]["total_assignments"] == 3